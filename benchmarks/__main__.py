@@ -0,0 +1,101 @@
+import argparse
+import json
+import sys
+
+from .cases import CASES
+from .roundtrip import run_roundtrip
+from .runner import compare, run_cases
+from .scaling import WORKLOADS, run_scaling
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Schemax performance benchmarks and regression gate"
+    )
+    subparsers = parser.add_subparsers(dest="command", help="Available commands")
+
+    run_parser = subparsers.add_parser("run", help="Run benchmarks and store results as JSON")
+    run_parser.add_argument("--output", "-o", help="JSON file for the results")
+    run_parser.add_argument("--repeat", type=int, default=5, help="Runs per case (default: 5)")
+    run_parser.add_argument(
+        "-k", dest="keyword", default="", help="Only run cases containing this substring"
+    )
+
+    compare_parser = subparsers.add_parser(
+        "compare", help="Compare results with a baseline, fail on slowdowns"
+    )
+    compare_parser.add_argument("baseline", help="Baseline JSON file")
+    compare_parser.add_argument("current", help="Current JSON file")
+    compare_parser.add_argument(
+        "--threshold", type=float, default=0.2,
+        help="Allowed relative slowdown of the median (default: 0.2, i.e. 20%%)"
+    )
+
+    roundtrip_parser = subparsers.add_parser(
+        "roundtrip", help="Fuzz d42 -> JSON Schema -> d42 round trips and measure throughput"
+    )
+    roundtrip_parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    roundtrip_parser.add_argument(
+        "--budget", type=float, default=10.0, help="Time budget in seconds (default: 10)"
+    )
+    roundtrip_parser.add_argument(
+        "--depth", type=int, default=4, help="Maximum nesting of generated schemas (default: 4)"
+    )
+    roundtrip_parser.add_argument(
+        "--no-memory", action="store_true", help="Skip the tracemalloc allocation pass"
+    )
+
+    scaling_parser = subparsers.add_parser(
+        "scaling", help="Measure throughput with 1..N threads (free-threaded CPython scales)"
+    )
+    scaling_parser.add_argument(
+        "--workload", choices=sorted(WORKLOADS), default="collect_schema_data",
+        help="What every task does (default: collect_schema_data)"
+    )
+    scaling_parser.add_argument(
+        "--threads", default="1,2,4,8", help="Comma separated thread counts (default: 1,2,4,8)"
+    )
+    scaling_parser.add_argument(
+        "--tasks", type=int, default=4, help="Tasks per thread (default: 4)"
+    )
+
+    args = parser.parse_args()
+
+    if args.command == "run":
+        cases = [case for case in CASES if args.keyword in case.name]
+        results = run_cases(cases, repeat=args.repeat)
+        if args.output:
+            with open(args.output, "w") as file:
+                json.dump(results, file, indent=2)
+            print(f"Results are written to '{args.output}'")
+    elif args.command == "compare":
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        with open(args.current) as file:
+            current = json.load(file)
+        lines, regressions = compare(baseline, current, args.threshold)
+        print("\n".join(lines))
+        if regressions:
+            print(f"{len(regressions)} case(s) are slower than the baseline by more than "
+                  f"{args.threshold:.0%}")
+            sys.exit(1)
+    elif args.command == "roundtrip":
+        report = run_roundtrip(
+            seed=args.seed, budget=args.budget, depth=args.depth,
+            measure_memory=not args.no_memory
+        )
+        print(report.report())
+        for original, expected, restored in report.mismatches[:10]:
+            print(f"\n{original}\nexpected: {expected}\nrestored: {restored}")
+        if report.mismatches:
+            sys.exit(1)
+    elif args.command == "scaling":
+        threads = tuple(int(count) for count in args.threads.split(","))
+        print(run_scaling(args.workload, threads, args.tasks).report())
+    else:
+        parser.print_help()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,166 @@
+import copy
+import json
+import os
+import random
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+import yaml
+from d42 import fake, validate
+
+from schemax import (
+    Router,
+    collect_schema_data,
+    compile_validator,
+    diff_specs,
+    from_json_schema,
+    to_json_schema,
+    to_json_schema_stream,
+)
+from schemax._generator import MainGenerator
+from schemax._openapi_normalizer import openapi_normalizer
+
+from .synthetic import make_registry, make_spec, make_wide_object
+
+__all__ = ("Case", "CASES",)
+
+SPECS_DIR = Path(__file__).parent / "specs"
+
+
+@dataclass
+class Case:
+    name: str
+    setup: Callable[[], Any]
+    run: Callable[[Any], Any]
+
+
+def _load_spec(file_name: str) -> Callable[[], dict[str, Any]]:
+    def load() -> dict[str, Any]:
+        with open(SPECS_DIR / file_name) as file:
+            spec: dict[str, Any] = yaml.load(file, yaml.FullLoader)
+            return spec
+    return load
+
+
+def _d42_schemas(spec: dict[str, Any]) -> list[Any]:
+    return [
+        schema
+        for item in collect_schema_data(spec)
+        for schema in (item.response_schema_d42, item.request_schema_d42)
+        if schema is not None
+    ]
+
+
+def _translate_all(schemas: list[Any]) -> None:
+    for schema in schemas:
+        to_json_schema(schema)
+
+
+def _convert_all(schemas: list[dict[str, Any]]) -> None:
+    for schema in schemas:
+        from_json_schema(schema)
+
+
+def _dump_json(schema: Any) -> None:
+    with open(os.devnull, "w") as file:
+        json.dump(to_json_schema(schema), file)
+
+
+def _stream_json(schema: Any) -> None:
+    with open(os.devnull, "w") as file:
+        to_json_schema_stream(schema, file)
+
+
+def _routes() -> tuple[Router, list[str]]:
+    router = Router(collect_schema_data(make_spec(paths=1000, ref_depth=0), lazy=True))
+    return router, [f"/resource{index}/{index}?limit=10" for index in range(1000)]
+
+
+def _route_all(routes: tuple[Router, list[str]]) -> None:
+    router, requests = routes
+    for path in requests:
+        router.match(path, "GET")
+
+
+def _spec_versions() -> tuple[dict[str, Any], dict[str, Any]]:
+    old = make_spec(paths=1500)
+    new = copy.deepcopy(old)
+    new["components"]["schemas"]["Status"]["description"] = "changed"
+    return old, new
+
+
+def _diff(versions: tuple[dict[str, Any], dict[str, Any]]) -> None:
+    diff_specs(*versions)
+
+
+def _payloads() -> list[tuple[Any, list[Any]]]:
+    random.seed(0)  # d42 fakes with the global random
+    return [(schema, [fake(schema) for _ in range(50)])
+            for schema in _d42_schemas(SPECS["shop"]())]
+
+
+def _validate_d42(payloads: list[tuple[Any, list[Any]]]) -> None:
+    for schema, values in payloads:
+        for value in values:
+            validate(schema, value)
+
+
+def _validate_compiled(payloads: list[tuple[Any, list[Any]]]) -> None:
+    for validator, values in payloads:
+        validator.validate_many(values)
+
+
+def _generate(schema_data: list[Any]) -> None:
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as out_dir:
+        os.chdir(out_dir)
+        try:
+            MainGenerator(schema_data).all()
+        finally:
+            os.chdir(cwd)
+
+
+SPECS: dict[str, Callable[[], dict[str, Any]]] = {
+    "small": lambda: make_spec(paths=20, ref_depth=1),
+    "wide": lambda: make_spec(paths=10, width=100, depth=1, ref_depth=0),
+    "deep": lambda: make_spec(paths=10, depth=40, width=2, ref_depth=0),
+    "fanout": lambda: make_spec(paths=10, ref_fanout=3, ref_depth=3, width=3),
+    "enum": lambda: make_spec(paths=5, enum_size=5_000, ref_depth=0),
+    "allof": lambda: make_spec(paths=10, allof_chain=25, width=10, ref_depth=0),
+    "petstore": _load_spec("petstore.yaml"),
+    "shop": _load_spec("shop.yaml"),
+}
+
+
+def _cases() -> list[Case]:
+    cases = []
+    for spec_name, make in SPECS.items():
+        cases += [
+            Case(f"normalize[{spec_name}]", make, openapi_normalizer),
+            Case(f"collect[{spec_name}]", make, collect_schema_data),
+            Case(f"to_json_schema[{spec_name}]",
+                 lambda make=make: _d42_schemas(make()), _translate_all),
+            Case(f"generate[{spec_name}]",
+                 lambda make=make: collect_schema_data(make()), _generate),
+        ]
+    cases += [
+        Case("from_json_schema[registry]", make_registry, _convert_all),
+        Case("from_json_schema[wide10k]", make_wide_object, from_json_schema),
+        Case("to_json_schema[wide10k]",
+             lambda: from_json_schema(make_wide_object()), to_json_schema),
+        Case("dump_json[wide10k]", lambda: from_json_schema(make_wide_object()), _dump_json),
+        Case("stream_json[wide10k]",
+             lambda: from_json_schema(make_wide_object()), _stream_json),
+        Case("route[1000 paths]", _routes, _route_all),
+        Case("diff[1500 paths]", _spec_versions, _diff),
+        Case("validate_d42[shop]", _payloads, _validate_d42),
+        Case("validate_compiled[shop]",
+             lambda: [(compile_validator(schema), values) for schema, values in _payloads()],
+             _validate_compiled),
+    ]
+    return cases
+
+
+CASES: list[Case] = _cases()
@@ -0,0 +1,238 @@
+import random
+import string
+import time
+import tracemalloc
+import warnings
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from d42 import optional, schema
+from d42.declaration import GenericSchema
+
+from schemax import from_json_schema, to_json_schema
+
+__all__ = ("random_schema", "run_roundtrip", "RoundTripReport",)
+
+_ALPHABET = string.ascii_letters + string.digits + "_-"
+
+Pair = tuple[GenericSchema, GenericSchema]
+
+
+def _name(rnd: random.Random) -> str:
+    return "".join(rnd.choice(_ALPHABET) for _ in range(rnd.randint(1, 8)))
+
+
+def _random_int(rnd: random.Random) -> Pair:
+    low = rnd.randint(-1000, 1000)
+    high = low + rnd.randint(1, 1000)
+    sch = rnd.choice([
+        schema.int, schema.int(low), schema.int.min(low), schema.int.max(high),
+        schema.int.min(low).max(high),
+    ])
+    return sch, sch
+
+
+def _random_float(rnd: random.Random) -> Pair:
+    # JSON Schema "number" is translated back as float or int, so the expectation is an `any`.
+    # Values are kept integral, because the int branch truncates them
+    low = float(rnd.randint(-1000, 1000))
+    high = low + rnd.randint(1, 1000)
+    return rnd.choice([
+        (schema.float, schema.any(schema.float, schema.int)),
+        (schema.float(low), schema.any(schema.float(low), schema.int(int(low)))),
+        (schema.float.min(low), schema.any(schema.float.min(low), schema.int.min(int(low)))),
+        (schema.float.max(high), schema.any(schema.float.max(high), schema.int.max(int(high)))),
+        (schema.float.min(low).max(high),
+         schema.any(schema.float.min(low).max(high), schema.int.min(int(low)).max(int(high)))),
+    ])
+
+
+def _random_str(rnd: random.Random) -> Pair:
+    length = rnd.randint(0, 20)
+    value = _name(rnd)
+    kind = rnd.randrange(8)
+    if kind == 0:
+        sch = schema.str
+    elif kind == 1:
+        sch = schema.str(value)
+    elif kind == 2:
+        sch = schema.str.len(length)
+    elif kind == 3:
+        sch = schema.str.len(length, length + rnd.randint(1, 10))
+    elif kind == 4:
+        sch = schema.str.len(length, ...)
+    elif kind == 5:
+        sch = schema.str.regex(f"^{value}$")
+    else:
+        # alphabet and substr are expressed through "pattern" and come back as a regex
+        sch = schema.str.alphabet(value) if kind == 6 else schema.str.contains(value)
+        return sch, schema.str.regex(to_json_schema(sch, hide_draft=True)["pattern"])
+    return sch, sch
+
+
+def _random_list(rnd: random.Random, depth: int) -> Pair:
+    low = rnd.randint(0, 5)
+    kind = rnd.randrange(4)
+    if kind == 0:
+        sch, expected = schema.list, schema.list
+    elif kind == 1:
+        item, expected_item = random_schema(rnd, depth - 1)
+        sch, expected = schema.list(item), schema.list(expected_item)
+    else:
+        pairs = [random_schema(rnd, depth - 1) for _ in range(rnd.randint(0, 3))]
+        elements = [item for item, _ in pairs]
+        expected_elements = [expected_item for _, expected_item in pairs]
+        if kind == 3:
+            elements.append(...)
+            expected_elements.append(...)
+        return schema.list(elements), schema.list(expected_elements)
+
+    bounds = rnd.randrange(4)
+    if bounds == 1:
+        return sch.len(low), expected.len(low)
+    if bounds == 2:
+        high = low + rnd.randint(1, 5)
+        return sch.len(low, high), expected.len(low, high)
+    if bounds == 3:
+        return sch.len(low, ...), expected.len(low, ...)
+    return sch, expected
+
+
+def _random_dict(rnd: random.Random, depth: int) -> Pair:
+    if rnd.random() < 0.2:
+        return schema.dict, schema.dict
+
+    keys, expected_keys = {}, {}
+    for _ in range(rnd.randint(0, 4)):
+        name = _name(rnd)
+        value, expected_value = random_schema(rnd, depth - 1)
+        key = optional(name) if rnd.random() < 0.3 else name
+        keys[key], expected_keys[key] = value, expected_value
+    if rnd.random() < 0.3:
+        keys[...] = expected_keys[...] = ...
+    return schema.dict(keys), schema.dict(expected_keys)
+
+
+def _random_any(rnd: random.Random, depth: int) -> Pair:
+    count = rnd.choice([0, 1, 2, 3])
+    if count == 0:
+        return schema.any, schema.any
+    pairs = [random_schema(rnd, depth - 1) for _ in range(count)]
+    if count == 1:
+        # A single alternative is unwrapped by from_json_schema
+        return schema.any(pairs[0][0]), pairs[0][1]
+    return (schema.any(*[item for item, _ in pairs]),
+            schema.any(*[expected_item for _, expected_item in pairs]))
+
+
+def random_schema(rnd: random.Random, depth: int = 4) -> Pair:
+    """Generate a random d42 schema and the schema from_json_schema is expected to give back."""
+    leaves = ["none", "bool", "int", "float", "str", "bytes", "alias"]
+    containers = ["list", "dict", "any"] if depth > 0 else []
+    kind = rnd.choice(leaves + containers * 2)
+
+    if kind == "none":
+        return schema.none, schema.none
+    if kind == "bool":
+        sch = rnd.choice([schema.bool, schema.bool(True), schema.bool(False)])
+        return sch, sch
+    if kind == "int":
+        return _random_int(rnd)
+    if kind == "float":
+        return _random_float(rnd)
+    if kind == "str":
+        return _random_str(rnd)
+    if kind == "bytes":
+        # Not representable in JSON Schema: translated to {} and back to schema.any
+        return schema.bytes, schema.any
+    if kind == "alias":
+        return schema.alias(_name(rnd), schema.int), schema.any
+    if kind == "list":
+        return _random_list(rnd, depth)
+    if kind == "dict":
+        return _random_dict(rnd, depth)
+    return _random_any(rnd, depth)
+
+
+@dataclass
+class RoundTripReport:
+    schemas: int = 0
+    to_json_time: float = 0.0
+    from_json_time: float = 0.0
+    to_json_bytes: int = 0
+    from_json_bytes: int = 0
+    mismatches: list[tuple[str, str, str]] = field(default_factory=list)
+
+    @property
+    def to_json_rate(self) -> float:
+        return self.schemas / self.to_json_time if self.to_json_time else 0.0
+
+    @property
+    def from_json_rate(self) -> float:
+        return self.schemas / self.from_json_time if self.from_json_time else 0.0
+
+    def report(self) -> str:
+        count = self.schemas or 1
+        return "\n".join([
+            f"schemas:        {self.schemas}",
+            f"mismatches:     {len(self.mismatches)}",
+            f"to_json_schema:   {self.to_json_rate:>10.0f} schemas/s"
+            f"{self.to_json_bytes / count:>10.0f} B/schema peak",
+            f"from_json_schema: {self.from_json_rate:>10.0f} schemas/s"
+            f"{self.from_json_bytes / count:>10.0f} B/schema peak",
+        ])
+
+
+def _peak_bytes(func: Callable[..., Any], *args: Any) -> tuple[Any, int]:
+    tracemalloc.reset_peak()
+    started = tracemalloc.get_traced_memory()[0]
+    result = func(*args)
+    return result, tracemalloc.get_traced_memory()[1] - started
+
+
+def run_roundtrip(
+    seed: int = 0,
+    budget: float = 10.0,
+    max_schemas: int | None = None,
+    depth: int = 4,
+    measure_memory: bool = True,
+) -> RoundTripReport:
+    """Push random d42 schemas through to_json_schema and from_json_schema.
+
+    Runs until `budget` seconds have passed or `max_schemas` schemas have been checked.
+    Throughput is measured without tracemalloc; memory is measured on a second, traced pass.
+    """
+    rnd = random.Random(seed)
+    report = RoundTripReport()
+    started = time.perf_counter()
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        while time.perf_counter() - started < budget:
+            if max_schemas is not None and report.schemas >= max_schemas:
+                break
+            sch, expected = random_schema(rnd, depth)
+
+            t0 = time.perf_counter()
+            translated = to_json_schema(sch)
+            t1 = time.perf_counter()
+            restored = from_json_schema(translated)
+            t2 = time.perf_counter()
+            report.to_json_time += t1 - t0
+            report.from_json_time += t2 - t1
+            report.schemas += 1
+
+            if restored != expected:
+                report.mismatches.append((repr(sch), repr(expected), repr(restored)))
+
+            if measure_memory:
+                tracemalloc.start()
+                try:
+                    translated, to_bytes = _peak_bytes(to_json_schema, sch)
+                    _, from_bytes = _peak_bytes(from_json_schema, translated)
+                finally:
+                    tracemalloc.stop()
+                report.to_json_bytes += to_bytes
+                report.from_json_bytes += from_bytes
+
+    return report
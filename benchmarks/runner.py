@@ -0,0 +1,69 @@
+import gc
+import platform
+import statistics
+import time
+from typing import Any
+
+from schemax.__version__ import __version__
+
+from .cases import Case
+
+__all__ = ("run_cases", "compare",)
+
+
+def _time_case(case: Case, repeat: int) -> dict[str, Any]:
+    state = case.setup()
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        case.run(state)
+        timings.append(time.perf_counter() - started)
+    return {
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "repeat": repeat,
+    }
+
+
+def run_cases(cases: list[Case], repeat: int = 5, verbose: bool = True) -> dict[str, Any]:
+    results = {}
+    for case in cases:
+        results[case.name] = _time_case(case, repeat)
+        if verbose:
+            print(f"{case.name:<40}{results[case.name]['median']:>12.4f} s")
+    return {
+        "meta": {
+            "schemax": __version__,
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+        },
+        "results": results,
+    }
+
+
+def compare(
+    baseline: dict[str, Any], current: dict[str, Any], threshold: float = 0.2
+) -> tuple[list[str], list[str]]:
+    """Compare medians of two result documents.
+
+    Returns:
+        Report lines and names of cases that became slower than `1 + threshold` times baseline.
+    """
+    lines = [f"{'case':<40}{'baseline, s':>14}{'current, s':>14}{'ratio':>8}"]
+    regressions = []
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            lines.append(f"{name:<40}{'-':>14}{result['median']:>14.4f}{'new':>8}")
+            continue
+        ratio = result["median"] / base["median"] if base["median"] else 1.0
+        mark = ""
+        if ratio > 1 + threshold:
+            regressions.append(name)
+            mark = "  SLOWER"
+        lines.append(
+            f"{name:<40}{base['median']:>14.4f}{result['median']:>14.4f}{ratio:>8.2f}{mark}"
+        )
+    return lines, regressions
@@ -0,0 +1,88 @@
+import random
+import sys
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from schemax import collect_schema_data, from_json_schema, to_json_schema
+
+from .roundtrip import random_schema
+from .synthetic import make_spec
+
+__all__ = ("run_scaling", "ScalingReport", "WORKLOADS",)
+
+
+def _collect_workload() -> Callable[[], Any]:
+    spec = make_spec(paths=10, seed=0)
+    return lambda: collect_schema_data(spec)
+
+
+def _translate_workload() -> Callable[[], Any]:
+    rnd = random.Random(0)
+    schemas = [random_schema(rnd)[0] for _ in range(200)]
+
+    def translate() -> None:
+        for sch in schemas:
+            from_json_schema(to_json_schema(sch))
+    return translate
+
+
+WORKLOADS: dict[str, Callable[[], Callable[[], Any]]] = {
+    "collect_schema_data": _collect_workload,
+    "translate": _translate_workload,
+}
+
+
+def gil_enabled() -> bool:
+    # sys._is_gil_enabled appeared with the free-threaded build (3.13)
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled() if is_gil_enabled is not None else True
+
+
+@dataclass
+class ScalingReport:
+    workload: str
+    tasks_per_thread: int
+    gil: bool = field(default_factory=gil_enabled)
+    throughput: dict[int, float] = field(default_factory=dict)  # threads -> tasks/s
+
+    def speedup(self, threads: int) -> float:
+        return self.throughput[threads] / self.throughput[min(self.throughput)]
+
+    def report(self) -> str:
+        lines = [f"{self.workload} (GIL {'enabled' if self.gil else 'disabled'}, "
+                 f"{self.tasks_per_thread} tasks per thread)"]
+        for threads, rate in self.throughput.items():
+            lines.append(f"  {threads:>3} threads: {rate:>10.1f} tasks/s "
+                         f"speedup x{self.speedup(threads):.2f} "
+                         f"(efficiency {self.speedup(threads) / threads:.0%})")
+        return "\n".join(lines)
+
+
+def run_scaling(
+    workload: str = "collect_schema_data",
+    threads: tuple[int, ...] = (1, 2, 4, 8),
+    tasks_per_thread: int = 4,
+) -> ScalingReport:
+    """Run the same amount of work per thread with a growing number of threads.
+
+    Near-linear speedup is only expected where the GIL is disabled (e.g. CPython 3.13t);
+    with the GIL the speedup stays around x1.
+    """
+    task = WORKLOADS[workload]()
+    report = ScalingReport(workload, tasks_per_thread)
+    with warnings.catch_warnings():
+        # Random schemas contain types without a JSON Schema counterpart
+        warnings.simplefilter("ignore")
+        task()  # warm-up: imports, leaf caches of the main thread, lazily built tables
+        for count in threads:
+            with ThreadPoolExecutor(count) as pool:
+                started = time.perf_counter()
+                futures = [pool.submit(task) for _ in range(count * tasks_per_thread)]
+                for future in futures:
+                    future.result()
+                elapsed = time.perf_counter() - started
+            report.throughput[count] = count * tasks_per_thread / elapsed
+    return report
@@ -0,0 +1,139 @@
+import random
+from typing import Any
+
+__all__ = ("make_spec", "make_registry", "make_wide_object",)
+
+_SCALARS: list[dict[str, Any]] = [
+    {"type": "string", "minLength": 1, "maxLength": 64},
+    {"type": "string", "pattern": "^[a-z]+$"},
+    {"type": "integer", "minimum": 0},
+    {"type": "number", "minimum": 0, "maximum": 1000},
+    {"type": "boolean"},
+    {"type": "array", "items": {"type": "string"}, "maxItems": 10},
+    {"type": "string", "nullable": True},
+]
+
+
+def _ref(name: str) -> dict[str, Any]:
+    return {"$ref": f"#/components/schemas/{name}"}
+
+
+def _nested_object(rnd: random.Random, depth: int, width: int) -> dict[str, Any]:
+    properties: dict[str, Any] = {}
+    for index in range(width):
+        if index == 0 and depth > 0:
+            properties["nested"] = _nested_object(rnd, depth - 1, width)
+        else:
+            properties[f"field_{index}"] = dict(rnd.choice(_SCALARS))
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": list(properties)[: width // 2],
+    }
+
+
+def make_spec(
+    paths: int = 50,
+    depth: int = 3,
+    width: int = 5,
+    ref_fanout: int = 2,
+    ref_depth: int = 2,
+    models_per_layer: int = 5,
+    enum_size: int = 10,
+    allof_chain: int = 3,
+    seed: int = 0,
+) -> dict[str, Any]:
+    """Build a deterministic OpenAPI 3 document.
+
+    Args:
+        paths: Number of `/resource{i}/{id}` paths, each with GET (200, 404) and POST (201).
+        depth: Nesting depth of inline objects inside every model.
+        width: Properties per inline object.
+        ref_fanout: How many models of the previous layer every model references.
+        ref_depth: Number of model layers; the expanded size grows as ref_fanout ** ref_depth.
+        models_per_layer: Models in every layer.
+        enum_size: Values in the shared `Status` enum.
+        allof_chain: Mixins every model is composed of through `allOf`.
+        seed: Seed for the choice of scalar property types and referenced models.
+    """
+    rnd = random.Random(seed)
+    schemas: dict[str, Any] = {
+        "Status": {"type": "string", "enum": [f"status_{i}" for i in range(enum_size)]},
+        "Error": {
+            "type": "object",
+            "properties": {"code": {"type": "integer"}, "message": {"type": "string"}},
+            "required": ["code"],
+        },
+    }
+
+    for index in range(allof_chain):
+        schemas[f"Mixin{index}"] = {
+            "type": "object",
+            "properties": {
+                f"mixin{index}_{field}": dict(rnd.choice(_SCALARS)) for field in range(width)
+            },
+        }
+
+    for layer in range(ref_depth + 1):
+        for index in range(models_per_layer):
+            own = _nested_object(rnd, depth, width)
+            own["properties"]["status"] = _ref("Status")
+            if layer > 0:
+                targets = rnd.sample(range(models_per_layer), min(ref_fanout, models_per_layer))
+                for target in targets:
+                    own["properties"][f"rel_{target}"] = _ref(f"Model{layer - 1}_{target}")
+            schemas[f"Model{layer}_{index}"] = {
+                "allOf": [_ref(f"Mixin{mixin}") for mixin in range(allof_chain)] + [own]
+            }
+
+    top_models = [f"Model{ref_depth}_{index}" for index in range(models_per_layer)]
+    spec_paths: dict[str, Any] = {}
+    for index in range(paths):
+        model = rnd.choice(top_models)
+        spec_paths[f"/resource{index}/{{id}}"] = {
+            "parameters": [
+                {"name": "id", "in": "path", "required": True, "schema": {"type": "integer"}}
+            ],
+            "get": {
+                "tags": [f"resource{index}"],
+                "parameters": [
+                    {"name": "limit", "in": "query", "schema": {"type": "integer"}},
+                    {"name": "X-Request-Id", "in": "header", "schema": {"type": "string"}},
+                ],
+                "responses": {
+                    "200": {"content": {"application/json": {"schema": _ref(model)}}},
+                    "404": {"content": {"application/json": {"schema": _ref("Error")}}},
+                },
+            },
+            "post": {
+                "requestBody": {"content": {"application/json": {"schema": _ref(model)}}},
+                "responses": {
+                    "201": {"content": {"application/json": {"schema": _ref(model)}}},
+                },
+            },
+        }
+
+    return {
+        "openapi": "3.0.0",
+        "info": {"title": "Synthetic", "version": "1.0.0"},
+        "paths": spec_paths,
+        "components": {"schemas": schemas},
+    }
+
+
+def make_registry(count: int = 10_000, width: int = 8, depth: int = 1, seed: int = 0
+                  ) -> list[dict[str, Any]]:
+    """Build `count` standalone JSON Schemas that share their structure, like a schema registry.
+
+    Property names and types are drawn from small pools, so the schemas differ but repeat
+    many subschemas.
+    """
+    rnd = random.Random(seed)
+    return [_nested_object(rnd, depth, rnd.randint(width // 2, width)) for _ in range(count)]
+
+
+def make_wide_object(width: int = 10_000, seed: int = 0) -> dict[str, Any]:
+    """Build one object schema with `width` properties, all of them required."""
+    rnd = random.Random(seed)
+    properties = {f"field_{index}": dict(rnd.choice(_SCALARS)) for index in range(width)}
+    return {"type": "object", "properties": properties, "required": list(properties)}
@@ -3,18 +3,39 @@ from typing import Any, Dict, Optional
 from d42.declaration import GenericSchema
 from d42.declaration.types import Schema
 
+from ._batch import BatchGenerator, generate_specs
+from ._bundle import to_json_schema_bundle, to_json_schema_files
+from ._compiled_validator import CompiledValidator, compile_validator
+from ._complexity import ComplexityReport, ExpansionLimitError, analyze_spec
 from ._config import Config
 from ._data_collector import SchemaData, collect_schema_data
+from ._diagnostics import Diagnostic, Diagnostics
+from ._diff import SpecDiff, SpecHasher, diff_specs
+from ._enum_schema import EnumSchema
+from ._fake import iter_fake_payloads, write_fake_payloads
 from ._from_json_schema import _from_json_schema
+from ._hooks import NodeHooks, NodeTiming, TopSubtrees
+from ._interning import InternTable
 from ._openapi_normalizer import openapi_normalizer
+from ._profiler import PhaseStats, Profiler
+from ._router import RouteMatch, Router
+from ._stream import iter_json_schema, to_json_schema_stream
+from ._traffic import EndpointStats, TrafficReport, validate_traffic
 from ._translator import Translator
+from ._watch import Watcher
 
 __all__ = (
     "Translator", "to_json_schema", "from_json_schema", "collect_schema_data", "SchemaData",
-    "Config"
+    "Config", "Profiler", "PhaseStats", "NodeHooks", "NodeTiming", "TopSubtrees",
+    "analyze_spec", "ComplexityReport", "ExpansionLimitError", "EnumSchema", "InternTable",
+    "Diagnostics", "Diagnostic", "to_json_schema_stream", "iter_json_schema",
+    "to_json_schema_bundle", "to_json_schema_files", "diff_specs", "SpecDiff", "SpecHasher",
+    "Router", "RouteMatch", "validate_traffic", "TrafficReport", "EndpointStats",
+    "compile_validator", "CompiledValidator", "iter_fake_payloads", "write_fake_payloads",
+    "generate_specs", "BatchGenerator", "Watcher"
 )
 
-_translator = Translator()
+_translator = Translator()  # holds no state between calls, so every thread can share it
 
 
 def to_json_schema(
@@ -23,7 +44,9 @@ def to_json_schema(
     hide_draft: Optional[bool] = False,
     **kwargs: Any
 ) -> Any:
-    translation = schema.__accept__(_translator, **kwargs)
+    hooks = Config.NODE_HOOKS
+    translator = _translator if hooks is None else Translator(hooks)
+    translation = translator._translate(schema, kwargs)
 
     if title is not None:
         translation = {'title': title, **translation}
@@ -35,9 +58,11 @@ def to_json_schema(
     return translation
 
 
-def from_json_schema(value: Dict[Any, Any]) -> GenericSchema:
+def from_json_schema(
+    value: Dict[Any, Any], interner: Optional[InternTable] = None
+) -> GenericSchema:
     normalized_value = openapi_normalizer(value)
-    return _from_json_schema(normalized_value)
+    return _from_json_schema(normalized_value, interner=interner)
 
 
 Schema.__override__(Schema.__invert__.__name__, to_json_schema)
@@ -1,14 +1,28 @@
 import argparse
 import json
+import os
+import sys
+from contextlib import nullcontext
 from json import JSONDecodeError
-from typing import Optional
+from typing import Any, Optional
 
 import yaml
 
 from schemax import from_json_schema
 
+from ._batch import generate_specs, read_spec
+from ._bundle import schemas_from_modules, to_json_schema_bundle, to_json_schema_files
+from ._complexity import ExpansionLimitError, analyze_spec
+from ._config import Config
 from ._data_collector import collect_schema_data
+from ._diagnostics import Diagnostics
+from ._diff import diff_specs
+from ._fake import iter_fake_payloads
 from ._generator import MainGenerator
+from ._interning import InternTable
+from ._profiler import Profiler, profile_phase
+from ._traffic import validate_traffic
+from ._watch import Watcher
 
 
 def translate(files: str) -> None:
@@ -25,19 +39,37 @@ def translate(files: str) -> None:
             continue
 
 
-def generate(file: str, base_url: Optional[str] = None, humanize: bool = False) -> None:
+def generate(
+    file: str,
+    base_url: Optional[str] = None,
+    humanize: bool = False,
+    profile: bool = False,
+    profile_output: Optional[str] = None
+) -> None:
+    profiler = Profiler() if profile else None
+    interner = InternTable()  # identical d42 nodes of the spec are shared, for this run only
     try:
         with open(file, "r") as f:
             print("Generating schemas and interfaces from given OpenApi...")
-            if f.name.endswith(".json"):
-                schema_data = collect_schema_data(json.load(f))
-            elif f.name.endswith((".yaml", ".yml")):
-                schema_data = collect_schema_data(yaml.load(f, yaml.FullLoader))
-            else:
-                print(f"'{f.name}' type is not .json or .yaml file")
-                exit(1)
+            if profiler is not None:
+                profiler.start()
+            with profile_phase(profiler, "parse"):
+                if f.name.endswith(".json"):
+                    spec = json.load(f)
+                elif f.name.endswith((".yaml", ".yml")):
+                    spec = yaml.load(f, yaml.FullLoader)
+                else:
+                    print(f"'{f.name}' type is not .json or .yaml file")
+                    exit(1)
 
-            generator = MainGenerator(schema_data, base_url, humanize)
+            try:
+                schema_data = collect_schema_data(
+                    spec, profiler=profiler, base_path=file, interner=interner
+                )
+            except ExpansionLimitError as e:
+                print(f"Spec is too large to generate from: {e}")
+                exit(1)
+            generator = MainGenerator(schema_data, base_url, humanize, profiler=profiler)
             generator.all()
             print("Successfully generated")
     except FileNotFoundError:
@@ -46,6 +78,180 @@ def generate(file: str, base_url: Optional[str] = None, humanize: bool = False)
     except JSONDecodeError:
         print(f"File '{f.name}' doesn't contain proper JSON")
         exit(1)
+    finally:
+        if profiler is not None:
+            profiler.stop()
+
+    if profiler is not None:
+        print(profiler.report())
+        print(interner.report())
+        if profile_output is not None:
+            profiler.dump(profile_output)
+            print(f"Profile is written to '{profile_output}'")
+
+
+def generate_many(
+    files: list[str],
+    out_root: str,
+    base_url: Optional[str] = None,
+    humanize: bool = False,
+    workers: Optional[int] = None,
+) -> None:
+    print(f"Generating schemas and interfaces from {len(files)} OpenApi specs...")
+    try:
+        dirs = generate_specs(files, out_root, base_url, humanize, workers)
+    except FileNotFoundError as e:
+        print(f"File '{e.filename}' doesn't exist")
+        exit(1)
+    except JSONDecodeError as e:
+        print(f"Spec doesn't contain proper JSON: {e}")
+        exit(1)
+    except ExpansionLimitError as e:
+        print(f"Spec is too large to generate from: {e}")
+        exit(1)
+    for file, out_dir in dirs.items():
+        print(f"'{file}' -> '{out_dir}'")
+    print("Successfully generated")
+
+
+def watch(
+    file: str,
+    base_url: Optional[str] = None,
+    humanize: bool = False,
+    interval: float = 0.05,
+) -> None:
+    print(f"Watching '{file}' and the files it references, press Ctrl+C to stop...")
+
+    def on_refresh(written: list[str], seconds: float) -> None:
+        changed = ", ".join(written) if written else "no changes"
+        print(f"Regenerated in {seconds * 1000:.0f} ms: {changed}", flush=True)
+
+    def on_error(error: Exception) -> None:
+        print(f"Can't generate from '{file}': {error}", flush=True)
+
+    try:
+        Watcher(file, base_url=base_url, humanize=humanize).run(interval, on_refresh, on_error)
+    except KeyboardInterrupt:
+        pass
+
+
+def analyze(file: str) -> None:
+    try:
+        with open(file, "r") as f:
+            if f.name.endswith(".json"):
+                spec = json.load(f)
+            else:
+                spec = yaml.load(f, yaml.FullLoader)
+    except FileNotFoundError:
+        print(f"File '{file}' doesn't exist")
+        exit(1)
+    except JSONDecodeError:
+        print(f"File '{file}' doesn't contain proper JSON")
+        exit(1)
+
+    print(f"Complexity of '{file}' after $ref expansion:")
+    print(analyze_spec(spec, base_path=file).summary())
+
+
+def _load_spec(file: str) -> Any:
+    try:
+        return read_spec(file)
+    except FileNotFoundError:
+        print(f"File '{file}' doesn't exist")
+        exit(1)
+    except JSONDecodeError:
+        print(f"File '{file}' doesn't contain proper JSON")
+        exit(1)
+
+
+def diff(old_file: str, new_file: str) -> None:
+    changes = diff_specs(_load_spec(old_file), _load_spec(new_file), old_file, new_file)
+    print(f"Changes from '{old_file}' to '{new_file}':")
+    print(changes.summary())
+    if changes:
+        exit(1)  # like `diff`, so scripts can tell whether the spec has changed
+
+
+def traffic(
+    spec_file: str,
+    traffic_file: str,
+    traffic_format: Optional[str] = None,
+    workers: Optional[int] = None,
+    batch_size: int = 1000,
+) -> None:
+    spec = _load_spec(spec_file)
+    har = (traffic_format or os.path.splitext(traffic_file)[1].lstrip(".").lower()) == "har"
+    try:
+        with open(traffic_file, "r") as file:
+            report = validate_traffic(spec, file, base_path=spec_file, har=har,
+                                      workers=workers, batch_size=batch_size)
+    except FileNotFoundError:
+        print(f"File '{traffic_file}' doesn't exist")
+        exit(1)
+    except ValueError as e:
+        print(f"File '{traffic_file}' can't be read: {e}")
+        exit(1)
+    print(f"Traffic of '{traffic_file}' against '{spec_file}':")
+    print(report.summary())
+    if report.mismatches:
+        exit(1)
+
+
+def fake_payloads(
+    spec_file: str,
+    operations: Optional[list[str]] = None,
+    statuses: Optional[list[int]] = None,
+    count: int = 1,
+    seed: int = 0,
+    output: Optional[str] = None,
+    workers: Optional[int] = None,
+    chunk_size: int = 1000,
+) -> None:
+    spec = _load_spec(spec_file)
+    chunks = iter_fake_payloads(spec, operations, statuses, count, seed, base_path=spec_file,
+                                workers=workers, chunk_size=chunk_size)
+    written = 0
+    with nullcontext(sys.stdout) if output is None else open(output, "w") as file:
+        for chunk in chunks:
+            file.write(chunk)
+            written += 1
+    if not written:
+        print("No operations with request or response schemas to fake", file=sys.stderr)
+        exit(1)
+
+
+def export(
+    modules: list[str],
+    output: Optional[str] = None,
+    output_dir: Optional[str] = None,
+    hide_draft: bool = False,
+) -> None:
+    sys.path.insert(0, os.getcwd())  # modules are looked up like `python -m` does
+    try:
+        schemas = schemas_from_modules(*modules)
+    except ImportError as e:
+        print(f"Can't import schemas: {e}")
+        exit(1)
+    if not schemas:
+        print(f"No d42 schemas found in {', '.join(modules)}")
+        exit(1)
+
+    if output_dir is not None:
+        os.makedirs(output_dir, exist_ok=True)
+        files = to_json_schema_files(schemas, hide_draft=hide_draft)
+        for file_name, document in files.items():
+            with open(os.path.join(output_dir, file_name), "w") as file:
+                json.dump(document, file, indent=2)
+        print(f"{len(schemas)} schemas are exported to {len(files)} files in '{output_dir}'")
+        return
+
+    bundle = to_json_schema_bundle(schemas, hide_draft=hide_draft)
+    if output is None:
+        print(json.dumps(bundle, indent=2))
+        return
+    with open(output, "w") as file:
+        json.dump(bundle, file, indent=2)
+    print(f"{len(schemas)} schemas are exported to '{output}'")
 
 
 def main() -> None:
@@ -58,12 +264,129 @@ def main() -> None:
 
     # Command generate
     generate_parser = subparsers.add_parser("generate", help="Generate from a file")
-    generate_parser.add_argument("input_file", help="Input OpenAPI file for generation")
+    generate_parser.add_argument(
+        "input_files", nargs="+", metavar="input_file",
+        help="Input OpenAPI files for generation, several need --out-root"
+    )
+    generate_parser.add_argument(
+        "--out-root", help="Generate every spec into a directory of its own under this one"
+    )
+    generate_parser.add_argument(
+        "--workers", type=int, help="Processes for --out-root (default: number of CPUs)"
+    )
+    generate_parser.add_argument(
+        "--watch", action="store_true",
+        help="Keep running and regenerate whenever the spec or a file it references changes"
+    )
+    generate_parser.add_argument(
+        "--interval", type=float, default=0.05,
+        help="Seconds between checks for changes with --watch (default: 0.05)"
+    )
     generate_parser.add_argument("--base-url", help="Base API URL for the interface")
     generate_parser.add_argument(
         "--humanize", action="store_true",
         help="Use human-readable interface method and schema names"
     )
+    generate_parser.add_argument(
+        "--profile", action="store_true",
+        help="Print per-phase wall time, CPU time, object count and peak memory"
+    )
+    generate_parser.add_argument(
+        "--profile-output",
+        help="Also write the --profile breakdown as JSON to this file"
+    )
+
+    generate_parser.add_argument(
+        "--max-nodes", type=int,
+        help="Refuse specs that expand to more nodes than this after $ref inlining"
+    )
+    generate_parser.add_argument(
+        "--max-depth", type=int,
+        help="Refuse specs that expand deeper than this after $ref inlining"
+    )
+    generate_parser.add_argument(
+        "--warn-nodes", type=int,
+        help="Warn about specs that expand to more nodes than this after $ref inlining"
+    )
+    generate_parser.add_argument(
+        "--compact-enums", type=int, metavar="THRESHOLD",
+        help="Compact enums with more values than this into ranges and schema.enum(...), "
+             "generated schemas then import schemax"
+    )
+    generate_parser.add_argument(
+        "--quiet", action="store_true", help="Don't print warnings about the spec"
+    )
+
+    # Command analyze
+    analyze_parser = subparsers.add_parser(
+        "analyze", help="Estimate the size of a spec after $ref expansion without expanding it"
+    )
+    analyze_parser.add_argument("input_file", help="Input OpenAPI file")
+
+    # Command diff
+    diff_parser = subparsers.add_parser(
+        "diff", help="List operations and components that differ between two specs"
+    )
+    diff_parser.add_argument("old_file", help="Old OpenAPI file")
+    diff_parser.add_argument("new_file", help="New OpenAPI file")
+
+    # Command validate-traffic
+    traffic_parser = subparsers.add_parser(
+        "validate-traffic", help="Validate recorded requests and responses against a spec"
+    )
+    traffic_parser.add_argument("input_file", help="OpenAPI file the traffic was made with")
+    traffic_parser.add_argument("traffic_file", help="NDJSON or HAR file with the traffic")
+    traffic_parser.add_argument(
+        "--format", choices=("ndjson", "har"),
+        help="Format of the traffic file (default: by its extension)"
+    )
+    traffic_parser.add_argument(
+        "--workers", type=int, help="Worker processes (default: number of CPUs)"
+    )
+    traffic_parser.add_argument(
+        "--batch-size", type=int, default=1000, help="Exchanges sent to a worker at a time"
+    )
+
+    # Command fake
+    fake_parser = subparsers.add_parser(
+        "fake", help="Generate fake request and response payloads of a spec as NDJSON"
+    )
+    fake_parser.add_argument("input_file", help="Input OpenAPI file")
+    fake_parser.add_argument(
+        "--operation", action="append", dest="operations",
+        help="'METHOD /path' or an interface method name, may be repeated (default: all)"
+    )
+    fake_parser.add_argument(
+        "--status", action="append", type=int, dest="statuses",
+        help="Response status, may be repeated (default: all)"
+    )
+    fake_parser.add_argument(
+        "--count", type=int, default=1, help="Payloads per operation and status"
+    )
+    fake_parser.add_argument(
+        "--seed", type=int, default=0, help="The same seed gives the same payloads"
+    )
+    fake_parser.add_argument("--output", "-o", help="NDJSON file (default: stdout)")
+    fake_parser.add_argument(
+        "--workers", type=int, help="Worker processes (default: number of CPUs)"
+    )
+    fake_parser.add_argument(
+        "--chunk-size", type=int, default=1000, help="Payloads made by a worker at a time"
+    )
+
+    # Command export
+    export_parser = subparsers.add_parser(
+        "export", help="Export d42 schemas of Python modules as a JSON Schema bundle"
+    )
+    export_parser.add_argument(
+        "modules", nargs="+", help="Modules or packages with schemas, e.g. 'pkg.schemas'"
+    )
+    output_group = export_parser.add_mutually_exclusive_group()
+    output_group.add_argument("--output", "-o", help="Bundle file (default: stdout)")
+    output_group.add_argument("--output-dir", help="Directory for a file per schema")
+    export_parser.add_argument(
+        "--hide-draft", action="store_true", help="Don't add '$schema' to the documents"
+    )
 
     # Command translate
     translate_parser = subparsers.add_parser("translate", help="Translate from multiple files")
@@ -72,7 +395,43 @@ def main() -> None:
     args = parser.parse_args()
 
     if args.command == "generate":
-        generate(args.input_file, args.base_url, args.humanize)
+        Config.MAX_NODES = args.max_nodes
+        Config.MAX_DEPTH = args.max_depth
+        Config.WARN_NODES = args.warn_nodes
+        Config.ENUM_COMPACT_THRESHOLD = args.compact_enums
+        # Every distinct problem is reported once, however many schemas it occurs in
+        Config.DIAGNOSTICS = Diagnostics(quiet=args.quiet)
+        if args.watch and (args.out_root is not None or len(args.input_files) > 1):
+            parser.error("--watch takes a single spec without --out-root")
+        profile = args.profile or args.profile_output is not None
+        if profile and (args.out_root is not None or args.watch):
+            parser.error("--profile and --profile-output work without --out-root and --watch")
+        if args.out_root is not None:
+            generate_many(
+                args.input_files, args.out_root, args.base_url, args.humanize, args.workers
+            )
+        elif len(args.input_files) > 1:
+            parser.error("generating several specs needs --out-root")
+        elif args.watch:
+            watch(args.input_files[0], args.base_url, args.humanize, args.interval)
+        else:
+            generate(
+                args.input_files[0], args.base_url, args.humanize,
+                profile=profile, profile_output=args.profile_output
+            )
+    elif args.command == "analyze":
+        analyze(args.input_file)
+    elif args.command == "diff":
+        diff(args.old_file, args.new_file)
+    elif args.command == "validate-traffic":
+        traffic(args.input_file, args.traffic_file, args.format, args.workers, args.batch_size)
+    elif args.command == "fake":
+        fake_payloads(
+            args.input_file, args.operations, args.statuses, args.count, args.seed,
+            args.output, args.workers, args.chunk_size
+        )
+    elif args.command == "export":
+        export(args.modules, args.output, args.output_dir, args.hide_draft)
     elif args.command == "translate":
         translate(args.input_files)
     else:
@@ -0,0 +1,134 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Iterable, Optional
+
+import yaml
+from d42.declaration import GenericSchema
+
+from ._config import Config
+from ._data_collector import collect_schema_data
+from ._diagnostics import Diagnostics
+from ._generator import MainGenerator
+from ._interning import InternTable
+
+__all__ = ("BatchGenerator", "generate_specs", "read_spec", "output_dirs",)
+
+# Settings a worker process gets from the parent, whatever the start method is
+_SETTINGS = ("MAX_NODES", "MAX_DEPTH", "WARN_NODES", "ENUM_COMPACT_THRESHOLD")
+
+# libyaml parses several times faster, PyYAML may be built without it
+_YAML_LOADER = getattr(yaml, "CFullLoader", yaml.FullLoader)
+
+
+def read_spec(file: str) -> Any:
+    """Parse a JSON (`.json`) or YAML spec file."""
+    with open(file, "r") as f:
+        if file.endswith(".json"):
+            return json.load(f)
+        return yaml.load(f, _YAML_LOADER)
+
+
+def output_dirs(files: Iterable[str], out_root: str) -> dict[str, str]:
+    """A directory of `out_root` per spec, named after the spec file ('users.yaml' -> 'users')."""
+    dirs: dict[str, str] = {}
+    taken: set[str] = set()
+    for file in files:
+        name = base = os.path.splitext(os.path.basename(file))[0]
+        suffix = 1
+        while name in taken:
+            suffix += 1
+            name = f"{base}_{suffix}"
+        taken.add(name)
+        dirs[file] = os.path.join(out_root, name)
+    return dirs
+
+
+class BatchGenerator:
+    """Generates many specs in one process.
+
+    The specs share an `InternTable`, so components they have in common become the same d42
+    objects and their reprs are made once. Templates are parsed once per process, and files
+    referenced by several specs are parsed once as long as they aren't modified.
+
+    Usage:
+        generator = BatchGenerator(base_url="http://api.example.com")
+        for spec_file, out_dir in output_dirs(spec_files, "generated").items():
+            generator.generate(spec_file, out_dir)
+    """
+
+    def __init__(self, base_url: Optional[str] = None, humanize: bool = False) -> None:
+        self.base_url = base_url
+        self.humanize = humanize
+        self.interner = InternTable()
+        self.reprs: dict[int, tuple[GenericSchema, str]] = {}
+
+    def generate(self, file: str, out_dir: str) -> int:
+        """Generate the code of a spec into `out_dir`, returns the number of SchemaData."""
+        spec = read_spec(file)
+        schema_data = collect_schema_data(spec, base_path=file, interner=self.interner)
+        MainGenerator(schema_data, self.base_url, self.humanize,
+                      out_dir=out_dir, reprs=self.reprs).all()
+        return len(schema_data)
+
+
+_generator: Optional[BatchGenerator] = None  # of the worker process
+
+
+def _init_worker(base_url: Optional[str], humanize: bool, settings: dict[str, Any],
+                 collect: bool) -> None:
+    global _generator
+    for name, value in settings.items():
+        setattr(Config, name, value)
+    if collect:
+        # Reported by the parent process, which deduplicates across workers
+        Config.DIAGNOSTICS = Diagnostics(quiet=True)
+    _generator = BatchGenerator(base_url, humanize)
+
+
+def _generate_spec(file: str, out_dir: str) -> tuple[int, Optional[Diagnostics]]:
+    assert _generator is not None
+    count = _generator.generate(file, out_dir)
+    diagnostics = Config.DIAGNOSTICS
+    if diagnostics is not None:
+        Config.DIAGNOSTICS = Diagnostics(quiet=True)
+    return count, diagnostics
+
+
+def generate_specs(
+    files: Iterable[str],
+    out_root: str,
+    base_url: Optional[str] = None,
+    humanize: bool = False,
+    workers: Optional[int] = None,
+) -> dict[str, str]:
+    """Generate the code of every spec into a directory of its own under `out_root`.
+
+    Specs are spread over `workers` processes (as many as CPUs by default, at most one per
+    spec); each process generates its share with one `BatchGenerator`. With `workers=1`
+    everything is generated in this process. Like `schemax generate`, the generator appends
+    to the files it finds, so give it a clean `out_root`. Diagnostics of the workers are
+    merged into `Config.DIAGNOSTICS`, if it is set, and reported by this process.
+
+    Returns:
+        The output directory of every spec.
+    """
+    dirs = output_dirs(files, out_root)
+    workers = min(workers or os.cpu_count() or 1, len(dirs))
+    if workers <= 1:
+        generator = BatchGenerator(base_url, humanize)
+        for file, out_dir in dirs.items():
+            generator.generate(file, out_dir)
+        return dirs
+
+    settings = {name: getattr(Config, name) for name in _SETTINGS}
+    parent = Config.DIAGNOSTICS
+    initargs = (base_url, humanize, settings, parent is not None)
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=initargs) as executor:
+        futures = [executor.submit(_generate_spec, file, out_dir)
+                   for file, out_dir in dirs.items()]
+        for future in futures:
+            _, diagnostics = future.result()
+            if parent is not None and diagnostics is not None:
+                parent.merge(diagnostics)
+    return dirs
@@ -0,0 +1,225 @@
+import copy
+import importlib
+import json
+import pkgutil
+import re
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+from urllib.parse import quote
+
+from d42.declaration import GenericSchema, Schema
+
+from ._translator import Translator
+
+__all__ = ("to_json_schema_bundle", "to_json_schema_files", "schemas_from_modules",)
+
+_EXPAND, _BUILD = 0, 1
+
+_DRAFT = "https://json-schema.org/draft/2020-12/schema#"
+_MARKER = "\0child"  # stands for a child while subschemas are compared, never part of the output
+_UNSAFE = re.compile(r"[^A-Za-z0-9_.-]+")
+
+# Where a placeholder of a translated container is: (dict or list, key, index of the child)
+Slot = Tuple[Any, Any, int]
+
+
+def _ref_token(name: str) -> str:
+    return quote(name.replace("~", "~0").replace("/", "~1"), safe="")
+
+
+class _Bundler:
+    """Translates named schemas once and finds the subschemas they share.
+
+    Every distinct d42 object is translated once. Translations are compared level by level:
+    a node is identified by its own JSON with children replaced by their identifiers, so
+    structurally equal subschemas of different schemas become one entry, however deep.
+    """
+
+    def __init__(self, schemas: Mapping[str, GenericSchema]) -> None:
+        self.translator = Translator()
+        self.templates: List[Any] = []  # a translation per unique subschema, children as slots
+        self.slots: List[List[Slot]] = []
+        self.uses: List[int] = []  # references to every unique subschema from the others
+        self.paths: List[Tuple[str, Tuple[str, ...]]] = []  # where it was met first
+
+        self.roots: Dict[str, int] = {}
+        known: Dict[int, int] = {}  # id(d42 schema) -> unique subschema
+        keys: Dict[str, int] = {}
+        for name, schema in schemas.items():
+            self.roots[name] = self._translate(name, schema, known, keys)
+
+        self.names: Dict[int, str] = {}  # unique subschemas that go to $defs
+        for name, index in self.roots.items():
+            self.names.setdefault(index, name)
+        taken = set(self.roots)
+        for index, slots in enumerate(self.slots):
+            if self.uses[index] > 1 and slots and index not in self.names:
+                root, path = self.paths[index]
+                name = base = _UNSAFE.sub("_", "_".join((root,) + path))
+                suffix = 1
+                while name in taken:
+                    suffix += 1
+                    name = f"{base}_{suffix}"
+                taken.add(name)
+                self.names[index] = name
+
+    def _translate(self, root: str, schema: GenericSchema,
+                   known: Dict[int, int], keys: Dict[str, int]) -> int:
+        openers = self.translator._openers
+        work: List[Tuple[Any, ...]] = [(_EXPAND, schema, ())]
+        while work:
+            task = work.pop()
+            if task[0] == _BUILD:
+                _, node, obj, children, path = task
+                slots = []
+                for child, container, key in children:
+                    child_index = known[id(child)]
+                    container[key] = {_MARKER: child_index}
+                    slots.append((container, key, child_index))
+                key = json.dumps(obj)
+                index = keys.get(key)
+                if index is None:
+                    index = keys[key] = len(self.templates)
+                    self.templates.append(obj)
+                    self.slots.append(slots)
+                    self.uses.append(0)
+                    self.paths.append((root, path))
+                    for _, _, child_index in slots:
+                        self.uses[child_index] += 1
+                known[id(node)] = index
+                continue
+
+            _, node, path = task
+            if id(node) in known:
+                continue
+            opener = openers.get(type(node))
+            if opener is None:
+                work.append((_BUILD, node, node.__accept__(self.translator), [], path))
+                continue
+            obj, opened = opener(self.translator, node, {})
+            children = []
+            for child, container, key, _, _ in opened:
+                if type(container) is dict and key not in container:
+                    container[key] = None  # keeps the key order of `to_json_schema`
+                children.append((child, container, key))
+            work.append((_BUILD, node, obj, children, path))
+            work.extend(
+                (_EXPAND, child, path + (str(key),)) for child, _, key in reversed(children)
+            )
+        return known[id(schema)]
+
+    def expand(self, index: int, ref: Any) -> Any:
+        """Build the JSON of a unique subschema, `ref(index)` gives refs to $defs entries."""
+        out: List[Any] = [None]
+        work: List[Tuple[Any, Any, int, bool]] = [(out, 0, index, True)]
+        while work:
+            container, key, index, top = work.pop()
+            # Named leaves (`Id = schema.int`) are inlined: every integer would refer to them
+            if not top and index in self.names and self.slots[index]:
+                container[key] = {"$ref": ref(index)}
+                continue
+            # Templates with children are used once, the others may be inlined many times
+            slots = self.slots[index]
+            container[key] = self.templates[index] if slots else copy.deepcopy(
+                self.templates[index]
+            )
+            work.extend((slot_container, slot_key, child, False)
+                        for slot_container, slot_key, child in reversed(slots))
+        return out[0]
+
+
+def to_json_schema_bundle(
+    schemas: Mapping[str, GenericSchema], hide_draft: Optional[bool] = False
+) -> Dict[str, Any]:
+    """Translate named schemas into a single document with one `$defs` entry per schema.
+
+    Subschemas used more than once, within a schema or across schemas, become `$defs`
+    entries of their own and are referenced with `$ref` everywhere; a schema contained in
+    another named schema is referenced by its name.
+
+    Usage:
+        bundle = to_json_schema_bundle({"User": UserSchema, "Order": OrderSchema})
+    """
+    bundler = _Bundler(schemas)
+
+    def ref(index: int) -> str:
+        return f"#/$defs/{_ref_token(bundler.names[index])}"
+
+    defs: Dict[str, Any] = {}
+    for index, name in sorted(bundler.names.items()):
+        defs[name] = bundler.expand(index, ref)
+    for name, index in bundler.roots.items():
+        if bundler.names[index] != name:  # equal to a schema declared before it
+            defs[name] = {"$ref": ref(index)}
+
+    ordered = {name: defs[name] for name in schemas}
+    ordered.update(defs)
+    return {"$defs": ordered} if hide_draft else {"$schema": _DRAFT, "$defs": ordered}
+
+
+def to_json_schema_files(
+    schemas: Mapping[str, GenericSchema],
+    hide_draft: Optional[bool] = False,
+    shared: str = "_shared.json",
+) -> Dict[str, Any]:
+    """Like `to_json_schema_bundle`, but a document per schema: `{"<name>.json": document}`.
+
+    Named schemas refer to each other by file name (`{"$ref": "User.json"}`); shared
+    subschemas without a name go to the `$defs` of the `shared` file.
+    """
+    bundler = _Bundler(schemas)
+    roots = set(bundler.roots.values())
+
+    def document(translation: Any) -> Any:
+        if hide_draft or not isinstance(translation, dict):
+            return translation
+        return {"$schema": _DRAFT, **translation}
+
+    def ref_from(in_shared: bool) -> Any:
+        def ref(index: int) -> str:
+            name = bundler.names[index]
+            if index in roots:
+                return quote(f"{name}.json")
+            return f"{'' if in_shared else quote(shared)}#/$defs/{_ref_token(name)}"
+        return ref
+
+    files: Dict[str, Any] = {}
+    for name, index in bundler.roots.items():
+        if bundler.names[index] == name:
+            files[f"{name}.json"] = document(bundler.expand(index, ref_from(False)))
+        else:
+            files[f"{name}.json"] = document({"$ref": ref_from(False)(index)})
+
+    shared_defs = {
+        name: bundler.expand(index, ref_from(True))
+        for index, name in sorted(bundler.names.items()) if index not in roots
+    }
+    if shared_defs:
+        files[shared] = document({"$defs": shared_defs})
+    return files
+
+
+def schemas_from_modules(*names: str) -> Dict[str, GenericSchema]:
+    """Import modules (and every submodule of packages) and collect their public d42 schemas.
+
+    Schemas are named by their variable; a schema imported into several modules is taken once,
+    a name used for different schemas in different modules is prefixed with the module name.
+    """
+    modules = []
+    for name in names:
+        module = importlib.import_module(name)
+        modules.append(module)
+        if hasattr(module, "__path__"):
+            modules.extend(
+                importlib.import_module(info.name)
+                for info in pkgutil.walk_packages(module.__path__, f"{module.__name__}.")
+            )
+
+    schemas: Dict[str, GenericSchema] = {}
+    seen = set()
+    for module in modules:
+        for attr, value in vars(module).items():
+            if attr.startswith("_") or not isinstance(value, Schema) or id(value) in seen:
+                continue
+            seen.add(id(value))
+            schemas[attr if attr not in schemas else f"{module.__name__}.{attr}"] = value
+    return schemas
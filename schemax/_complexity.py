@@ -0,0 +1,177 @@
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from referencing.exceptions import Unresolvable
+
+from ._ref_index import RefIndex
+
+_VISIT, _COMBINE, _REF_DONE = range(3)
+
+
+@dataclass
+class ComplexityReport:
+    """Pre-flight estimate of what `openapi_normalizer` will produce.
+
+    Attributes:
+        nodes: JSON values (objects, arrays and scalars) in the document as written.
+        expanded_nodes: JSON values after every $ref is inlined.
+        max_depth: Deepest object/array nesting after every $ref is inlined.
+        refs: $ref occurrences in the document as written.
+        max_ref_fanout: Most $ref occurrences inside a single ref target.
+        recursive_refs: Refs that point back into themselves and are cut by the normalizer.
+        unresolved_refs: Refs that can't be resolved.
+        heaviest_refs: Refs with the largest contribution (occurrences x expanded size).
+    """
+    nodes: int = 0
+    expanded_nodes: int = 0
+    max_depth: int = 0
+    refs: int = 0
+    max_ref_fanout: int = 0
+    recursive_refs: list[str] = field(default_factory=list)
+    unresolved_refs: list[str] = field(default_factory=list)
+    heaviest_refs: list[tuple[str, int]] = field(default_factory=list)
+
+    def summary(self) -> str:
+        lines = [
+            f"nodes: {self.nodes}",
+            f"expanded nodes: {self.expanded_nodes}",
+            f"max depth: {self.max_depth}",
+            f"refs: {self.refs} (max fan-out {self.max_ref_fanout})",
+        ]
+        if self.recursive_refs:
+            lines.append(f"recursive refs: {', '.join(self.recursive_refs)}")
+        if self.unresolved_refs:
+            lines.append(f"unresolved refs: {', '.join(self.unresolved_refs)}")
+        for ref, contribution in self.heaviest_refs:
+            lines.append(f"  {ref}: {contribution} nodes")
+        return "\n".join(lines)
+
+
+class ExpansionLimitError(ValueError):
+    """Raised when a spec exceeds `Config.MAX_NODES` or `Config.MAX_DEPTH`."""
+
+    def __init__(self, message: str, report: ComplexityReport | None = None) -> None:
+        if report is not None:
+            message = f"{message}\n{report.summary()}"
+        super().__init__(message)
+        self.report = report
+
+
+def _count_raw(value: Any, report: ComplexityReport, occurrences: Counter[str]) -> None:
+    stack = [value]
+    while stack:
+        node = stack.pop()
+        report.nodes += 1
+        if isinstance(node, dict):
+            ref = node.get("$ref")
+            if isinstance(ref, str):
+                report.refs += 1
+                occurrences[ref] += 1
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+
+
+def analyze_spec(
+    value: Any, heaviest: int = 5, base_path: Optional[str] = None
+) -> ComplexityReport:
+    """Estimate the size of a spec after $ref expansion without expanding it.
+
+    Every ref target is measured once and memoized, so the cost is linear in the size of
+    the document as written, no matter how many times targets are shared.
+    Refs to other files are resolved relative to `base_path`, like `openapi_normalizer` does.
+    """
+    root = RefIndex(value, base_path)
+    lookups: dict[tuple[int, str], tuple[str, Any, RefIndex]] = {}
+    report = ComplexityReport()
+    occurrences: Counter[str] = Counter()
+    _count_raw(value, report, occurrences)
+
+    memo: dict[str, tuple[int, int]] = {}
+    in_progress: set[str] = set()
+    recursive: dict[str, None] = {}
+    unresolved: dict[str, None] = {}
+    fanout = [0]  # $ref occurrences of the target that is being measured right now
+
+    work: list[tuple[int, Any, RefIndex]] = [(_VISIT, value, root)]
+    values: list[tuple[int, int]] = []  # (expanded nodes, depth) of finished subtrees
+    while work:
+        op, node, scope = work.pop()
+
+        if op == _COMBINE:
+            size, depth = 1, 0
+            for _ in range(node):
+                child_size, child_depth = values.pop()
+                size += child_size
+                depth = max(depth, child_depth)
+            values.append((size, depth + 1))
+            continue
+
+        if op == _REF_DONE:
+            memo[node] = values[-1]
+            in_progress.discard(node)
+            report.max_ref_fanout = max(report.max_ref_fanout, fanout.pop())
+            continue
+
+        if isinstance(node, dict):
+            ref = node.get("$ref")
+            if isinstance(ref, str):
+                fanout[-1] += 1
+                found = lookups.get((id(scope), ref))
+                if found is None:
+                    try:
+                        found = lookups[(id(scope), ref)] = scope.lookup(ref)
+                    except Unresolvable:
+                        unresolved[ref] = None
+                        values.append((1, 0))
+                        continue
+                ref_key, target, target_scope = found
+                if ref_key in memo:
+                    values.append(memo[ref_key])
+                elif ref_key in in_progress:
+                    # The normalizer replaces recursive refs with {}
+                    recursive[ref] = None
+                    values.append((1, 1))
+                else:
+                    in_progress.add(ref_key)
+                    fanout.append(0)
+                    work.append((_REF_DONE, ref_key, scope))
+                    work.append((_VISIT, target, target_scope))
+                continue
+            children: Any = node.values()
+        elif isinstance(node, list):
+            children = node
+        else:
+            values.append((1, 0))
+            continue
+
+        work.append((_COMBINE, len(children), scope))
+        work.extend((_VISIT, child, scope) for child in children)
+
+    report.expanded_nodes, report.max_depth = values.pop()
+    report.recursive_refs = list(recursive)
+    report.unresolved_refs = list(unresolved)
+    sizes = {
+        ref: memo[found[0]][0]
+        for (scope_id, ref), found in lookups.items()
+        if scope_id == id(root) and found[0] in memo
+    }
+    report.heaviest_refs = sorted(
+        ((ref, count * sizes[ref]) for ref, count in occurrences.items() if ref in sizes),
+        key=lambda item: item[1], reverse=True
+    )[:heaviest]
+    return report
+
+
+def check_limits(
+    report: ComplexityReport, max_nodes: int | None, max_depth: int | None
+) -> None:
+    if max_nodes is not None and report.expanded_nodes > max_nodes:
+        raise ExpansionLimitError(
+            f"Spec expands to {report.expanded_nodes} nodes, the limit is {max_nodes}", report
+        )
+    if max_depth is not None and report.max_depth > max_depth:
+        raise ExpansionLimitError(
+            f"Spec expands to depth {report.max_depth}, the limit is {max_depth}", report
+        )
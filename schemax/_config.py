@@ -1,2 +1,17 @@
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from ._diagnostics import Diagnostics
+    from ._hooks import NodeHooks
+
+
 class Config:
+    # Settings are read by every call and shared by all threads: set them before starting
+    # threads that call `to_json_schema`, `from_json_schema` or `collect_schema_data`
     OUTPUT_FUNCTION = None  # can be used for custom output func
+    DIAGNOSTICS: Optional["Diagnostics"] = None  # collects deduplicated warnings when set
+    NODE_HOOKS: Optional["NodeHooks"] = None  # node-level profiling hooks, off by default
+    MAX_NODES: Optional[int] = None  # limit of nodes after $ref expansion, no limit by default
+    MAX_DEPTH: Optional[int] = None  # limit of nesting after $ref expansion, no limit by default
+    WARN_NODES: Optional[int] = None  # warn when a spec expands to more nodes than this
+    ENUM_COMPACT_THRESHOLD: Optional[int] = None  # larger enums are compacted, off by default
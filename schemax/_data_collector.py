@@ -1,14 +1,16 @@
 import re
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from typing import Any
 
 from d42.declaration.types import GenericSchema
 
 from ._from_json_schema import _from_json_schema
+from ._interning import InternTable
 from ._openapi_normalizer import openapi_normalizer
+from ._profiler import Profiler, profile_phase
 
 
-@dataclass
+@dataclass(slots=True)
 class SchemaData:
     """Data collector class.
 
@@ -31,12 +33,14 @@ class SchemaData:
         request_headers: Request headers from OpenAPI schema.
         request_headers_d42: Converted to d42 request_headers.
         tags: Tags of the request from OpenAPI schema.
+
+    Raw (normalized) schemas are None when collected with `keep_raw=False`.
     """
     http_method: str
     path: str
     converted_path: str
     args: list[str]
-    queries_schema: dict[str, Any]
+    queries_schema: dict[str, Any] | None
     queries_schema_d42: GenericSchema
     interface_method: str
     interface_method_humanized: str
@@ -47,11 +51,64 @@ class SchemaData:
     response_schema_d42: GenericSchema | None
     request_schema: dict[str, Any] | None
     request_schema_d42: GenericSchema | None
-    request_headers: dict[str, Any]
+    request_headers: dict[str, Any] | None
     request_headers_d42: GenericSchema
     tags: list[str]
 
 
+_PENDING: Any = object()
+
+
+def _lazy_field(name: str) -> property:
+    slot = SchemaData.__dict__[name]  # the slot descriptor the property stands in front of
+
+    def get(self: "_LazySchemaData") -> GenericSchema | None:
+        value: GenericSchema | None = slot.__get__(self)
+        if value is _PENDING:
+            source = self._pending.get(name)
+            if source is None:  # converted by another thread in the meantime
+                return slot.__get__(self)  # type: ignore[no-any-return]
+            raw, pointer, interner = source
+            value = _from_json_schema(raw, pointer, interner) if raw is not None else None
+            slot.__set__(self, value)
+            self._pending.pop(name, None)
+        return value
+
+    def set(self: "_LazySchemaData", value: GenericSchema | None) -> None:
+        slot.__set__(self, value)
+
+    return property(get, set)
+
+
+class _LazySchemaData(SchemaData):
+    """SchemaData that converts its d42 fields on first access.
+
+    Until then it holds the normalized schemas it needs, even with `keep_raw=False`.
+    """
+
+    __slots__ = ("_pending",)
+
+    _pending: dict[str, tuple[dict[str, Any] | None, str, InternTable | None]]
+
+    queries_schema_d42 = _lazy_field("queries_schema_d42")
+    response_schema_d42 = _lazy_field("response_schema_d42")
+    request_schema_d42 = _lazy_field("request_schema_d42")
+    request_headers_d42 = _lazy_field("request_headers_d42")
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, SchemaData):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in _FIELD_NAMES)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return SchemaData.__repr__(self).replace(type(self).__name__, "SchemaData", 1)
+
+
+_FIELD_NAMES = tuple(field.name for field in fields(SchemaData))
+
+
 humanizator = {
     "get": "Get",
     "post": "Create",
@@ -61,18 +118,41 @@ humanizator = {
 }
 
 
-def collect_schema_data(value: dict[str, Any]) -> list[SchemaData]:
-    normalized_schema = openapi_normalizer(value)
+def collect_schema_data(
+    value: dict[str, Any],
+    profiler: Profiler | None = None,
+    base_path: str | None = None,
+    interner: InternTable | None = None,
+    keep_raw: bool = True,
+    lazy: bool = False,
+) -> list[SchemaData]:
+    """Collect an entry per operation and response status of an OpenAPI spec.
+
+    Args:
+        keep_raw: Keep the normalized JSON schemas next to the d42 ones. Without them the
+            normalized spec is released as soon as the d42 schemas are built.
+        lazy: Convert the d42 schemas on first access instead of right away, consumers that
+            only need names and paths never pay for the conversion.
+    """
+    with profile_phase(profiler, "normalize"):
+        normalized_schema = openapi_normalizer(value, base_path)
     paths_data = normalized_schema.get("paths", {})
 
-    return [
-        schema_data
-        for path, path_data in paths_data.items()
-        for schema_data in process_paths(path, path_data)
-    ]
-
-
-def process_paths(path: str, path_data: dict[str, Any]) -> list[SchemaData]:
+    with profile_phase(profiler, "convert"):
+        return [
+            schema_data
+            for path, path_data in paths_data.items()
+            for schema_data in process_paths(path, path_data, interner, keep_raw, lazy)
+        ]
+
+
+def process_paths(
+    path: str,
+    path_data: dict[str, Any],
+    interner: InternTable | None = None,
+    keep_raw: bool = True,
+    lazy: bool = False,
+) -> list[SchemaData]:
     paths = get_enum_paths(path, path_data)
     if not paths:
         paths = [path]
@@ -83,7 +163,10 @@ def process_paths(path: str, path_data: dict[str, Any]) -> list[SchemaData]:
             if http_method.lower() in ["get", "post", "put", "patch", "delete"]:
                 for status in method_data.get("responses", {}):
                     schema_data.append(
-                        process_method_data(enum_path, http_method, method_data, int(status))
+                        process_method_data(
+                            enum_path, http_method, method_data, int(status), interner,
+                            keep_raw, lazy
+                        )
                     )
 
     return schema_data
@@ -100,7 +183,13 @@ def get_enum_paths(path: str, path_data: dict[str, Any]) -> list[str]:
 
 
 def process_method_data(
-    path: str, http_method: str, method_data: dict[str, Any], status: int
+    path: str,
+    http_method: str,
+    method_data: dict[str, Any],
+    status: int,
+    interner: InternTable | None = None,
+    keep_raw: bool = True,
+    lazy: bool = False,
 ) -> SchemaData:
     request_schema, response_schema = get_request_response_schemas(method_data, status)
     queries_schema = get_queries(method_data)
@@ -110,31 +199,46 @@ def process_method_data(
     if request_schema:
         args.append("body")
 
-    queries_schema_d42 = _from_json_schema(queries_schema)
-    response_schema_d42 = _from_json_schema(response_schema) if response_schema else None
-    request_schema_d42 = _from_json_schema(request_schema) if request_schema else None
-    headers_schema_d42 = _from_json_schema(headers_schema)
-
-    return SchemaData(
+    # Root JSON pointers are only used by Config.NODE_HOOKS to tell operations apart
+    pointer = f"#/paths/{path.replace('~', '~0').replace('/', '~1')}/{http_method}"
+    sources = {
+        "queries_schema_d42": (queries_schema, f"{pointer}/parameters", interner),
+        "response_schema_d42": (response_schema or None, f"{pointer}/responses/{status}",
+                                interner),
+        "request_schema_d42": (request_schema or None, f"{pointer}/requestBody", interner),
+        "request_headers_d42": (headers_schema, f"{pointer}/parameters", interner),
+    }
+    if lazy:
+        converted = dict.fromkeys(sources, _PENDING)
+    else:
+        converted = {
+            name: _from_json_schema(raw, root, interner) if raw is not None else None
+            for name, (raw, root, interner) in sources.items()
+        }
+
+    schema_data = (_LazySchemaData if lazy else SchemaData)(
         http_method=http_method,
         path=path,
         converted_path=convert_to_snake_case(path),
         args=args,
-        queries_schema=queries_schema,
-        queries_schema_d42=queries_schema_d42,
+        queries_schema=queries_schema if keep_raw else None,
+        queries_schema_d42=converted["queries_schema_d42"],
         interface_method=get_interface_method_name(http_method, path),
         interface_method_humanized=get_interface_method_name(http_method, path, humanized=True),
         status=status,
         schema_prefix=get_schema_prefix(http_method, path),
         schema_prefix_humanized=get_schema_prefix(http_method, path, humanized=True),
-        response_schema=response_schema,
-        response_schema_d42=response_schema_d42,
-        request_schema=request_schema,
-        request_schema_d42=request_schema_d42,
-        request_headers=headers_schema,
-        request_headers_d42=headers_schema_d42,
+        response_schema=response_schema if keep_raw else None,
+        response_schema_d42=converted["response_schema_d42"],
+        request_schema=request_schema if keep_raw else None,
+        request_schema_d42=converted["request_schema_d42"],
+        request_headers=headers_schema if keep_raw else None,
+        request_headers_d42=converted["request_headers_d42"],
         tags=method_data.get("tags", [])
     )
+    if isinstance(schema_data, _LazySchemaData):
+        schema_data._pending = sources
+    return schema_data
 
 
 def get_request_response_schemas(
@@ -0,0 +1,112 @@
+import warnings
+from dataclasses import dataclass, field
+from typing import Any, Hashable, Iterator, Optional, Type
+
+from ._config import Config
+from ._interface import output_warning
+
+__all__ = ("Diagnostic", "Diagnostics", "report",)
+
+
+@dataclass
+class Diagnostic:
+    """A problem found while translating or normalizing, reported once per `key`.
+
+    Attributes:
+        code: Kind of the problem, e.g. 'unsupported-prop' or 'recursive-ref'.
+        template: `str.format` template of the message.
+        args: Arguments of the template, formatted only when the message is needed.
+        category: Warning category, None for problems reported through `Config.OUTPUT_FUNCTION`.
+        count: How many times the problem was reported.
+    """
+    code: str
+    template: str
+    args: tuple[Any, ...] = ()
+    category: Optional[Type[Warning]] = None
+    count: int = 1
+    _message: Optional[str] = field(default=None, repr=False, compare=False)
+
+    @property
+    def message(self) -> str:
+        if self._message is None:
+            self._message = self.template.format(*self.args)
+        return self._message
+
+    def emit(self, stacklevel: int = 1) -> None:
+        """Print or warn; `stacklevel` counts from the caller of `emit`, like `warnings.warn`."""
+        if self.category is None:
+            output_warning(self.message)
+        else:
+            warnings.warn(self.message, self.category, stacklevel=stacklevel + 1)
+
+
+class Diagnostics:
+    """Collects diagnostics instead of warning about each occurrence.
+
+    Set an instance to `Config.DIAGNOSTICS` to deduplicate the warnings of `to_json_schema`,
+    `from_json_schema`, `collect_schema_data` and `schemax generate`: every distinct problem
+    is warned about once and counted afterwards. With `quiet=True` nothing is printed or
+    warned and messages are never formatted unless they are read.
+
+    Usage:
+        Config.DIAGNOSTICS = diagnostics = Diagnostics(quiet=True)
+        collect_schema_data(spec)
+        Config.DIAGNOSTICS = None
+        print(diagnostics.summary())
+    """
+
+    def __init__(self, quiet: bool = False) -> None:
+        self.quiet = quiet
+        self._entries: dict[Hashable, Diagnostic] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[Diagnostic]:
+        return iter(list(self._entries.values()))
+
+    def add(self, key: Hashable, diagnostic: Diagnostic, stacklevel: int = 1) -> None:
+        # Concurrent reports of the same key may lose a count, but never a diagnostic
+        known = self._entries.setdefault(key, diagnostic)
+        if known is not diagnostic:
+            known.count += 1
+        elif not self.quiet:
+            diagnostic.emit(stacklevel + 1)
+
+    def merge(self, other: "Diagnostics") -> None:
+        """Add the diagnostics collected by `other`, e.g. in another process."""
+        for key, diagnostic in other._entries.items():
+            known = self._entries.setdefault(key, diagnostic)
+            if known is not diagnostic:
+                known.count += diagnostic.count
+            elif not self.quiet:
+                diagnostic.emit()
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def summary(self) -> str:
+        return "\n".join(
+            f"{diagnostic.message}" + (f" (x{diagnostic.count})" if diagnostic.count > 1 else "")
+            for diagnostic in self
+        )
+
+
+def report(
+    code: str,
+    template: str,
+    *args: Any,
+    key: Hashable = None,
+    category: Optional[Type[Warning]] = None,
+) -> None:
+    """Report a problem through `Config.DIAGNOSTICS` or, without it, right away.
+
+    Occurrences with the same `code` and `key` are one diagnostic; `key` defaults to `args`.
+    Warnings point at the caller of `report`.
+    """
+    diagnostic = Diagnostic(code, template, args, category)
+    diagnostics = Config.DIAGNOSTICS
+    if diagnostics is None:
+        diagnostic.emit(stacklevel=2)
+    else:
+        diagnostics.add((code, args if key is None else key), diagnostic, stacklevel=2)
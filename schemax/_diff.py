@@ -0,0 +1,201 @@
+from dataclasses import dataclass, field
+from hashlib import blake2b
+from typing import Any, Optional
+
+from referencing.exceptions import Unresolvable
+
+from ._ref_index import RefIndex
+
+__all__ = ("SpecDiff", "diff_specs", "SpecHasher",)
+
+_VISIT, _COMBINE, _REF_DONE = range(3)
+
+_METHODS = ("get", "put", "post", "delete", "options", "head", "patch", "trace")
+
+
+def _digest(data: Any) -> bytes:
+    return blake2b(repr(data).encode(), digest_size=16).digest()
+
+
+class SpecHasher:
+    """Content hashes of the subtrees of a spec as they are after `openapi_normalizer`.
+
+    A `$ref` hashes as its target, so a subtree's hash changes whenever anything it
+    references changes, but nothing is expanded: every node and every ref target is hashed
+    once and memoized, which keeps the cost linear in the size of the spec as written.
+    Object keys are hashed in sorted order, since their order has no meaning; with `ordered`
+    they are hashed in the order they are written, which is what generated code follows.
+    """
+
+    def __init__(self, document: Any, base_path: Optional[str] = None,
+                 ordered: bool = False) -> None:
+        self.document = document
+        self.ordered = ordered
+        self.root = RefIndex(document, base_path)
+        self._nodes: dict[int, bytes] = {}  # id(node) -> hash, nodes of every file are alive
+        self._refs: dict[str, bytes] = {}  # ref key -> hash of its target
+        self._lookups: dict[tuple[int, str], tuple[str, Any, RefIndex]] = {}
+
+    def hash(self, node: Any, scope: Optional[RefIndex] = None) -> bytes:
+        if not isinstance(node, (dict, list)):
+            return _digest(node)
+        nodes = self._nodes
+        in_progress: set[str] = set()
+        # Containers are combined after their nested containers; scalars are hashed as part
+        # of their container and never scheduled on their own
+        work: list[tuple[Any, ...]] = [(_VISIT, node, scope or self.root)]
+        while work:
+            task = work.pop()
+            if task[0] == _COMBINE:
+                _, container, keys = task
+                if keys is None:
+                    parts = [nodes[id(item)] if isinstance(item, (dict, list)) else item
+                             for item in container]
+                else:
+                    parts = [(nodes[id(container[key])]
+                              if isinstance(container[key], (dict, list)) else container[key])
+                             for key in keys]
+                nodes[id(container)] = _digest((keys, parts))
+                continue
+            if task[0] == _REF_DONE:
+                _, ref_key, ref_node, target = task
+                digest = nodes[id(target)] if isinstance(target, (dict, list)) else _digest(target)
+                nodes[id(ref_node)] = self._refs[ref_key] = digest
+                in_progress.discard(ref_key)
+                continue
+
+            _, current, current_scope = task
+            if id(current) in nodes:
+                continue
+            if isinstance(current, dict):
+                ref = current.get("$ref")
+                if isinstance(ref, str):
+                    self._visit_ref(current, ref, current_scope, work, in_progress)
+                    continue
+                keys = list(current) if self.ordered else sorted(current, key=str)
+                work.append((_COMBINE, current, keys))
+                children: Any = current.values()
+            else:
+                work.append((_COMBINE, current, None))
+                children = current
+            work.extend((_VISIT, child, current_scope)
+                        for child in children if isinstance(child, (dict, list)))
+        return nodes[id(node)]
+
+    def _visit_ref(self, ref_node: dict[str, Any], ref: str, scope: RefIndex,
+                   work: list[tuple[Any, ...]], in_progress: set[str]) -> None:
+        found = self._lookups.get((id(scope), ref))
+        if found is None:
+            try:
+                found = self._lookups[(id(scope), ref)] = scope.lookup(ref)
+            except Unresolvable:
+                self._nodes[id(ref_node)] = _digest(("unresolved", ref))
+                return
+        ref_key, target, target_scope = found
+        if ref_key in self._refs:
+            self._nodes[id(ref_node)] = self._refs[ref_key]
+        elif ref_key in in_progress:
+            # The normalizer cuts recursive refs, so does the hash
+            self._nodes[id(ref_node)] = _digest(("recursive", ref_key))
+        else:
+            in_progress.add(ref_key)
+            work.append((_REF_DONE, ref_key, ref_node, target))
+            work.append((_VISIT, target, target_scope))
+
+    def operations(self) -> dict[str, bytes]:
+        """Hash of every operation ("GET /users/{id}") with the parameters of its path."""
+        hashes = {}
+        paths = self.document.get("paths") or {}
+        for path, item in paths.items():
+            scope = self.root
+            if isinstance(item, dict) and isinstance(item.get("$ref"), str):
+                try:
+                    _, item, scope = scope.lookup(item["$ref"])
+                except Unresolvable:
+                    continue
+            if not isinstance(item, dict):
+                continue
+            shared = self.hash(item.get("parameters", []), scope)
+            for method, operation in item.items():
+                if method.lower() in _METHODS:
+                    operation_hash = self.hash(operation, scope)
+                    hashes[f"{method.upper()} {path}"] = _digest((operation_hash, shared))
+        return hashes
+
+    def files(self) -> set[str]:
+        """Other files the hashed subtrees reference, directly or through other files."""
+        return {scope.path for _, _, scope in self._lookups.values()
+                if scope is not self.root and scope.path is not None}
+
+    def components(self) -> dict[str, bytes]:
+        """Hash of every component ("schemas/User"), including what it references."""
+        hashes = {}
+        components = self.document.get("components") or {}
+        for kind, entries in components.items():
+            if isinstance(entries, dict):
+                for name, entry in entries.items():
+                    hashes[f"{kind}/{name}"] = self.hash(entry)
+        return hashes
+
+
+@dataclass
+class SpecDiff:
+    """Operations and components that differ between two versions of a spec.
+
+    A changed component or operation is one whose normalized form differs, which includes
+    changes of the components it references.
+    """
+    added_operations: list[str] = field(default_factory=list)
+    removed_operations: list[str] = field(default_factory=list)
+    changed_operations: list[str] = field(default_factory=list)
+    added_components: list[str] = field(default_factory=list)
+    removed_components: list[str] = field(default_factory=list)
+    changed_components: list[str] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return any((self.added_operations, self.removed_operations, self.changed_operations,
+                    self.added_components, self.removed_components, self.changed_components))
+
+    def summary(self) -> str:
+        lines = []
+        for title, items in (
+            ("added operations", self.added_operations),
+            ("removed operations", self.removed_operations),
+            ("changed operations", self.changed_operations),
+            ("added components", self.added_components),
+            ("removed components", self.removed_components),
+            ("changed components", self.changed_components),
+        ):
+            if items:
+                lines.append(f"{title}: {len(items)}")
+                lines.extend(f"  {item}" for item in items)
+        return "\n".join(lines) if lines else "no changes"
+
+
+def _compare(old: dict[str, bytes], new: dict[str, bytes]) -> tuple[list[str], ...]:
+    added = [key for key in new if key not in old]
+    removed = [key for key in old if key not in new]
+    changed = [key for key, value in new.items() if key in old and old[key] != value]
+    return added, removed, changed
+
+
+def diff_specs(
+    old: dict[str, Any],
+    new: dict[str, Any],
+    old_base_path: Optional[str] = None,
+    new_base_path: Optional[str] = None,
+) -> SpecDiff:
+    """Compare two versions of a spec by the hashes of their operations and components.
+
+    Refs to other files are resolved relative to `old_base_path` and `new_base_path`.
+    """
+    old_hasher = SpecHasher(old, old_base_path)
+    new_hasher = SpecHasher(new, new_base_path)
+    diff = SpecDiff()
+    diff.added_operations, diff.removed_operations, diff.changed_operations = _compare(
+        old_hasher.operations(), new_hasher.operations()
+    )
+    diff.added_components, diff.removed_components, diff.changed_components = _compare(
+        old_hasher.components(), new_hasher.components()
+    )
+    return diff
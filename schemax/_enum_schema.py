@@ -0,0 +1,142 @@
+from typing import Any, FrozenSet, Tuple, Union, cast
+
+from d42.custom_type import register_type
+from d42.declaration import GenericSchema, Props, Schema, SchemaVisitor
+from d42.declaration import SchemaVisitorReturnType as ReturnType
+from d42.declaration.errors import make_already_declared_error, make_invalid_type_error
+from d42.generation import Generator
+from d42.representation import Representor
+from d42.substitution import Substitutor
+from d42.substitution.errors import make_substitution_error
+from d42.validation import Formatter, ValidationResult, Validator
+from d42.validation.errors import ValidationError
+from niltype import Nil, Nilable
+from th import PathHolder
+
+__all__ = ("EnumSchema", "EnumProps", "EnumValidationError", "schema_enum", "contains_enum",)
+
+EnumValue = Union[str, int]
+
+
+class EnumProps(Props):
+    @property
+    def values(self) -> Nilable[Tuple[EnumValue, ...]]:
+        return self.get("values")
+
+    @property
+    def members(self) -> Nilable[FrozenSet[EnumValue]]:
+        return self.get("members")
+
+
+class EnumSchema(Schema[EnumProps]):
+    """A set of strings or a set of integers, checked by a single set lookup.
+
+    `from_json_schema` uses it for large enums instead of one `schema.str(value)` per value
+    inside `schema.any`.
+    """
+
+    def __accept__(self, visitor: SchemaVisitor[ReturnType], **kwargs: Any) -> ReturnType:
+        return cast(ReturnType, visitor.visit_enum(self, **kwargs))
+
+    def __call__(self, /, *values: EnumValue) -> "EnumSchema":
+        if self.props.values is not Nil:
+            raise make_already_declared_error(self)
+
+        for value in values:
+            # bool is an int, but an enum of booleans is better served by schema.bool
+            if not isinstance(value, (str, int)) or isinstance(value, bool):
+                raise make_invalid_type_error(self, value, (str, int))
+            if type(value) is not type(values[0]):
+                raise make_invalid_type_error(self, value, (type(values[0]),))
+
+        unique = tuple(dict.fromkeys(values))
+        return self.__class__(self.props.update(values=unique, members=frozenset(unique)))
+
+
+class EnumValidationError(ValidationError):
+    def __init__(self, path: PathHolder, actual_value: Any, count: int) -> None:
+        self.path = path
+        self.actual_value = actual_value
+        self.count = count
+
+    def format(self, formatter: Formatter) -> str:
+        return cast(str, formatter.format_enum_error(self))
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.path!r}, {self.actual_value!r}, {self.count!r})"
+
+
+class EnumFormatter(Formatter, extend=True):
+    def format_enum_error(self, error: EnumValidationError) -> str:
+        actual_type = self._get_type(error.actual_value)
+        formatted_path = self._at_path(error.path)
+        return (f"Value {actual_type}{formatted_path} "
+                f"must be one of {error.count} enum values, but {error.actual_value!r} given")
+
+
+class EnumValidator(Validator, extend=True):
+    def visit_enum(self, schema: EnumSchema, *,
+                   value: Any = Nil, path: Nilable[PathHolder] = Nil,
+                   **kwargs: Any) -> ValidationResult:
+        result = self._validation_result_factory()
+        if path is Nil:
+            path = self._path_holder_factory()
+
+        # An enum without values is an enum of any strings
+        values = schema.props.values
+        expected_type = type(values[0]) if values is not Nil and values else str
+        if error := self._validate_type(path, value, expected_type):
+            return result.add_error(error)
+
+        if schema.props.members is Nil:
+            return result
+
+        members = schema.props.members
+        if type(value) is not expected_type or value not in members:
+            return result.add_error(EnumValidationError(path, value, len(members)))
+
+        return result
+
+
+class EnumGenerator(Generator, extend=True):
+    def visit_enum(self, schema: EnumSchema, **kwargs: Any) -> EnumValue:
+        if schema.props.values is Nil or not schema.props.values:
+            return self._random.random_str(8, "abcdefghijklmnopqrstuvwxyz")
+        return self._random.random_choice(schema.props.values)
+
+
+class EnumRepresentor(Representor, extend=True):
+    def visit_enum(self, schema: EnumSchema, *, indent: int = 0, **kwargs: Any) -> str:
+        r = f"{self._name}.enum"
+
+        if schema.props.values is not Nil:
+            r += f"({', '.join(repr(value) for value in schema.props.values)})"
+
+        return r
+
+
+class EnumSubstitutor(Substitutor, extend=True):
+    def visit_enum(self, schema: EnumSchema, *, value: Any = Nil, **kwargs: Any) -> EnumSchema:
+        result = schema.__accept__(self._validator, value=value)
+        if result.has_errors():
+            raise make_substitution_error(result, self._formatter)
+        return schema.__class__(schema.props.update(values=(value,), members=frozenset([value])))
+
+
+schema_enum = register_type("enum", EnumSchema)
+
+
+def contains_enum(schema: GenericSchema) -> bool:
+    """Whether an EnumSchema is anywhere in `schema`, i.e. its repr needs schemax imported."""
+    stack: list[Any] = [schema]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, EnumSchema):
+            return True
+        if isinstance(node, Schema):
+            stack.extend(node.props.get(name) for name in node.props)
+        elif isinstance(node, (tuple, list)):
+            stack.extend(node)
+        elif isinstance(node, dict):
+            stack.extend(node.values())
+    return False
@@ -0,0 +1,146 @@
+import json
+import os
+import random
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import IO, Any, Iterable, Iterator, Optional
+
+from d42 import fake
+
+from ._data_collector import SchemaData, collect_schema_data
+
+__all__ = ("iter_fake_payloads", "write_fake_payloads", "select_operations",)
+
+# A piece of work: index of the selected SchemaData, index of the chunk and its size
+Task = tuple[int, int, int]
+
+
+def _operation(item: SchemaData) -> str:
+    return f"{item.http_method.upper()} {item.path}"
+
+
+def select_operations(
+    schema_data: Iterable[SchemaData],
+    operations: Optional[Iterable[str]] = None,
+    statuses: Optional[Iterable[int]] = None,
+) -> list[SchemaData]:
+    """SchemaData of the given operations ("POST /users" or an interface method name) and
+    statuses that have anything to fake; every operation and status by default."""
+    wanted = None if operations is None else set(operations)
+    wanted_statuses = None if statuses is None else set(statuses)
+    selected = []
+    for item in schema_data:
+        if wanted is not None and not wanted & {
+            _operation(item), item.interface_method, item.interface_method_humanized
+        }:
+            continue
+        if wanted_statuses is not None and item.status not in wanted_statuses:
+            continue
+        if item.request_schema_d42 is None and item.response_schema_d42 is None:
+            continue
+        selected.append(item)
+    return selected
+
+
+class _Faker:
+    """Fakes chunks of payloads, one per worker process."""
+
+    def __init__(self, spec: dict[str, Any], base_path: Optional[str],
+                 operations: Optional[list[str]], statuses: Optional[list[int]]) -> None:
+        # Only the selected operations are converted to d42
+        schema_data = collect_schema_data(spec, base_path=base_path, lazy=True, keep_raw=False)
+        self.selected = select_operations(schema_data, operations, statuses)
+
+    def chunk(self, seed: int, task: Task) -> str:
+        item_index, chunk_index, size = task
+        item = self.selected[item_index]
+        operation = _operation(item)
+        # d42 fakes with the global `random`, a seed per chunk makes every chunk reproducible
+        # on its own, whichever process makes it. The caller's state is put back afterwards
+        state = random.getstate()
+        random.seed(f"{seed}/{operation}/{item.status}/{chunk_index}")
+        try:
+            request, response = item.request_schema_d42, item.response_schema_d42
+            lines = []
+            for _ in range(size):
+                record: dict[str, Any] = {"operation": operation, "status": item.status}
+                if request is not None:
+                    record["request"] = fake(request)
+                if response is not None:
+                    record["response"] = fake(response)
+                lines.append(json.dumps(record, default=str))
+        finally:
+            random.setstate(state)
+        lines.append("")
+        return "\n".join(lines)
+
+
+def _tasks(selected: int, count: int, chunk_size: int) -> Iterator[Task]:
+    for item_index in range(selected):
+        for chunk_index, start in enumerate(range(0, count, chunk_size)):
+            yield item_index, chunk_index, min(chunk_size, count - start)
+
+
+_faker: Optional[_Faker] = None  # of the worker process
+
+
+def _init_worker(spec: dict[str, Any], base_path: Optional[str],
+                 operations: Optional[list[str]], statuses: Optional[list[int]]) -> None:
+    global _faker
+    _faker = _Faker(spec, base_path, operations, statuses)
+
+
+def _fake_chunk(seed: int, task: Task) -> str:
+    assert _faker is not None
+    return _faker.chunk(seed, task)
+
+
+def iter_fake_payloads(
+    spec: dict[str, Any],
+    operations: Optional[Iterable[str]] = None,
+    statuses: Optional[Iterable[int]] = None,
+    count: int = 1,
+    seed: int = 0,
+    base_path: Optional[str] = None,
+    workers: Optional[int] = None,
+    chunk_size: int = 1000,
+) -> Iterator[str]:
+    """Yield NDJSON with `count` fake payloads for every selected operation and status.
+
+    A line is `{"operation": "POST /users", "status": 201, "request": ..., "response": ...}`.
+    Payloads are made in chunks of `chunk_size` by `workers` processes (all CPUs by default,
+    1 fakes in this process) and yielded in order as soon as they are ready. Every chunk is
+    seeded from `seed`, the operation and the chunk's position, so the output is the same for
+    the same seed however many workers make it.
+    """
+    operation_list = None if operations is None else list(operations)
+    status_list = None if statuses is None else list(statuses)
+    faker = _Faker(spec, base_path, operation_list, status_list)
+    tasks = _tasks(len(faker.selected), count, chunk_size)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for task in tasks:
+            yield faker.chunk(seed, task)
+        return
+
+    with ProcessPoolExecutor(workers, initializer=_init_worker,
+                             initargs=(spec, base_path, operation_list, status_list)) as executor:
+        # A few chunks per worker are in flight, the output is written in order
+        in_flight: deque[Future[str]] = deque()
+        for task in tasks:
+            if len(in_flight) >= 2 * workers:
+                yield in_flight.popleft().result()
+            in_flight.append(executor.submit(_fake_chunk, seed, task))
+        while in_flight:
+            yield in_flight.popleft().result()
+
+
+def write_fake_payloads(spec: dict[str, Any], fp: IO[str], **kwargs: Any) -> None:
+    """Write the NDJSON of `iter_fake_payloads(spec, **kwargs)` to `fp`.
+
+    Usage:
+        with open("users.ndjson", "w") as file:
+            write_fake_payloads(spec, file, operations=["POST /users"], count=100_000)
+    """
+    for chunk in iter_fake_payloads(spec, **kwargs):
+        fp.write(chunk)
@@ -1,6 +1,7 @@
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
+import threading
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple, Union
 
-from d42 import optional
 from d42.declaration.types import (
     AnySchema,
     BoolSchema,
@@ -13,14 +14,26 @@ from d42.declaration.types import (
     StrSchema,
 )
 from district42_exp_types.unordered import UnorderedSchema
+from niltype import Nil
+
+from ._config import Config
+from ._enum_schema import EnumSchema
+from ._interning import InternTable
 
 if TYPE_CHECKING:
     import builtins
 
+    from ._hooks import NodeHooks
+
     EllipsisType = builtins.ellipsis
 else:
     EllipsisType = Any
 
+# A builder makes a d42 schema from a JSON Schema node and its already converted children
+Builder = Callable[[Dict[Any, Any], List[GenericSchema]], GenericSchema]
+
+_EXPAND, _BUILD = 0, 1
+
 
 def null_visitor() -> NoneSchema:
     return NoneSchema()
@@ -95,6 +108,10 @@ def number_visitor(value: Dict[str, Any]) -> AnySchema:
 def string_visitor(value: Dict[str, Any]) -> Union[StrSchema, AnySchema]:
     sch = StrSchema()
 
+    if "const" in value:
+        sch = sch(value["const"])
+        return AnySchema()(sch, NoneSchema()) if value.get("nullable") else sch
+
     if "minLength" in value and "maxLength" in value:
         if value["minLength"] == value["maxLength"]:
             return sch.len(value["minLength"])
@@ -116,20 +133,22 @@ def string_visitor(value: Dict[str, Any]) -> Union[StrSchema, AnySchema]:
     return sch
 
 
-def array_visitor(value: Dict[str, Any]) -> ListSchema:
+def array_visitor(value: Dict[str, Any], converted: List[GenericSchema]) -> ListSchema:
+    # `converted` holds the children returned by array_children, in the same order
+    children = iter(converted)
     sch = ListSchema()
 
     if "contains" in value:
-        prop = _from_json_schema(value["contains"])
+        prop = next(children)
         sch = UnorderedSchema()([..., prop, ...])
 
     if "items" in value:
         if not isinstance(value["items"], bool):
-            prop = _from_json_schema(value["items"])
+            prop = next(children)
             sch = sch(prop)
 
     if "prefixItems" in value:
-        props = [_from_json_schema(item) for item in value["prefixItems"]]
+        props = [next(children) for _ in value["prefixItems"]]
 
         if value.get("items", True):
             props.append(Ellipsis)  # type: ignore
@@ -149,111 +168,327 @@ def array_visitor(value: Dict[str, Any]) -> ListSchema:
     return sch
 
 
-def object_visitor(value: Dict[str, Any]) -> DictSchema:
+def array_children(value: Dict[str, Any]) -> List[Any]:
+    children = []
+    if "contains" in value:
+        children.append(value["contains"])
+    if "items" in value and not isinstance(value["items"], bool):
+        children.append(value["items"])
+    if "prefixItems" in value:
+        children.extend(value["prefixItems"])
+    return children
+
+
+def object_visitor(value: Dict[str, Any], converted: List[GenericSchema]) -> DictSchema:
+    # `converted` holds the converted values of value["properties"], in the same order
     if "properties" not in value:
         return DictSchema()
 
-    props: Dict[Any, Union[GenericSchema, EllipsisType]] = {}
-    for key in value["properties"]:
-        if "required" in value:
-            if key in value["required"]:
-                props[key] = _from_json_schema(value["properties"][key])
-            else:
-                props[optional(key)] = _from_json_schema(value["properties"][key])
-        else:
-            # "By default, the properties defined by the properties keyword are not required"
-            # https://json-schema.org/understanding-json-schema/reference/object#required
-            props[optional(key)] = _from_json_schema(value["properties"][key])
+    # "By default, the properties defined by the properties keyword are not required"
+    # https://json-schema.org/understanding-json-schema/reference/object#required
+    required = set(value.get("required", ()))
+
+    # Props are built in the form DictSchema.__call__ stores them: {key: (schema, is_optional)}.
+    # This skips an optional() wrapper per key and the per-key checks, which are only there
+    # for hand-written declarations
+    keys: Dict[Any, Tuple[Union[GenericSchema, EllipsisType], bool]] = {
+        key: (prop, key not in required)
+        for key, prop in zip(value["properties"], converted)
+    }
 
     if value.get("additionalProperties", True):
-        props[Ellipsis] = Ellipsis
+        keys[Ellipsis] = (Ellipsis, False)
 
-    return DictSchema()(props)
+    return DictSchema(DictSchema().props.update(keys=keys))
 
 
-def _from_json_schema(value: Dict[Any, Any]) -> GenericSchema:
-    if "allOf" in value:
+def all_of_visitor(value: Dict[str, Any], converted: List[GenericSchema]) -> GenericSchema:
+    # Same result as summing the parts with DictSchema.__add__ (later keys win, the first
+    # occurrence keeps its place), but every key is copied once instead of once per part
+    merged: Optional[Dict[Any, Any]] = None
+    for converted_item in converted:
+        if not isinstance(converted_item, DictSchema):
+            return converted_item
+        if merged is None:
+            merged = {}
+        if converted_item.props.keys is not Nil:
+            merged.update(converted_item.props.keys)
+
+    if merged is None:
         schema: GenericSchema = DictSchema()
-        for item in value["allOf"]:
-            converted_item = _from_json_schema(item)
-            if isinstance(converted_item, DictSchema):
-                schema += converted_item
-            else:
-                return converted_item
-
-        # HACK: If ellipsis exists, need to place it at the end of dict schema keys
-        if isinstance(schema, DictSchema) and isinstance(schema.props.keys, Dict):
-            if schema.props.keys.get(Ellipsis):
-                del schema.props.keys[Ellipsis]
-                schema = schema.__add__(DictSchema()({Ellipsis: Ellipsis}))
-        if value.get("nullable"):
-            return AnySchema()(schema, NoneSchema())
-        return schema
+    else:
+        # Ellipsis (additional properties) has to be the last key of the dict schema
+        if Ellipsis in merged:
+            merged[Ellipsis] = merged.pop(Ellipsis)
+        schema = DictSchema(DictSchema().props.update(keys=merged))
+
+    if value.get("nullable"):
+        return AnySchema()(schema, NoneSchema())
+    return schema
 
-    if "oneOf" in value:
-        oneof_props: List[GenericSchema] = []
-        for var in value["oneOf"]:
-            oneof_props.append(_from_json_schema(var))
-        if not oneof_props:
-            return AnySchema()
-        return AnySchema()(*oneof_props) if len(oneof_props) > 1 else oneof_props[0]
 
+def one_of_visitor(value: Dict[str, Any], converted: List[GenericSchema]) -> GenericSchema:
+    if not converted:
+        return AnySchema()
+    return AnySchema()(*converted) if len(converted) > 1 else converted[0]
+
+
+_ENUM_VALUES: Dict[type, Callable[[Any], GenericSchema]] = {
+    type(None): lambda var: NoneSchema(),
+    bool: lambda var: BoolSchema()(var),
+    int: lambda var: IntSchema()(var),
+    float: lambda var: FloatSchema()(var),
+    str: lambda var: StrSchema()(var),
+    list: lambda var: ListSchema(),
+    dict: lambda var: DictSchema(),
+}
+
+
+def enum_visitor(value: Dict[str, Any], converted: List[GenericSchema]) -> GenericSchema:
+    threshold = Config.ENUM_COMPACT_THRESHOLD
+    if threshold is not None and len(value["enum"]) > threshold:
+        enum_props = compact_enum(value["enum"])
+    else:
+        enum_props = []
+        for var in value["enum"]:
+            make = _ENUM_VALUES.get(type(var))
+            if make is not None:
+                enum_props.append(make(var))
+    # If we have only one prop type in result we don't need it in AnySchema
+    return AnySchema()(*enum_props) if len(enum_props) > 1 else enum_props[0]
+
+
+def compact_enum(values: List[Any]) -> List[GenericSchema]:
+    """Describe a large enum with few schemas.
+
+    Values are deduplicated and grouped by type: strings become one EnumSchema, integers
+    become ranges for contiguous runs of three or more plus one EnumSchema for the rest,
+    other values keep one schema per distinct value. Groups are ordered by the first value
+    of their type.
+    """
+    groups: Dict[type, Dict[Any, None]] = {}
+    for var in values:
+        if type(var) in _ENUM_VALUES:
+            # lists and dicts are unhashable, they are all described by one empty schema
+            key = var if type(var) not in (list, dict) else None
+            groups.setdefault(type(var), {})[key] = None
+
+    enum_props: List[GenericSchema] = []
+    for var_type, group in groups.items():
+        if var_type is str:
+            strings = list(group)
+            enum_props.append(StrSchema()(strings[0]) if len(strings) == 1
+                              else EnumSchema()(*strings))
+        elif var_type is int:
+            enum_props.extend(_int_ranges(sorted(group)))
+        else:
+            make = _ENUM_VALUES[var_type]
+            enum_props.extend(make(var) for var in group)
+    return enum_props
+
+
+def _int_ranges(numbers: List[int]) -> List[GenericSchema]:
+    schemas: List[GenericSchema] = []
+    singles: List[int] = []
+    start = 0
+    for index in range(1, len(numbers) + 1):
+        if index < len(numbers) and numbers[index] == numbers[index - 1] + 1:
+            continue
+        if index - start > 2:
+            schemas.append(IntSchema().min(numbers[start]).max(numbers[index - 1]))
+        else:  # a range of two is no shorter than the two values
+            singles.extend(numbers[start:index])
+        start = index
+
+    if len(singles) == 1:
+        schemas.append(IntSchema()(singles[0]))
+    elif singles:
+        schemas.append(EnumSchema()(*singles))
+    return schemas
+
+
+def type_list_visitor(value: Dict[str, Any], converted: List[GenericSchema]) -> GenericSchema:
+    schemas = list(converted)
+    if IntSchema() in schemas:
+        schemas.append(FloatSchema())
+    if FloatSchema() in schemas:
+        schemas.append(IntSchema())
+    return AnySchema()(*schemas)
+
+
+def any_visitor(value: Dict[str, Any], converted: List[GenericSchema]) -> GenericSchema:
+    return AnySchema()
+
+
+# Nodes are classified by their "type" with one lookup; unknown types become AnySchema
+_TYPE_VISITORS: Dict[str, Builder] = {
+    "null": lambda value, converted: null_visitor(),
+    "boolean": lambda value, converted: boolean_visitor(),
+    "integer": lambda value, converted: integer_visitor(value),
+    "number": lambda value, converted: number_visitor(value),
+    "string": lambda value, converted: string_visitor(value),
+    "array": array_visitor,
+    "object": object_visitor,
+}
+
+_CHILDREN: Dict[str, Callable[[Dict[str, Any]], List[Any]]] = {
+    "array": array_children,
+    "object": lambda value: list(value.get("properties", {}).values()),
+}
+
+
+def _classify(value: Dict[Any, Any]) -> Tuple[str, Builder, List[Any]]:
+    """Find out once what a node is: its kind, its builder and the children to convert first."""
+    if "allOf" in value:
+        return "allOf", all_of_visitor, value["allOf"]
+    if "oneOf" in value:
+        return "oneOf", one_of_visitor, value["oneOf"]
     if "anyOf" in value:
-        anyof_props: List[GenericSchema] = []
-        for var in value["anyOf"]:
-            anyof_props.append(_from_json_schema(var))
-        if not anyof_props:
-            return AnySchema()
-        return AnySchema()(*anyof_props) if len(anyof_props) > 1 else anyof_props[0]
+        return "anyOf", one_of_visitor, value["anyOf"]
+    if "enum" in value:
+        return "enum", enum_visitor, []
+
+    value_type = value.get("type")
+    if value_type is None:
+        return "any", any_visitor, []
+    if isinstance(value_type, list):
+        return "type", type_list_visitor, [{"type": i} for i in value_type]
+
+    visitor = _TYPE_VISITORS.get(value_type, any_visitor)
+    children = _CHILDREN.get(value_type)
+    return str(value_type), visitor, [] if children is None else children(value)
 
+
+def _identity(schema: GenericSchema) -> GenericSchema:
+    return schema
+
+
+def _leaf_key(value: Dict[Any, Any]) -> Optional[Tuple[Any, ...]]:
+    # Types are part of the key: 1, 1.0 and True are equal, but make different schemas
+    key: List[Tuple[Any, ...]] = []
+    for name, item in value.items():
+        if type(item) is list:
+            key.append((name, tuple([(type(element), element) for element in item])))
+        else:
+            key.append((name, type(item), item))
     if "enum" in value:
-        enum_props: List[GenericSchema] = []
-        for var in value["enum"]:
-            match type(var).__name__:
-                case "NoneType":
-                    enum_props.append(NoneSchema())
-                case "bool":
-                    enum_props.append(BoolSchema()(var))
-                case "int":
-                    enum_props.append(IntSchema()(var))
-                case "float":
-                    enum_props.append(FloatSchema()(var))
-                case "str":
-                    enum_props.append(StrSchema()(var))
-                case "list":
-                    enum_props.append(ListSchema())
-                case "dict":
-                    enum_props.append(DictSchema())
-        # If we have only one prop type in result we don't need it in AnySchema
-        return AnySchema()(*enum_props) if len(enum_props) > 1 else enum_props[0]
-
-    if "type" not in value:
-        return AnySchema()
+        # enums are converted differently depending on the threshold
+        key.append(("", Config.ENUM_COMPACT_THRESHOLD))
+    leaf_key = tuple(key)
+    try:
+        hash(leaf_key)
+    except TypeError:  # e.g. a dict in "enum" or "default"
+        return None
+    return leaf_key
+
+
+# d42 schemas are immutable, so leaves converted once are shared by every later conversion.
+# Structurally similar schemas (e.g. a whole registry of them) mostly consist of the same leaves.
+# Every thread has its own cache: threads never wait for each other or see a cache being cleared
+_local = threading.local()
+_LEAF_CACHE_SIZE = 4096
+
+
+def _leaf_cache() -> Dict[Tuple[Any, ...], GenericSchema]:
+    try:
+        cache: Dict[Tuple[Any, ...], GenericSchema] = _local.leaf_cache
+    except AttributeError:
+        cache = _local.leaf_cache = {}
+    return cache
+
+
+def _child_segments(kind: str, value: Dict[Any, Any]) -> List[str]:
+    # JSON pointer segments of the children returned by _classify; only used by the hooks
+    if kind == "object":
+        return [
+            "properties/" + str(key).replace("~", "~0").replace("/", "~1")
+            for key in value.get("properties", {})
+        ]
+    if kind == "array":
+        segments = []
+        if "contains" in value:
+            segments.append("contains")
+        if "items" in value and not isinstance(value["items"], bool):
+            segments.append("items")
+        prefix_items = value.get("prefixItems", [])
+        segments.extend(f"prefixItems/{index}" for index in range(len(prefix_items)))
+        return segments
+    children = value["type"] if kind == "type" else value.get(kind, [])
+    return [f"{kind}/{index}" for index in range(len(children))]
+
+
+def _from_json_schema(
+    value: Dict[Any, Any],
+    pointer: Optional[str] = None,
+    interner: Optional[InternTable] = None,
+) -> GenericSchema:
+    # `pointer` names the root node for Config.NODE_HOOKS; the conversion itself ignores it
+    hooks = Config.NODE_HOOKS
+    if hooks is not None:
+        return _from_json_schema_with_hooks(value, pointer or "#", hooks, interner)
+    # Every built node goes through the interner, children before their parents
+    intern = interner.intern if interner is not None else _identity
+    leaf_cache = _leaf_cache()
+
+    # Explicit stack instead of recursion: the depth of a schema is only limited by memory.
+    # Expanding a node schedules its build and then its children; children are converted
+    # first and their results are taken from the top of `results` in the original order
+    results: List[GenericSchema] = []
+    work: List[Tuple[Any, ...]] = [(_EXPAND, value)]
+    while work:
+        task = work.pop()
+        if task[0] == _BUILD:
+            _, node, builder, count = task
+            converted = results[len(results) - count:]
+            del results[len(results) - count:]
+            results.append(intern(builder(node, converted)))
+            continue
+
+        node = task[1]
+        _, builder, children = _classify(node)
+        if not children:
+            leaf_key = _leaf_key(node)
+            if leaf_key is None:
+                results.append(intern(builder(node, [])))
+                continue
+            leaf = leaf_cache.get(leaf_key)
+            if leaf is None:
+                if len(leaf_cache) >= _LEAF_CACHE_SIZE:
+                    leaf_cache.clear()
+                leaf = leaf_cache[leaf_key] = builder(node, [])
+            results.append(intern(leaf))
+            continue
+        work.append((_BUILD, node, builder, len(children)))
+        work.extend((_EXPAND, child) for child in reversed(children))
+
+    return results[0]
+
+
+def _from_json_schema_with_hooks(
+    value: Dict[Any, Any], pointer: str, hooks: "NodeHooks", interner: Optional[InternTable]
+) -> GenericSchema:
+    intern = interner.intern if interner is not None else _identity
+    results: List[GenericSchema] = []
+    work: List[Tuple[Any, ...]] = [(_EXPAND, value, pointer)]
+    while work:
+        task = work.pop()
+        if task[0] == _BUILD:
+            _, node, builder, count, pointer, kind, started = task
+            converted = results[len(results) - count:]
+            del results[len(results) - count:]
+            results.append(intern(builder(node, converted)))
+            hooks.exit(pointer, kind, perf_counter() - started)
+            continue
+
+        _, node, pointer = task
+        kind, builder, children = _classify(node)
+        hooks.enter(pointer, kind)
+        started = perf_counter()
+        work.append((_BUILD, node, builder, len(children), pointer, kind, started))
+        segments = _child_segments(kind, node)
+        work.extend(
+            (_EXPAND, child, f"{pointer}/{segment}")
+            for child, segment in zip(reversed(children), reversed(segments))
+        )
 
-    if isinstance(value["type"], list):
-        schemas = []
-        for i in value["type"]:
-            schemas.append(_from_json_schema({"type": i}))
-        if IntSchema() in schemas:
-            schemas.append(FloatSchema())
-        if FloatSchema() in schemas:
-            schemas.append(IntSchema())
-        return AnySchema()(*schemas)
-
-    match value["type"]:
-        case "null":
-            return null_visitor()
-        case "boolean":
-            return boolean_visitor()
-        case "integer":
-            return integer_visitor(value)
-        case "number":
-            return number_visitor(value)
-        case "string":
-            return string_visitor(value)
-        case "array":
-            return array_visitor(value)
-        case "object":
-            return object_visitor(value)
-        case _:
-            return AnySchema()
+    return results[0]
@@ -1,12 +1,17 @@
 import os
 from abc import ABC, abstractmethod
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
 from d42 import schema
+from d42.declaration import GenericSchema
 from jinja2 import Environment, FileSystemLoader, Template
 
+from ._config import Config
 from ._data_collector import SchemaData
+from ._enum_schema import contains_enum
+from ._profiler import Profiler, profile_phase
 
 
 def get_response_suffix(status_code: str | int) -> str:
@@ -28,30 +33,63 @@ def get_response_suffix(status_code: str | int) -> str:
 
 
 class Generator(ABC):
+    profiler: Profiler | None = None
+
+    def __init__(self) -> None:
+        # With a dict, files are made in it instead of on disk. Files that are only created
+        # when missing (packages, scenarios) are `stubs`, the others are generated as a whole
+        self.files: dict[str, str] | None = None
+        self.stubs: set[str] = set()
+
     @abstractmethod
     def _get_template(self, template_name: str) -> Template:
         pass
 
     def _create_dir(self, dir_name: str) -> None:
-        if not os.path.exists(dir_name):
-            os.mkdir(dir_name)
+        if self.files is None and not os.path.exists(dir_name):
+            os.makedirs(dir_name)
 
     def _create_package(self, dir_name: str) -> None:
         self._create_dir(dir_name=dir_name)
         init_file_path = f'{dir_name}/__init__.py'
-        if not os.path.exists(init_file_path):
+        if self.files is not None:
+            self.files.setdefault(init_file_path, '')
+            self.stubs.add(init_file_path)
+        elif not os.path.exists(init_file_path):
             Path(init_file_path).touch()
 
     def _generate_by_template(self, file_path: str, template_name: str, **kwargs: Any) -> None:
-        if not os.path.exists(file_path):
-            template = self._get_template(template_name=template_name)
-            with open(file_path, 'w') as file:
-                file.write(template.render(**kwargs))
-
-    def _append_string(self, lst: list[str], suffix: str) -> list[str]:
+        exists = file_path in self.files if self.files is not None else os.path.exists(file_path)
+        if not exists:
+            with profile_phase(self.profiler, 'render'):
+                content = self._get_template(template_name=template_name).render(**kwargs)
+            self._write(file_path, content, mode='w')
+            self.stubs.add(file_path)
+
+    def _write(self, file_path: str, content: str, mode: str = 'a') -> None:
+        if self.files is not None:
+            self.files[file_path] = self.files.get(file_path, '') + content if mode == 'a' \
+                else content
+            self.stubs.discard(file_path)
+            return
+        with profile_phase(self.profiler, 'write'):
+            with open(file_path, mode) as file:
+                file.write(content)
+
+    @staticmethod
+    def _append_string(lst: list[str], suffix: str) -> list[str]:
         return [f'{suffix}.{item}' for item in lst]
 
 
+@lru_cache(maxsize=None)
+def _environment(templates_path: str) -> Environment:
+    # Templates are parsed once per process and shared by every generator, rendering is
+    # thread-safe
+    environment = Environment(loader=FileSystemLoader(templates_path))
+    environment.filters['append_str'] = Generator._append_string
+    return environment
+
+
 class MainGenerator(Generator):
     __PATH_TEMPLATES = os.path.dirname(os.path.realpath(__file__)) + '/templates'
     __TEMPLATE_SCHEMAS = 'schemas.py.j2'
@@ -69,26 +107,44 @@ class MainGenerator(Generator):
     __FILE_REQUEST_SCHEMAS = 'request_schemas.py'
 
     def __init__(
-        self, schema_data: list[SchemaData], base_url: str | None = None, humanize: bool = False
+        self,
+        schema_data: list[SchemaData],
+        base_url: str | None = None,
+        humanize: bool = False,
+        profiler: Profiler | None = None,
+        out_dir: str = '',
+        reprs: dict[int, tuple[GenericSchema, str]] | None = None,
+        files: dict[str, str] | None = None
     ):
+        """Generate into `out_dir` (the working directory by default).
+
+        `reprs` caches d42 reprs by schema identity, pass the same dict to generators of
+        several specs collected with one `InternTable` to write shared schemas once.
+        With `files`, the content of every file goes to that dict by its path and nothing
+        is written to disk.
+        """
         super().__init__()
         self.schema_data = schema_data
-        self.__templates = Environment(loader=FileSystemLoader(self.__PATH_TEMPLATES))
-        self.__templates.filters['append_str'] = self._append_string
+        self.__templates = _environment(self.__PATH_TEMPLATES)
         self.base_url = base_url
         self.humanize = humanize
+        self.profiler = profiler
+        self.out_dir = out_dir
+        self.reprs = reprs
+        self.files = files
 
     def response_schemas(self) -> None:
-        self._create_package(self.__DIRECTORY_SCHEMAS)
+        self._create_package(self._path(self.__DIRECTORY_SCHEMAS))
         self._generate_by_template(
-            file_path=f'{self.__DIRECTORY_SCHEMAS}/{self.__FILE_RESPONSE_SCHEMAS}',
+            file_path=self._path(self.__DIRECTORY_SCHEMAS, self.__FILE_RESPONSE_SCHEMAS),
             template_name=self.__TEMPLATE_SCHEMAS)
 
         # Group schemas by endpoint and deduplicate
         # Key: (schema_prefix, response_schema_d42_repr), Value: semantic_suffix
         seen_schemas: dict[tuple[str, str], str] = {}
+        definitions: list[tuple[str, str, GenericSchema]] = []
 
-        with open(f'{self.__DIRECTORY_SCHEMAS}/{self.__FILE_RESPONSE_SCHEMAS}', 'a') as file:
+        with profile_phase(self.profiler, 'repr'):
             for data_item in self.schema_data:
                 if data_item.response_schema_d42 is not None:
                     schema_prefix = data_item.schema_prefix_humanized \
@@ -98,7 +154,7 @@ class MainGenerator(Generator):
                     semantic_suffix = get_response_suffix(data_item.status)
 
                     # Create a hashable key for deduplication
-                    schema_repr = repr(data_item.response_schema_d42)
+                    schema_repr = self._repr(data_item.response_schema_d42)
                     schema_key = (schema_prefix, schema_repr)
 
                     # Skip if we've already generated this exact schema
@@ -107,83 +163,87 @@ class MainGenerator(Generator):
 
                     # Mark this schema as seen
                     seen_schemas[schema_key] = semantic_suffix
+                    definitions.append((f'{schema_prefix}{semantic_suffix}', schema_repr,
+                                        data_item.response_schema_d42))
 
-                    template = self._get_template(self.__TEMPLATE_SCHEMA_DEFINITION)
-                    file.write(
-                        template.render(
-                            schema_name=f'{schema_prefix}{semantic_suffix}',
-                            schema_definition=data_item.response_schema_d42
-                        )
-                    )
+        self._write(
+            self._path(self.__DIRECTORY_SCHEMAS, self.__FILE_RESPONSE_SCHEMAS),
+            self._render_definitions(definitions)
+        )
 
     def request_schemas(self) -> None:
-        self._create_package(self.__DIRECTORY_SCHEMAS)
+        self._create_package(self._path(self.__DIRECTORY_SCHEMAS))
         self._generate_by_template(
-            file_path=f'{self.__DIRECTORY_SCHEMAS}/{self.__FILE_REQUEST_SCHEMAS}',
+            file_path=self._path(self.__DIRECTORY_SCHEMAS, self.__FILE_REQUEST_SCHEMAS),
             template_name=self.__TEMPLATE_SCHEMAS)
 
-        with open(f'{self.__DIRECTORY_SCHEMAS}/{self.__FILE_REQUEST_SCHEMAS}', 'a') as file:
+        definitions: list[tuple[str, str, GenericSchema]] = []
+
+        with profile_phase(self.profiler, 'repr'):
             for data_item in self.schema_data:
                 if data_item.status == 200:
+                    schema_name = data_item.schema_prefix_humanized \
+                        if self.humanize else data_item.schema_prefix
                     if data_item.request_schema_d42 is not None:
-                        template = self._get_template(self.__TEMPLATE_SCHEMA_DEFINITION)
-                        schema_name = data_item.schema_prefix_humanized \
-                            if self.humanize else data_item.schema_prefix
-                        file.write(
-                            template.render(
-                                schema_name=f'{schema_name}' + 'RequestSchema',
-                                schema_definition=data_item.request_schema_d42
-                            )
+                        definitions.append(
+                            (f'{schema_name}RequestSchema',
+                             self._repr(data_item.request_schema_d42),
+                             data_item.request_schema_d42)
                         )
                     if data_item.queries_schema_d42 is not schema.any:
-                        template = self._get_template(self.__TEMPLATE_SCHEMA_DEFINITION)
-                        schema_name = data_item.schema_prefix_humanized \
-                            if self.humanize else data_item.schema_prefix
-                        file.write(
-                            template.render(
-                                schema_name=f'{schema_name}' + 'QueriesSchema',
-                                schema_definition=data_item.queries_schema_d42
-                            )
+                        definitions.append(
+                            (f'{schema_name}QueriesSchema',
+                             self._repr(data_item.queries_schema_d42),
+                             data_item.queries_schema_d42)
                         )
 
+        self._write(
+            self._path(self.__DIRECTORY_SCHEMAS, self.__FILE_REQUEST_SCHEMAS),
+            self._render_definitions(definitions)
+        )
+
     def interfaces(self) -> None:
-        self._create_package(self.__DIRECTORY_INTERFACES)
+        self._create_package(self._path(self.__DIRECTORY_INTERFACES))
         self._generate_by_template(
-            file_path=f'{self.__DIRECTORY_INTERFACES}/{self.__FILE_API_INTERFACE}',
+            file_path=self._path(self.__DIRECTORY_INTERFACES, self.__FILE_API_INTERFACE),
             template_name=self.__TEMPLATE_INTERFACES,
             base_url=self.base_url
         )
 
-        with open(f'{self.__DIRECTORY_INTERFACES}/{self.__FILE_API_INTERFACE}', 'a') as file:
-            for data_item in self.schema_data:
-                if data_item.status == 200:
-                    template = self._get_template(self.__TEMPLATE_API_ROUTE)
-                    file.write(
-                        template.render(
-                            interface_method=(
-                                data_item.interface_method_humanized.lower()
-                                if self.humanize
-                                else data_item.interface_method
-                            ),
-                            http_method=data_item.http_method.upper(),
-                            path=data_item.path,
-                            args=data_item.args,
-                            request_schema=(
-                                data_item.request_schema_d42
-                                if data_item.request_schema_d42 is not None
-                                else None
-                            )
-                        )
+        with profile_phase(self.profiler, 'render'):
+            template = self._get_template(self.__TEMPLATE_API_ROUTE)
+            content = ''.join(
+                template.render(
+                    interface_method=(
+                        data_item.interface_method_humanized.lower()
+                        if self.humanize
+                        else data_item.interface_method
+                    ),
+                    http_method=data_item.http_method.upper(),
+                    path=data_item.path,
+                    args=data_item.args,
+                    request_schema=(
+                        data_item.request_schema_d42
+                        if data_item.request_schema_d42 is not None
+                        else None
                     )
+                )
+                for data_item in self.schema_data
+                if data_item.status == 200
+            )
+
+        self._write(self._path(self.__DIRECTORY_INTERFACES, self.__FILE_API_INTERFACE), content)
 
     def scenarios(self) -> None:
-        self._create_package(self.__DIRECTORY_SCENARIOS)
+        self._create_package(self._path(self.__DIRECTORY_SCENARIOS))
         for data_item in self.schema_data:
             schema_prefix = data_item.schema_prefix_humanized \
                 if self.humanize else data_item.schema_prefix
 
             self._generate_by_template(
-                file_path=f'{self.__DIRECTORY_SCENARIOS}/{data_item.interface_method}.py',
+                file_path=self._path(
+                    self.__DIRECTORY_SCENARIOS, f'{data_item.interface_method}.py'
+                ),
                 template_name=self.__TEMPLATE_SCENARIO,
                 subject=data_item.interface_method.split('_'),
                 interface_method=(
@@ -210,5 +270,32 @@ class MainGenerator(Generator):
         self.interfaces()
         self.scenarios()
 
+    def _path(self, *parts: str) -> str:
+        return os.path.join(self.out_dir, *parts)
+
+    def _repr(self, d42_schema: GenericSchema) -> str:
+        if self.reprs is None:
+            return repr(d42_schema)
+        cached = self.reprs.get(id(d42_schema))
+        # The cache holds the schema itself, so its id can't be reused by another one
+        if cached is None or cached[0] is not d42_schema:
+            cached = self.reprs[id(d42_schema)] = (d42_schema, repr(d42_schema))
+        return cached[1]
+
+    def _render_definitions(self, definitions: list[tuple[str, str, GenericSchema]]) -> str:
+        with profile_phase(self.profiler, 'render'):
+            template = self._get_template(self.__TEMPLATE_SCHEMA_DEFINITION)
+            content = ''.join(
+                template.render(schema_name=schema_name, schema_definition=schema_definition)
+                for schema_name, schema_definition, _ in definitions
+            )
+            # Compacted enums are a schemax type, it's registered in d42 on import. Without
+            # compaction `from_json_schema` makes none, so schemas aren't searched for them
+            if Config.ENUM_COMPACT_THRESHOLD is not None and any(
+                contains_enum(d42_schema) for _, _, d42_schema in definitions
+            ):
+                content = 'import schemax  # noqa: F401\n\n' + content
+            return content
+
     def _get_template(self, template_name: str) -> Template:
         return self.__templates.get_template(name=template_name)
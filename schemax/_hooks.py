@@ -0,0 +1,67 @@
+import heapq
+from dataclasses import dataclass
+
+
+class NodeHooks:
+    """Node-level profiling hooks.
+
+    Set an instance to `Config.NODE_HOOKS` to get a callback for every node visited by
+    `Translator` (d42 path, e.g. "_['users'][*]['id']") and `_from_json_schema`
+    (JSON pointer, e.g. "#/properties/users/items/properties/id").
+    `elapsed` is inclusive: it contains the time spent in the whole subtree.
+    Hooks are called from every thread that converts schemas, the built-in ones expect one.
+    """
+
+    def enter(self, path: str, kind: str) -> None:
+        pass
+
+    def exit(self, path: str, kind: str, elapsed: float) -> None:
+        pass
+
+
+@dataclass
+class NodeTiming:
+    total: float
+    self_time: float
+    path: str
+    kind: str
+
+
+class TopSubtrees(NodeHooks):
+    """Keeps the `limit` most expensive subtrees (by inclusive or by self time)."""
+
+    def __init__(self, limit: int = 10, by_self_time: bool = False) -> None:
+        self.limit = limit
+        self.by_self_time = by_self_time
+        self._heap: list[tuple[float, int, NodeTiming]] = []
+        self._children_time: list[float] = []
+        self._counter = 0
+
+    def enter(self, path: str, kind: str) -> None:
+        self._children_time.append(0.0)
+
+    def exit(self, path: str, kind: str, elapsed: float) -> None:
+        self_time = elapsed - self._children_time.pop()
+        if self._children_time:
+            self._children_time[-1] += elapsed
+
+        timing = NodeTiming(elapsed, self_time, path, kind)
+        weight = self_time if self.by_self_time else elapsed
+        self._counter += 1
+        item = (weight, self._counter, timing)
+        if len(self._heap) < self.limit:
+            heapq.heappush(self._heap, item)
+        elif weight > self._heap[0][0]:
+            heapq.heapreplace(self._heap, item)
+
+    def top(self) -> list[NodeTiming]:
+        return [timing for _, _, timing in sorted(self._heap, reverse=True)]
+
+    def report(self) -> str:
+        lines = [f"{'total, ms':>10}{'self, ms':>10}  {'kind':<10}path"]
+        for timing in self.top():
+            lines.append(
+                f"{timing.total * 1000:>10.3f}{timing.self_time * 1000:>10.3f}  "
+                f"{timing.kind:<10}{timing.path}"
+            )
+        return "\n".join(lines)
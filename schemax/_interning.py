@@ -0,0 +1,81 @@
+from typing import Any, Dict, Hashable, Set
+
+from d42.declaration import GenericSchema, Schema
+
+__all__ = ("InternTable",)
+
+_SCALARS = frozenset([str, int, float, bool, type(None), type(Ellipsis)])
+_SCHEMA_TYPES: Set[type] = set()
+
+
+class InternTable:
+    """Makes structurally identical d42 schemas a single shared object.
+
+    A schema is identified by its type, its own props and the identity of its already
+    interned children, so a lookup costs as much as the node itself, not its whole subtree.
+    d42 schemas are immutable, which makes sharing them safe.
+
+    The table keeps every interned schema alive: create one per call or per session
+    and drop it to release the memory. A table is not meant to be used by several threads at
+    the same time, give each thread its own.
+
+    Usage:
+        interner = InternTable()
+        schema_data = collect_schema_data(spec, interner=interner)
+        print(interner.report())
+    """
+
+    def __init__(self) -> None:
+        self._table: Dict[Hashable, GenericSchema] = {}
+        self._interned: Dict[int, GenericSchema] = {}  # id -> schema, also keeps ids valid
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def intern(self, schema: GenericSchema) -> GenericSchema:
+        if id(schema) in self._interned:
+            return schema
+
+        props = schema.props._registry
+        key = (type(schema), tuple(
+            (name, self._freeze(props[name])) for name in sorted(props)
+        ))
+        try:
+            canonical = self._table.get(key)
+        except TypeError:  # a prop value that can't be hashed, the schema stays as it is
+            return schema
+
+        if canonical is not None:
+            self.hits += 1
+            return canonical
+
+        self.misses += 1
+        self._table[key] = schema
+        self._interned[id(schema)] = schema
+        return schema
+
+    def _freeze(self, value: Any) -> Any:
+        value_type = type(value)
+        if value_type in _SCALARS:
+            # Types are part of the key: 1, 1.0 and True are equal, but make different schemas
+            return value_type, value
+        if value_type in _SCHEMA_TYPES or issubclass(value_type, Schema):
+            # issubclass on an ABC is slow, remember the answer; concurrent adds are harmless
+            _SCHEMA_TYPES.add(value_type)
+            return id(value) if id(value) in self._interned else id(self.intern(value))
+        if value_type is dict:
+            return dict, tuple([(key, self._freeze(item)) for key, item in value.items()])
+        if value_type is tuple or value_type is list:
+            return value_type, tuple([self._freeze(item) for item in value])
+        return value_type, value
+
+    def report(self) -> str:
+        return (f"interned nodes: {len(self)}, hits: {self.hits}, misses: {self.misses}, "
+                f"hit rate: {self.hit_rate:.1%}")
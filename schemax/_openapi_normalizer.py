@@ -1,39 +1,102 @@
-from typing import Any
-
-from referencing import Registry, Resource
-from referencing._core import Resolver
-
-from ._interface import output_warning
-
-
-def openapi_normalizer(value: dict[str, Any]) -> dict[str, Any]:
-    recursive_cases: set[str] = set()
-
-    def schema_runner(
-        schema: dict[str, Any],
-        resolver: Resolver[dict[str, Any]],
-        path: list[str],
-    ) -> dict[str, Any]:
-        if isinstance(schema, dict):
-            if "$ref" in schema:
-                ref = schema["$ref"]
-                if ref in path:
-                    recursive_cases.add(f"{ref}")
-                    return {}
-                resolved = resolver.lookup(schema["$ref"]).contents
-                return schema_runner(resolved, resolver, path + [ref])
-            else:
-                return {k: schema_runner(v, resolver, path) for k, v in schema.items()}
-        elif isinstance(schema, list):
-            return [schema_runner(item, resolver, path) for item in schema]  # noqa
+from typing import Any, Optional
+
+from ._complexity import ExpansionLimitError, analyze_spec, check_limits
+from ._config import Config
+from ._diagnostics import report
+from ._ref_index import RefIndex
+
+_NORMALIZE, _LEAVE = range(2)
+
+
+def openapi_normalizer(
+    value: dict[str, Any],
+    base_path: Optional[str] = None,
+    scope: Optional[RefIndex] = None,
+) -> dict[str, Any]:
+    """Inline every $ref of `value`, including refs to other files.
+
+    Refs to other files are resolved relative to `base_path` (the file `value` was read
+    from) or to the working directory. Local refs are resolved in `value` itself, or in the
+    document of `scope`, which normalizes a part of a spec without the rest of it.
+    """
+    max_nodes, max_depth = Config.MAX_NODES, Config.MAX_DEPTH
+    if max_nodes is not None or max_depth is not None or Config.WARN_NODES is not None:
+        # Pre-flight: warn or refuse before anything is expanded
+        complexity = analyze_spec(value if scope is None else scope.document,
+                                  base_path=base_path if scope is None else scope.path)
+        if Config.WARN_NODES is not None and complexity.expanded_nodes > Config.WARN_NODES:
+            report("expansion", "Spec expands to {} nodes\n{}",
+                   complexity.expanded_nodes, complexity.summary())
+        check_limits(complexity, max_nodes, max_depth)
+
+    recursive_cases: dict[str, None] = {}
+    nodes = 0
+    root = scope or RefIndex(value, base_path)
+    lookups: dict[tuple[int, str], tuple[str, Any, RefIndex]] = {}
+
+    # Explicit stack instead of recursion, so the nesting of a spec is only limited by memory.
+    # A task writes the normalized `node` into `container[key]`; containers are copied with
+    # all their keys up front to keep the original order. Refs that are being expanded live
+    # in `active_refs` and are removed by a _LEAVE marker once their target is done.
+    # Every task carries the index its refs are resolved with, i.e. the file it comes from.
+    out: list[Any] = [None]
+    active_refs: set[str] = set()
+    work: list[tuple[Any, ...]] = [(_NORMALIZE, value, out, 0, 0, root)]
+    while work:
+        task = work.pop()
+        if task[0] == _LEAVE:
+            active_refs.discard(task[1])
+            continue
+
+        _, node, container, key, depth, scope = task
+        nodes += 1
+        if max_nodes is not None and nodes > max_nodes:
+            raise ExpansionLimitError(f"Normalization exceeded the limit of {max_nodes} nodes")
+
+        if isinstance(node, dict):
+            if "$ref" in node:
+                ref = node["$ref"]
+                found = lookups.get((id(scope), ref))
+                if found is None:
+                    found = lookups[(id(scope), ref)] = scope.lookup(ref)
+                ref_key, target, target_scope = found
+                if ref_key in active_refs:
+                    recursive_cases[ref] = None
+                    container[key] = {}
+                    continue
+                nodes -= 1  # the ref is replaced by its target, which is counted instead
+                active_refs.add(ref_key)
+                work.append((_LEAVE, ref_key))
+                work.append((_NORMALIZE, target, container, key, depth, target_scope))
+                continue
+            if max_depth is not None and depth >= max_depth:
+                raise ExpansionLimitError(f"Normalization exceeded the depth limit of {max_depth}")
+            normalized: Any = dict(node)
+            children: Any = node.items()
+        elif isinstance(node, list):
+            if max_depth is not None and depth >= max_depth:
+                raise ExpansionLimitError(f"Normalization exceeded the depth limit of {max_depth}")
+            normalized = list(node)
+            children = enumerate(node)
         else:
-            return schema
+            container[key] = node
+            continue
 
-    resource = Resource.opaque(value)
-    resolver = Registry().resolver_with_root(resource)
-    out_schema = schema_runner(value, resolver, [])
+        # Scalars are already in the copy; only nested containers are scheduled
+        container[key] = normalized
+        pending = [
+            (_NORMALIZE, child, normalized, child_key, depth + 1, scope)
+            for child_key, child in children
+            if isinstance(child, (dict, list))
+        ]
+        nodes += len(normalized) - len(pending)
+        if max_nodes is not None and nodes > max_nodes:
+            raise ExpansionLimitError(f"Normalization exceeded the limit of {max_nodes} nodes")
+        pending.reverse()
+        work.extend(pending)
+    out_schema: dict[str, Any] = out[0]
 
     if recursive_cases:
         warning_output = '\n'.join(recursive_cases)
-        output_warning(f"Curicular cases in spec:{warning_output}")
+        report("recursive-ref", "Curicular cases in spec:{}", warning_output)
     return out_schema
@@ -0,0 +1,129 @@
+import json
+import sys
+import time
+import tracemalloc
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from dataclasses import asdict, dataclass
+from typing import Any
+
+
+@dataclass
+class PhaseStats:
+    """Accumulated measurements of a single profiling phase.
+
+    Attributes:
+        name: Phase name, e.g. 'parse', 'normalize', 'convert', 'repr', 'render', 'write'.
+        calls: How many times the phase was entered.
+        wall_time: Total wall-clock time in seconds.
+        cpu_time: Total process CPU time in seconds.
+        objects: Net change of allocated memory blocks (a cheap proxy for live objects).
+        peak_memory: Highest tracemalloc peak in bytes observed inside the phase.
+    """
+    name: str
+    calls: int = 0
+    wall_time: float = 0.0
+    cpu_time: float = 0.0
+    objects: int = 0
+    peak_memory: int = 0
+
+
+class Profiler:
+    """Collects per-phase wall time, CPU time, object and memory statistics.
+
+    Usage:
+        with Profiler() as profiler:
+            schema_data = collect_schema_data(spec, profiler=profiler)
+            MainGenerator(schema_data, profiler=profiler).all()
+        print(profiler.report())
+    """
+
+    def __init__(self, trace_memory: bool = True) -> None:
+        self.trace_memory = trace_memory
+        self._phases: dict[str, PhaseStats] = {}
+        self._peaks: list[int] = []
+        self._started_tracing = False
+
+    def __enter__(self) -> "Profiler":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    def stop(self) -> None:
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        stats = self._phases.get(name)
+        if stats is None:
+            stats = self._phases[name] = PhaseStats(name)
+
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            # The enclosing phase must not lose its peak when we reset it for this one
+            if self._peaks:
+                self._peaks[-1] = max(self._peaks[-1], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+            self._peaks.append(0)
+
+        blocks = sys.getallocatedblocks()
+        cpu_started = time.process_time()
+        wall_started = time.perf_counter()
+        try:
+            yield
+        finally:
+            stats.wall_time += time.perf_counter() - wall_started
+            stats.cpu_time += time.process_time() - cpu_started
+            stats.objects += sys.getallocatedblocks() - blocks
+            stats.calls += 1
+            if tracing and tracemalloc.is_tracing():
+                peak = max(self._peaks.pop(), tracemalloc.get_traced_memory()[1])
+                stats.peak_memory = max(stats.peak_memory, peak)
+                if self._peaks:
+                    self._peaks[-1] = max(self._peaks[-1], peak)
+
+    @property
+    def phases(self) -> list[PhaseStats]:
+        return list(self._phases.values())
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "phases": [asdict(stats) for stats in self._phases.values()],
+            "total": {
+                "wall_time": sum(stats.wall_time for stats in self._phases.values()),
+                "cpu_time": sum(stats.cpu_time for stats in self._phases.values()),
+            },
+        }
+
+    def dump(self, file_path: str) -> None:
+        with open(file_path, "w") as file:
+            json.dump(self.to_dict(), file, indent=2)
+
+    def report(self) -> str:
+        lines = [
+            f"{'phase':<12}{'calls':>8}{'wall, s':>12}{'cpu, s':>12}"
+            f"{'objects':>12}{'peak, KiB':>14}"
+        ]
+        for stats in self._phases.values():
+            lines.append(
+                f"{stats.name:<12}{stats.calls:>8}{stats.wall_time:>12.4f}{stats.cpu_time:>12.4f}"
+                f"{stats.objects:>12}{stats.peak_memory / 1024:>14.1f}"
+            )
+        total = self.to_dict()["total"]
+        lines.append(f"{'total':<12}{'':>8}{total['wall_time']:>12.4f}{total['cpu_time']:>12.4f}")
+        return "\n".join(lines)
+
+
+def profile_phase(profiler: Profiler | None, name: str) -> AbstractContextManager[None]:
+    if profiler is None:
+        return nullcontext()
+    return profiler.phase(name)
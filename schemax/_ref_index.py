@@ -0,0 +1,150 @@
+import json
+import os
+import threading
+from functools import lru_cache
+from typing import Any, Optional
+from urllib.parse import urlsplit
+
+import yaml
+from referencing import Registry, Resource
+from referencing.exceptions import Unresolvable
+
+_DEFINITIONS = ("$defs", "definitions")
+
+_MISSING = object()
+
+
+def _escape(token: str) -> str:
+    return token.replace("~", "~0").replace("/", "~1")
+
+
+class RefIndex:
+    """Resolves the $refs of one document through a dict built once.
+
+    The index holds every entry of `#/components/<kind>/<name>`, of `$defs`/`definitions`
+    blocks at any depth, `$anchor`s (as "#name") and `$id`s. Other refs are resolved by
+    `referencing` once and cached, so every ref string costs one dict lookup after its
+    first use.
+
+    Refs to other files (`./common/money.yaml#/Money`) are resolved relative to `path`, or to
+    the working directory if it's not given; every file is parsed once per modification.
+
+    Indexes of referenced files are cached and shared by every thread, so the index is built
+    under a lock; lookups after that don't lock.
+    """
+
+    def __init__(self, document: Any, path: Optional[str] = None) -> None:
+        self._document = document
+        self._path = path
+        self._prefix = ""  # makes refs of different files distinct, see `lookup`
+        self._targets: dict[str, Any] = {}
+        self._resolver: Any = None
+        self._indexed = False  # documents without refs never pay for the index
+        self._lock = threading.Lock()
+
+    @property
+    def document(self) -> Any:
+        return self._document
+
+    @property
+    def path(self) -> Optional[str]:
+        """The file of the document, if it was read from one."""
+        return self._path
+
+    def _index(self, document: Any) -> None:
+        with self._lock:
+            if not self._indexed:
+                self._build_index(document)
+                self._indexed = True  # only after every target is in place
+
+    def _build_index(self, document: Any) -> None:
+        targets = self._targets
+        components = document.get("components") if isinstance(document, dict) else None
+        if isinstance(components, dict):
+            for kind, entries in components.items():
+                if isinstance(entries, dict):
+                    prefix = f"#/components/{_escape(kind)}/"
+                    for name, entry in entries.items():
+                        targets[prefix + _escape(name)] = entry
+
+        stack: list[tuple[Any, str]] = [(document, "#")]
+        while stack:
+            node, pointer = stack.pop()
+            if isinstance(node, dict):
+                anchor = node.get("$anchor")
+                if isinstance(anchor, str):
+                    targets.setdefault(f"#{anchor}", node)
+                schema_id = node.get("$id")
+                if isinstance(schema_id, str) and node is not document:
+                    targets.setdefault(schema_id, node)
+                for key, child in node.items():
+                    if not isinstance(child, (dict, list)):
+                        continue
+                    child_pointer = f"{pointer}/{_escape(str(key))}"
+                    if key in _DEFINITIONS and isinstance(child, dict):
+                        for name, entry in child.items():
+                            targets[f"{child_pointer}/{_escape(name)}"] = entry
+                    stack.append((child, child_pointer))
+            else:
+                for index, child in enumerate(node):
+                    if isinstance(child, (dict, list)):
+                        stack.append((child, f"{pointer}/{index}"))
+
+    def resolve(self, ref: str) -> Any:
+        """Return the target of `ref`, raises `referencing.exceptions.Unresolvable`."""
+        if not self._indexed:
+            self._index(self._document)
+        target = self._targets.get(ref, _MISSING)
+        if target is _MISSING:
+            resolver = self._resolver
+            if resolver is None:  # racing threads build equal resolvers, either one is fine
+                resolver = self._resolver = Registry().resolver_with_root(
+                    Resource.opaque(self._document)
+                )
+            target = self._targets[ref] = resolver.lookup(ref).contents
+        return target
+
+    def lookup(self, ref: str) -> tuple[str, Any, "RefIndex"]:
+        """Resolve a ref that may point to another file.
+
+        Returns:
+            A key that identifies the target across files, the target and the index refs
+            inside the target must be resolved with.
+        """
+        file_name, _, fragment = ref.partition("#")
+        if not file_name:
+            return self._prefix + ref, self.resolve(ref), self
+        if not self._indexed:
+            self._index(self._document)
+        if ref in self._targets or len(urlsplit(file_name).scheme) > 1:
+            # A `$id` of this document, absolute URIs are never files (`C:` is a drive)
+            return self._prefix + ref, self.resolve(ref), self
+
+        base_dir = os.path.dirname(self._path) if self._path else os.getcwd()
+        try:
+            scope = load_document(os.path.join(base_dir, file_name))
+        except (OSError, ValueError, yaml.YAMLError) as e:
+            raise Unresolvable(ref) from e
+        return scope.lookup(f"#{fragment}")
+
+
+@lru_cache(maxsize=256)
+def _load(path: str, mtime: int, size: int) -> RefIndex:
+    with open(path, "r") as file:
+        if path.endswith(".json"):
+            document = json.load(file)
+        else:
+            document = yaml.load(file, yaml.FullLoader)
+    index = RefIndex(document, path)
+    index._prefix = path
+    return index
+
+
+def load_document(path: str) -> RefIndex:
+    """Parse a spec file once per (path, mtime, size) and keep its index for later runs.
+
+    The size catches edits within one tick of a coarse file system clock.
+    """
+    path = os.path.realpath(path)
+    stat = os.stat(path)
+    return _load(path, stat.st_mtime_ns, stat.st_size)
@@ -0,0 +1,132 @@
+import re
+from dataclasses import dataclass
+from typing import Any, Iterable, Optional
+from urllib.parse import unquote, urlsplit
+
+from ._data_collector import SchemaData
+
+__all__ = ("Router", "RouteMatch",)
+
+_PARAMETER = re.compile(r"{([^}]+)}")
+
+# Operations of a path template: http method (lower case) -> status -> SchemaData
+Operations = dict[str, dict[Any, SchemaData]]
+
+
+@dataclass
+class RouteMatch:
+    """A path template that matches a request path.
+
+    Attributes:
+        path: Path template as written in the spec, e.g. '/users/{userId}'.
+        args: Decoded values of the path parameters by their names in the template.
+        operations: SchemaData of the template by http method (lower case) and status.
+    """
+    path: str
+    args: dict[str, str]
+    operations: Operations
+
+
+class _Node:
+    __slots__ = ("literals", "patterns", "parameter", "path", "names", "operations")
+
+    def __init__(self) -> None:
+        self.literals: dict[str, _Node] = {}
+        self.patterns: dict[str, tuple[re.Pattern[str], _Node]] = {}  # 'v{version}.json'
+        self.parameter: Optional[_Node] = None  # a whole segment, '{id}'
+        self.path: Optional[str] = None  # set on nodes where a template ends
+        self.names: list[str] = []
+        self.operations: Operations = {}
+
+
+def _segments(path: str) -> list[str]:
+    return path.split("/")[1:] if path.startswith("/") else path.split("/")
+
+
+class Router:
+    """Finds the SchemaData of a concrete request path.
+
+    Path templates are compiled into a trie of segments, so a lookup takes time proportional
+    to the length of the path, not the number of templates. A literal segment wins over a
+    segment with parameters, which wins over a plain parameter ('/users/me' before
+    '/users/{id}'); if the preferred branch doesn't match to the end (or has no operation for
+    the method), the next one is tried.
+
+    Usage:
+        router = Router(collect_schema_data(spec))
+        match = router.match("/users/42/orders?x=1", "GET")
+        match.args  # {'userId': '42'}
+        match.operations["get"][200].response_schema_d42
+    """
+
+    def __init__(self, schema_data: Iterable[SchemaData] = ()) -> None:
+        self._root = _Node()
+        self._routes = 0
+        for item in schema_data:
+            self.add(item)
+
+    def __len__(self) -> int:
+        return self._routes
+
+    def add(self, item: SchemaData) -> None:
+        node = self._root
+        names: list[str] = []
+        for segment in _segments(item.path):
+            if "{" not in segment:
+                node = node.literals.setdefault(segment, _Node())
+                continue
+            names += _PARAMETER.findall(segment)
+            if _PARAMETER.fullmatch(segment):
+                if node.parameter is None:
+                    node.parameter = _Node()
+                node = node.parameter
+                continue
+            # Parameters of templates with different names share the node, names are per template
+            shape = _PARAMETER.sub("{}", segment)
+            if shape not in node.patterns:
+                regex = "([^/]+?)".join(re.escape(part) for part in shape.split("{}"))
+                node.patterns[shape] = (re.compile(regex), _Node())
+            node = node.patterns[shape][1]
+
+        if node.path is None:
+            node.path = item.path
+            node.names = names
+            self._routes += 1
+        node.operations.setdefault(item.http_method.lower(), {})[item.status] = item
+
+    def match(self, path: str, method: Optional[str] = None) -> Optional[RouteMatch]:
+        """Find the template of `path` (a query string and a host are ignored).
+
+        With `method` only templates that have an operation for it match, and `operations`
+        has just that method.
+        """
+        segments = [unquote(segment) for segment in _segments(urlsplit(path).path)]
+        method = method.lower() if method is not None else None
+        count = len(segments)
+
+        # Depth-first, the most specific branch is popped first
+        stack: list[tuple[_Node, int, tuple[str, ...]]] = [(self._root, 0, ())]
+        while stack:
+            node, index, values = stack.pop()
+            if index == count:
+                if node.path is None:
+                    continue
+                if method is None:
+                    operations = node.operations
+                elif method in node.operations:
+                    operations = {method: node.operations[method]}
+                else:
+                    continue
+                return RouteMatch(node.path, dict(zip(node.names, values)), operations)
+
+            segment = segments[index]
+            if segment and node.parameter is not None:
+                stack.append((node.parameter, index + 1, values + (segment,)))
+            for regex, pattern_node in node.patterns.values():
+                found = regex.fullmatch(segment)
+                if found is not None:
+                    stack.append((pattern_node, index + 1, values + found.groups()))
+            literal = node.literals.get(segment)
+            if literal is not None:
+                stack.append((literal, index + 1, values))
+        return None
@@ -0,0 +1,142 @@
+import json
+from typing import IO, Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from d42.declaration import GenericSchema
+
+from ._config import Config
+from ._translator import Translator
+
+__all__ = ("iter_json_schema", "to_json_schema_stream",)
+
+_NODE, _VALUE, _TEXT = range(3)
+
+_DRAFT = "https://json-schema.org/draft/2020-12/schema#"
+_CHUNK_SIZE = 64 * 1024
+
+_translator = Translator()
+
+# Placeholders of an opened container: (id of the dict/list that holds it, key) -> child
+Pending = Dict[Tuple[int, Any], Tuple[GenericSchema, Dict[str, Any]]]
+# Dicts and lists that must be written item by item: the opened object and placeholder holders
+Open = Tuple[Any, Pending, Set[int]]
+
+
+def _key(key: Any) -> str:
+    if type(key) is str:
+        return json.dumps(key)
+    # Non-string keys are converted the way json.dumps converts them
+    return json.dumps({key: None})[1:-len(": null}")]
+
+
+def _open(translator: Translator, node: GenericSchema, kwargs: Dict[str, Any]) -> Open:
+    opener = translator._openers.get(type(node))
+    if opener is None:
+        return node.__accept__(translator, **kwargs), {}, set()
+    obj, children = opener(translator, node, kwargs)
+    pending: Pending = {}
+    for child, container, key, child_kwargs, _ in children:
+        if type(container) is dict and key not in container:
+            container[key] = None  # `_translate` adds such keys last, when the child is done
+        pending[(id(container), key)] = (child, child_kwargs)
+    return obj, pending, {id(obj)} | {holder for holder, _ in pending}
+
+
+def iter_json_schema(
+    schema: GenericSchema,
+    title: Optional[str] = None,
+    hide_draft: Optional[bool] = False,
+    **kwargs: Any
+) -> Iterator[str]:
+    """Yield `json.dumps(to_json_schema(schema, title, hide_draft))` in chunks.
+
+    Containers are translated one level at a time and written out right away, so the complete
+    translation never exists in memory; the output is the same text `json.dumps` produces.
+    """
+    if Config.NODE_HOOKS is not None:
+        # Hooks time whole subtrees, which only the regular translation can do
+        from . import to_json_schema
+        yield from json.JSONEncoder().iterencode(
+            to_json_schema(schema, title, hide_draft, **kwargs)
+        )
+        return
+
+    translator = _translator
+    root, pending, holders = _open(translator, schema, kwargs)
+    if title is not None or not hide_draft:
+        prefix: Dict[str, Any] = {} if hide_draft else {"$schema": _DRAFT}
+        if title is not None:
+            prefix["title"] = title
+        wrapped = {**prefix, **root}
+        pending = {
+            ((id(wrapped) if holder == id(root) else holder), key): child
+            for (holder, key), child in pending.items()
+        }
+        holders = {id(wrapped)} | {holder for holder, _ in pending}
+        root = wrapped
+
+    buffer: List[str] = []
+    size = 0
+    work: List[Tuple[Any, ...]] = [(_VALUE, root, pending, holders)]
+    while work:
+        task = work.pop()
+        if task[0] == _TEXT:
+            text = task[1]
+        elif task[0] == _NODE:
+            _, node, node_kwargs = task
+            work.append((_VALUE, *_open(translator, node, node_kwargs)))
+            continue
+        else:
+            _, value, pending, holders = task
+            if id(value) not in holders:
+                # Nothing left to translate inside, the value is written as a whole
+                text = json.dumps(value)
+            elif isinstance(value, dict):
+                items = list(value.items())
+                work.append((_TEXT, "}"))
+                for index in range(len(items) - 1, -1, -1):
+                    key, item = items[index]
+                    child = pending.get((id(value), key))
+                    work.append(
+                        (_NODE, *child) if child is not None
+                        else (_VALUE, item, pending, holders)
+                    )
+                    work.append((_TEXT, f"{', ' if index else ''}{_key(key)}: "))
+                text = "{"
+            else:
+                work.append((_TEXT, "]"))
+                for index in range(len(value) - 1, -1, -1):
+                    child = pending.get((id(value), index))
+                    work.append(
+                        (_NODE, *child) if child is not None
+                        else (_VALUE, value[index], pending, holders)
+                    )
+                    if index:
+                        work.append((_TEXT, ", "))
+                text = "["
+
+        buffer.append(text)
+        size += len(text)
+        if size >= _CHUNK_SIZE:
+            yield "".join(buffer)
+            buffer.clear()
+            size = 0
+
+    if buffer:
+        yield "".join(buffer)
+
+
+def to_json_schema_stream(
+    schema: GenericSchema,
+    fp: IO[str],
+    title: Optional[str] = None,
+    hide_draft: Optional[bool] = False,
+    **kwargs: Any
+) -> None:
+    """Write the JSON text of `to_json_schema(schema, title, hide_draft)` to `fp`.
+
+    Usage:
+        with open("schema.json", "w") as file:
+            to_json_schema_stream(UserSchema, file, title="User")
+    """
+    for chunk in iter_json_schema(schema, title, hide_draft, **kwargs):
+        fp.write(chunk)
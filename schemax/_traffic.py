@@ -0,0 +1,354 @@
+import json
+import os
+import re
+from base64 import b64decode
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import IO, Any, Iterator, Optional
+
+from d42 import validate
+from d42.validation import Formatter
+
+from ._data_collector import collect_schema_data
+from ._router import Router
+
+__all__ = ("TrafficReport", "EndpointStats", "validate_traffic", "iter_har_entries",)
+
+_MISSING: Any = object()  # the exchange has no such body
+_NOT_JSON: Any = object()
+
+_WHITESPACE = re.compile(r"\s*")
+_decoder = json.JSONDecoder()
+_formatter = Formatter()
+
+# A HAR entry reduced to what is validated: method, url, status, request and response text
+HarRecord = tuple[str, str, int, Optional[str], Optional[str]]
+# What workers get: ("ndjson", lines) or ("har", records)
+Batch = tuple[str, list[Any]]
+
+
+@dataclass
+class EndpointStats:
+    """Exchanges of one operation ("GET /users/{id}") and how many of them don't fit the spec.
+
+    Attributes:
+        exchanges: Exchanges routed to the operation.
+        request_mismatches: Request bodies that don't match `request_schema_d42`.
+        response_mismatches: Response bodies that don't match `response_schema_d42` of the status.
+        undocumented_statuses: Responses with a status the operation doesn't declare.
+        examples: The first few problems, for the report.
+    """
+    exchanges: int = 0
+    request_mismatches: int = 0
+    response_mismatches: int = 0
+    undocumented_statuses: int = 0
+    examples: list[str] = field(default_factory=list)
+
+    @property
+    def mismatches(self) -> int:
+        return self.request_mismatches + self.response_mismatches + self.undocumented_statuses
+
+    def merge(self, other: "EndpointStats", examples: int) -> None:
+        self.exchanges += other.exchanges
+        self.request_mismatches += other.request_mismatches
+        self.response_mismatches += other.response_mismatches
+        self.undocumented_statuses += other.undocumented_statuses
+        self.examples.extend(other.examples[:max(examples - len(self.examples), 0)])
+
+
+@dataclass
+class TrafficReport:
+    """Results of `validate_traffic`, aggregated per endpoint.
+
+    Attributes:
+        exchanges: Every exchange read, including unmatched and invalid ones.
+        unmatched: Exchanges whose method and path match no operation of the spec.
+        invalid: Records that can't be read (not JSON, no method, url or status).
+        endpoints: Stats by "METHOD /path/{template}".
+        examples: How many problems are kept per endpoint.
+    """
+    exchanges: int = 0
+    unmatched: int = 0
+    invalid: int = 0
+    endpoints: dict[str, EndpointStats] = field(default_factory=dict)
+    examples: int = 3
+
+    @property
+    def mismatches(self) -> int:
+        return sum(stats.mismatches for stats in self.endpoints.values())
+
+    def merge(self, other: "TrafficReport") -> None:
+        self.exchanges += other.exchanges
+        self.unmatched += other.unmatched
+        self.invalid += other.invalid
+        for endpoint, stats in other.endpoints.items():
+            self.endpoints.setdefault(endpoint, EndpointStats()).merge(stats, self.examples)
+
+    def summary(self) -> str:
+        lines = [
+            f"exchanges: {self.exchanges}, mismatches: {self.mismatches}, "
+            f"unmatched: {self.unmatched}, invalid: {self.invalid}"
+        ]
+        endpoints = sorted(self.endpoints.items(), key=lambda item: -item[1].mismatches)
+        for endpoint, stats in endpoints:
+            if not stats.mismatches:
+                continue
+            lines.append(
+                f"{endpoint}: {stats.mismatches}/{stats.exchanges} "
+                f"(request: {stats.request_mismatches}, response: {stats.response_mismatches}, "
+                f"undocumented status: {stats.undocumented_statuses})"
+            )
+            lines.extend(f"  {example}" for example in stats.examples)
+        return "\n".join(lines)
+
+
+class _Checker:
+    """Routes exchanges and validates their bodies, one per worker process."""
+
+    def __init__(self, spec: dict[str, Any], base_path: Optional[str]) -> None:
+        # d42 schemas are converted on first use, only for the operations the traffic reaches
+        self.router = Router(collect_schema_data(spec, base_path=base_path, lazy=True,
+                                                 keep_raw=False))
+
+    def check_batch(self, batch: Batch, examples: int) -> TrafficReport:
+        kind, items = batch
+        report = TrafficReport(examples=examples)
+        for item in items:
+            report.exchanges += 1
+            if kind == "ndjson":
+                exchange = _read_ndjson(item)
+            elif item is not None:
+                method, url, status, request, response = item
+                exchange = (method, url, status, _parse_text(request), _parse_text(response))
+            else:
+                exchange = None
+            if exchange is None:
+                report.invalid += 1
+                continue
+            self.check(report, *exchange)
+        return report
+
+    def check(self, report: TrafficReport, method: str, url: str, status: int,
+              request: Any, response: Any) -> None:
+        match = self.router.match(url, method)
+        if match is None:
+            report.unmatched += 1
+            return
+        endpoint = f"{method.upper()} {match.path}"
+        stats = report.endpoints.get(endpoint)
+        if stats is None:
+            stats = report.endpoints[endpoint] = EndpointStats()
+        stats.exchanges += 1
+
+        by_status = next(iter(match.operations.values()))
+        schema_data = by_status.get(status)
+        if schema_data is None:
+            stats.undocumented_statuses += 1
+            self._example(stats, report, f"status {status} isn't documented")
+            schema_data = next(iter(by_status.values()))  # the request schema is the same
+        elif response is not _MISSING:
+            problem = _problem(schema_data.response_schema_d42, response)
+            if problem is not None:
+                stats.response_mismatches += 1
+                self._example(stats, report, f"response {status}: {problem}")
+
+        if request is not _MISSING:
+            problem = _problem(schema_data.request_schema_d42, request)
+            if problem is not None:
+                stats.request_mismatches += 1
+                self._example(stats, report, f"request: {problem}")
+
+    @staticmethod
+    def _example(stats: EndpointStats, report: TrafficReport, problem: str) -> None:
+        if len(stats.examples) < report.examples:
+            stats.examples.append(problem)
+
+
+def _problem(schema: Any, value: Any) -> Optional[str]:
+    if schema is None:
+        return None  # nothing is documented to check against
+    if value is _NOT_JSON:
+        return "body isn't JSON"
+    result = validate(schema, value)
+    if not result.has_errors():
+        return None
+    error: str = result.get_errors()[0].format(_formatter)
+    return error
+
+
+def _parse_text(text: Optional[str]) -> Any:
+    if not text:
+        return _MISSING
+    try:
+        return json.loads(text)
+    except ValueError:
+        return _NOT_JSON
+
+
+def _read_ndjson(line: str) -> Optional[tuple[str, str, int, Any, Any]]:
+    try:
+        record = json.loads(line)
+        url = record.get("url") or record["path"]
+        return (str(record["method"]), str(url), int(record["status"]),
+                record.get("request_body", _MISSING), record.get("response_body", _MISSING))
+    except (ValueError, TypeError, KeyError):
+        return None
+
+
+class _JsonStream:
+    """Reads the structure of a JSON document piece by piece, keeping only a window in memory."""
+
+    def __init__(self, file: IO[str], chunk_size: int) -> None:
+        self.file = file
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        # Values larger than the window are read in growing steps, which keeps retries linear
+        data = self.file.read(max(self.chunk_size, len(self.buffer) - self.pos))
+        self.buffer = self.buffer[self.pos:] + data
+        self.pos = 0
+        self.eof = not data
+        return bool(data)
+
+    def peek(self) -> str:
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()  # type: ignore[union-attr]
+            if self.pos < len(self.buffer) or not self._fill():
+                return self.buffer[self.pos:self.pos + 1]
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise ValueError(f"Expected '{char}' in HAR file, got '{self.peek()}'")
+        self.pos += 1
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            if end == len(self.buffer) and not self.eof and self._fill():
+                continue  # a number may go on in the next chunk
+            self.pos = end
+            return value
+
+    def keys(self) -> Iterator[str]:
+        """Keys of an object, the caller reads or skips the value of each one."""
+        self.expect("{")
+        while self.peek() != "}":
+            key = self.value()
+            self.expect(":")
+            yield key
+            if self.peek() == ",":
+                self.pos += 1
+        self.pos += 1
+
+
+def iter_har_entries(file: IO[str], chunk_size: int = 1 << 20) -> Iterator[dict[str, Any]]:
+    """Yield `log.entries` of a HAR file one by one, without loading the whole file."""
+    stream = _JsonStream(file, chunk_size)
+    for key in stream.keys():
+        if key != "log":
+            stream.value()
+            continue
+        for log_key in stream.keys():
+            if log_key != "entries":
+                stream.value()
+                continue
+            stream.expect("[")
+            while stream.peek() != "]":
+                yield stream.value()
+                if stream.peek() == ",":
+                    stream.pos += 1
+            stream.pos += 1
+
+
+def _har_record(entry: dict[str, Any]) -> Optional[HarRecord]:
+    try:
+        request, response = entry["request"], entry["response"]
+        post_data = request.get("postData") or {}
+        content = response.get("content") or {}
+        text = content.get("text")
+        if text and content.get("encoding") == "base64":
+            text = b64decode(text).decode("utf-8", "replace")
+        return (request["method"], request["url"], int(response["status"]),
+                post_data.get("text"), text)
+    except (KeyError, TypeError, ValueError, AttributeError):
+        return None
+
+
+def _batches(file: IO[str], har: bool, batch_size: int) -> Iterator[Batch]:
+    items: list[Any] = []
+    kind = "har" if har else "ndjson"
+    if har:
+        records: Iterator[Any] = (_har_record(entry) for entry in iter_har_entries(file))
+    else:
+        records = (line for line in file if line.strip())
+    for record in records:
+        items.append(record)
+        if len(items) >= batch_size:
+            yield kind, items
+            items = []
+    if items:
+        yield kind, items
+
+
+_checker: Optional[_Checker] = None  # of the worker process
+
+
+def _init_worker(spec: dict[str, Any], base_path: Optional[str]) -> None:
+    global _checker
+    _checker = _Checker(spec, base_path)
+
+
+def _check_batch(batch: Batch, examples: int) -> TrafficReport:
+    assert _checker is not None
+    return _checker.check_batch(batch, examples)
+
+
+def validate_traffic(
+    spec: dict[str, Any],
+    file: IO[str],
+    base_path: Optional[str] = None,
+    har: bool = False,
+    workers: Optional[int] = None,
+    batch_size: int = 1000,
+    examples: int = 3,
+) -> TrafficReport:
+    """Validate recorded exchanges against the spec they were made with.
+
+    `file` is NDJSON, a record per line:
+        {"method": "GET", "url": "/users/1?x=1", "status": 200,
+         "request_body": <JSON>, "response_body": <JSON>}
+    or, with `har=True`, a HAR file. Bodies that are absent aren't checked.
+
+    The file is read as a stream in batches of `batch_size` records, which `workers` processes
+    (all CPUs by default, 1 validates in this process) route and validate. Only a couple of
+    batches per worker are in flight at a time, so memory doesn't grow with the file.
+    """
+    report = TrafficReport(examples=examples)
+    batches = _batches(file, har, batch_size)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        checker = _Checker(spec, base_path)
+        for batch in batches:
+            report.merge(checker.check_batch(batch, examples))
+        return report
+
+    with ProcessPoolExecutor(workers, initializer=_init_worker,
+                             initargs=(spec, base_path)) as executor:
+        in_flight: deque[Future[TrafficReport]] = deque()
+        for batch in batches:
+            if len(in_flight) >= 2 * workers:
+                report.merge(in_flight.popleft().result())
+            in_flight.append(executor.submit(_check_batch, batch, examples))
+        while in_flight:
+            report.merge(in_flight.popleft().result())
+    return report
@@ -1,6 +1,6 @@
 import re
-import warnings
-from typing import Any, Dict
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Callable, ClassVar, Dict, FrozenSet, List, Optional, Tuple
 
 from d42.declaration import SchemaVisitor
 from d42.declaration.types import (
@@ -9,6 +9,7 @@ from d42.declaration.types import (
     BytesSchema,
     DictSchema,
     FloatSchema,
+    GenericSchema,
     GenericTypeAliasSchema,
     IntSchema,
     ListSchema,
@@ -21,15 +22,75 @@ from niltype import Nil
 
 from schemax import supported_props
 
+from ._diagnostics import report
+from ._enum_schema import EnumSchema
+
+if TYPE_CHECKING:
+    from ._hooks import NodeHooks
+
+Opener = Callable[["Translator", Any, Dict[str, Any]], Tuple[Dict[str, Any], Any]]
+
+_EXIT = object()
+
+_KINDS: Dict[type, str] = {
+    NoneSchema: "none",
+    BoolSchema: "bool",
+    IntSchema: "int",
+    FloatSchema: "float",
+    StrSchema: "str",
+    ListSchema: "list",
+    DictSchema: "dict",
+    AnySchema: "any",
+    BytesSchema: "bytes",
+    EnumSchema: "enum",
+}
+
+
+# Props the translator understands, as sets: checking a schema is a single subset test
+_BOOL_PROPS = frozenset(supported_props.BoolProps)
+_INT_PROPS = frozenset(supported_props.IntProps)
+_FLOAT_PROPS = frozenset(supported_props.FloatProps)
+_STR_PROPS = frozenset(supported_props.StrProps)
+_LIST_PROPS = frozenset(supported_props.ListProps)
+_DICT_PROPS = frozenset(supported_props.DictProps)
+_ANY_PROPS = frozenset(supported_props.AnyProps)
+_ENUM_PROPS = frozenset(supported_props.EnumProps)
+
+_ESCAPE_SEQUENCE = re.compile(r"\\\w")
+
+
+def _report_unsupported(schema: GenericSchema, supported: FrozenSet[str]) -> None:
+    for prop in schema.props:
+        if prop not in supported:
+            # The schema is only rendered if the message is needed
+            report("unsupported-prop", "Unsupported prop {} for type {}", prop, schema,
+                   key=(prop, type(schema)), category=Warning)
+
 
 class Translator(SchemaVisitor[Any]):
+    _openers: ClassVar[Dict[type, Opener]] = {}  # by schema type, per class
+
+    def __init__(self, hooks: Optional["NodeHooks"] = None) -> None:
+        # Node-level hooks get a call for every visited node with its d42 path, e.g. "_['a'][*]"
+        self.hooks = hooks
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        # Containers with an overridden visit_* are translated through __accept__
+        cls._openers = {
+            schema_type: opener
+            for schema_type, opener in Translator._openers.items()
+            if getattr(cls, f"visit_{_KINDS[schema_type]}") is getattr(
+                Translator, f"visit_{_KINDS[schema_type]}"
+            )
+        }
+
     def visit_none(self, schema: NoneSchema, **kwargs: Any) -> Dict[str, Any]:
         return {"type": "null"}
 
     def visit_bool(self, schema: BoolSchema, **kwargs: Any) -> Dict[str, Any]:
-        for prop in schema.props:
-            if prop not in supported_props.BoolProps:
-                warnings.warn(f"Unsupported prop {prop} for type {schema.__str__()}", Warning)
+        if not _BOOL_PROPS.issuperset(schema.props._registry):
+            _report_unsupported(schema, _BOOL_PROPS)
 
         if schema.props.value is Nil:
             return {"type": "boolean"}
@@ -37,9 +98,8 @@ class Translator(SchemaVisitor[Any]):
         return {"enum": [schema.props.value]}
 
     def visit_int(self, schema: IntSchema, **kwargs: Any) -> Dict[str, Any]:
-        for prop in schema.props:
-            if prop not in supported_props.IntProps:
-                warnings.warn(f"Unsupported prop {prop} for type {schema.__str__()}", Warning)
+        if not _INT_PROPS.issuperset(schema.props._registry):
+            _report_unsupported(schema, _INT_PROPS)
 
         int_object: Dict[str, Any] = {
             "type": "integer"
@@ -57,9 +117,8 @@ class Translator(SchemaVisitor[Any]):
         return int_object
 
     def visit_float(self, schema: FloatSchema, **kwargs: Any) -> Dict[str, Any]:
-        for prop in schema.props:
-            if prop not in supported_props.FloatProps:
-                warnings.warn(f"Unsupported prop {prop} for type {schema.__str__()}", Warning)
+        if not _FLOAT_PROPS.issuperset(schema.props._registry):
+            _report_unsupported(schema, _FLOAT_PROPS)
 
         number_object: Dict[str, Any] = {
             "type": "number"
@@ -77,9 +136,8 @@ class Translator(SchemaVisitor[Any]):
         return number_object
 
     def visit_str(self, schema: StrSchema, **kwargs: Any) -> Dict[str, Any]:
-        for prop in schema.props:
-            if prop not in supported_props.StrProps:
-                warnings.warn(f"Unsupported prop {prop} for type {schema.__str__()}", Warning)
+        if not _STR_PROPS.issuperset(schema.props._registry):
+            _report_unsupported(schema, _STR_PROPS)
 
         str_object: Dict[str, Any] = {
             "type": "string"
@@ -89,10 +147,12 @@ class Translator(SchemaVisitor[Any]):
             str_object["const"] = schema.props.value
 
         if schema.props.pattern is not Nil:
-            if re.search(r"\\\w", schema.props.pattern) is not None:
-                warnings.warn("Be aware that escape-sequences are unsupported in json-schemas "
-                              "regexes. Currently we can't do reformation and provide them "
-                              "'as it is'.\nUse at our own risk!", Warning)
+            pattern = schema.props.pattern
+            if "\\" in pattern and _ESCAPE_SEQUENCE.search(pattern) is not None:
+                report("escape-sequence",
+                       "Be aware that escape-sequences are unsupported in json-schemas "
+                       "regexes. Currently we can't do reformation and provide them "
+                       "'as it is'.\nUse at our own risk!", key=(), category=Warning)
             str_object["pattern"] = schema.props.pattern
 
         if schema.props.len is not Nil:
@@ -115,9 +175,20 @@ class Translator(SchemaVisitor[Any]):
         return str_object
 
     def visit_list(self, schema: ListSchema, **kwargs: Any) -> Dict[str, Any]:
-        for prop in schema.props:
-            if prop not in supported_props.ListProps:
-                warnings.warn(f"Unsupported prop {prop} for type {schema.__str__()}", Warning)
+        translation: Dict[str, Any] = self._translate(schema, kwargs, Translator._open_list)
+        return translation
+
+    def visit_dict(self, schema: DictSchema, **kwargs: Any) -> Dict[str, Any]:
+        translation: Dict[str, Any] = self._translate(schema, kwargs, Translator._open_dict)
+        return translation
+
+    def visit_any(self, schema: AnySchema, **kwargs: Any) -> Dict[str, Any]:
+        translation: Dict[str, Any] = self._translate(schema, kwargs, Translator._open_any)
+        return translation
+
+    def _open_list(self, schema: ListSchema, kwargs: Dict[str, Any]) -> Tuple[Dict[str, Any], Any]:
+        if not _LIST_PROPS.issuperset(schema.props._registry):
+            _report_unsupported(schema, _LIST_PROPS)
 
         array_object: Dict[str, Any] = {
             "type": "array"
@@ -133,68 +204,140 @@ class Translator(SchemaVisitor[Any]):
             array_object["maxItems"] = schema.props.max_len
 
         if schema.props.type is not Nil:
-            array_object["items"] = schema.props.type.__accept__(self, **kwargs)
-            return array_object
+            return array_object, [(schema.props.type, array_object, "items", kwargs, "[*]")]
 
+        children = []
         if schema.props.elements is not Nil:
-            array_object["prefixItems"] = []
+            prefix_items: List[Any] = []
+            array_object["prefixItems"] = prefix_items
             array_object["items"] = False
-            for element in schema.props.elements:
+            for index, element in enumerate(schema.props.elements):
                 if is_ellipsis(element):
                     array_object["items"] = True
                     continue
 
-                array_object["prefixItems"].append(element.__accept__(self, **kwargs))
+                prefix_items.append(None)
+                segment = self.hooks and f"[{index}]"
+                children.append((element, prefix_items, len(prefix_items) - 1, kwargs, segment))
 
-        return array_object
+        return array_object, children
 
-    def visit_dict(self, schema: DictSchema, **kwargs: Any) -> Dict[str, Any]:
-        for prop in schema.props:
-            if prop not in supported_props.DictProps:
-                warnings.warn(f"Unsupported prop {prop} for type {schema.__str__()}", Warning)
+    def _open_dict(self, schema: DictSchema, kwargs: Dict[str, Any]) -> Tuple[Dict[str, Any], Any]:
+        if not _DICT_PROPS.issuperset(schema.props._registry):
+            _report_unsupported(schema, _DICT_PROPS)
 
         dict_object: Dict[str, Any] = {
             "type": "object"
         }
 
         if schema.props.keys is Nil:
-            return dict_object
+            return dict_object, []
 
         dict_object["additionalProperties"] = False
-        dict_object["properties"] = {}
+        properties: Dict[str, Any] = {}
+        dict_object["properties"] = properties
+        children = []
         required = []
         for key, (val, is_optional) in schema.props.keys.items():
             if is_ellipsis(key):
                 dict_object["additionalProperties"] = True
                 continue
 
-            dict_object["properties"][key] = val.__accept__(self, **kwargs)
+            properties[key] = None
+            children.append((val, properties, key, kwargs, self.hooks and f"[{key!r}]"))
             if not is_optional:
                 required.append(key)
 
         if required:
             dict_object["required"] = required
 
-        return dict_object
+        return dict_object, children
 
-    def visit_any(self, schema: AnySchema, **kwargs: Any) -> Dict[str, Any]:
-        for prop in schema.props:
-            if prop not in supported_props.AnyProps:
-                warnings.warn(f"Unsupported prop {prop} for type {schema.__str__()}", Warning)
+    def _open_any(self, schema: AnySchema, kwargs: Dict[str, Any]) -> Tuple[Dict[str, Any], Any]:
+        if not _ANY_PROPS.issuperset(schema.props._registry):
+            _report_unsupported(schema, _ANY_PROPS)
 
-        any_of = []
+        any_of: List[Any] = []
+        children: List[Tuple[Any, ...]] = []
 
         if schema.props.types is not Nil:
-            for obj in schema.props.types:
-                any_of.append(obj.__accept__(self))
+            # Alternatives are translated without the caller's kwargs
+            for index, obj in enumerate(schema.props.types):
+                any_of.append(None)
+                children.append((obj, any_of, index, {}, self.hooks and f".types[{index}]"))
+
+        return {"anyOf": any_of}, children
+
+    def _translate(self, schema: GenericSchema, kwargs: Dict[str, Any],
+                   open_root: Optional[Opener] = None) -> Any:
+        # Explicit stack instead of recursion, so the nesting of a schema is only limited by
+        # memory. Containers are opened with placeholders that their children fill in later;
+        # other schemas (and containers whose visit_* is overridden) go through __accept__.
+        # A base visit_* opens its own node with `open_root`: an override that calls super()
+        # would otherwise be called again for the node it's translating.
+        openers = self._openers
+        if open_root is None:
+            open_root = openers.get(type(schema))
+        hooks = self.hooks
+        out: List[Any] = [None]
+        work: List[Tuple[Any, ...]] = [(schema, out, 0, kwargs, "_")]
+        while work:
+            task = work.pop()
+            if task[0] is _EXIT:
+                _, path, kind, started = task
+                hooks.exit(path, kind, perf_counter() - started)  # type: ignore
+                continue
+
+            node, container, key, node_kwargs, path = task
+            opener = open_root if container is out else openers.get(type(node))
+            if hooks is not None:
+                kind = _KINDS.get(type(node), type(node).__name__)
+                hooks.enter(path, kind)
+                started = perf_counter()
+                if opener is None:
+                    container[key] = node.__accept__(self, **node_kwargs)
+                    hooks.exit(path, kind, perf_counter() - started)
+                    continue
+                work.append((_EXIT, path, kind, started))
+            elif opener is None:
+                container[key] = node.__accept__(self, **node_kwargs)
+                continue
+
+            container[key], children = opener(self, node, node_kwargs)
+            if hooks is None:
+                work.extend(children[::-1])
+            else:
+                work.extend(
+                    (child, child_container, child_key, child_kwargs, path + segment)
+                    for child, child_container, child_key, child_kwargs, segment
+                    in reversed(children)
+                )
+
+        return out[0]
+
+    def visit_enum(self, schema: EnumSchema, **kwargs: Any) -> Dict[str, Any]:
+        if not _ENUM_PROPS.issuperset(schema.props._registry):
+            _report_unsupported(schema, _ENUM_PROPS)
 
-        return {"anyOf": any_of}
+        if schema.props.values is Nil:
+            return {"type": "string"}
+
+        return {"enum": list(schema.props.values)}
 
     def visit_bytes(self, schema: BytesSchema, **kwargs: Any) -> Dict[str, Any]:
-        warnings.warn("'schema.bytes' is not implemented")
+        report("not-implemented", "'schema.bytes' is not implemented", key="bytes",
+               category=UserWarning)
         return {}
 
     def visit_type_alias(self, schema: GenericTypeAliasSchema[TypeAliasPropsType],
                          **kwargs: Any) -> Any:
-        warnings.warn("'schema.alias' is not implemented")
+        report("not-implemented", "'schema.alias' is not implemented", key="alias",
+               category=UserWarning)
         return {}
+
+
+Translator._openers = {
+    ListSchema: Translator._open_list,
+    DictSchema: Translator._open_dict,
+    AnySchema: Translator._open_any,
+}
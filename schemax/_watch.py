@@ -0,0 +1,151 @@
+import os
+import time
+from typing import Any, Callable, Iterable, Optional
+
+from d42.declaration import GenericSchema
+
+from ._batch import read_spec
+from ._data_collector import SchemaData, process_paths
+from ._diff import SpecHasher
+from ._generator import MainGenerator
+from ._interning import InternTable
+from ._openapi_normalizer import openapi_normalizer
+
+__all__ = ("Watcher",)
+
+
+class Watcher:
+    """Keeps the generated code of a spec up to date with the spec.
+
+    Every `refresh` checks the modification times and sizes of the spec and of the files it
+    references. When one of them changed, only the paths whose operations changed are
+    normalized and converted again (unchanged operations keep their SchemaData), the code is
+    generated in memory and only the files whose content differs are written. Schemas and
+    reprs of replaced operations are released, so memory doesn't grow with every edit.
+    Scenario and package files are created when they are missing and never overwritten, like
+    `schemax generate` does.
+
+    Usage:
+        watcher = Watcher("openapi.yaml", base_url="http://api.example.com")
+        watcher.run()  # until interrupted
+    """
+
+    def __init__(self, file: str, out_dir: str = '', base_url: Optional[str] = None,
+                 humanize: bool = False) -> None:
+        self.file = file
+        self.out_dir = out_dir
+        self.base_url = base_url
+        self.humanize = humanize
+        self.reprs: dict[int, tuple[GenericSchema, str]] = {}  # of the current schemas only
+        self._stats: dict[str, tuple[int, int]] = {}  # path -> (mtime, size)
+        self._hashes: dict[str, list[tuple[str, bytes]]] = {}  # path -> (operation, hash)
+        self._schema_data: dict[str, list[SchemaData]] = {}  # path -> its SchemaData
+        self._written: dict[str, str] = {}  # generated files as they are on disk
+
+    @staticmethod
+    def _stat(paths: Iterable[str]) -> dict[str, tuple[int, int]]:
+        # The size catches edits within one tick of a coarse file system clock
+        stats = {}
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                stats[path] = (-1, -1)
+            else:
+                stats[path] = (stat.st_mtime_ns, stat.st_size)
+        return stats
+
+    def refresh(self) -> Optional[list[str]]:
+        """Regenerate if the spec or a file it references was modified since the last call.
+
+        Returns:
+            None if nothing was modified, otherwise the files that were written.
+        """
+        stats = self._stat(self._stats or [self.file])
+        if stats == self._stats:
+            return None
+        # Taken before reading, an edit made while regenerating is caught by the next call
+        self._stats = stats
+
+        spec = read_spec(self.file)
+        # Ordered: the order of properties and operations is the order of the generated code
+        hasher = SpecHasher(spec, self.file, ordered=True)
+        hashes: dict[str, list[tuple[str, bytes]]] = {}
+        for operation, digest in hasher.operations().items():
+            path = operation.split(" ", 1)[1]
+            hashes.setdefault(path, []).append((operation, digest))
+        watched = {self.file, *hasher.files()}
+        if watched != stats.keys():  # references to other files were added or removed
+            self._stats = self._stat(watched)
+
+        paths = spec.get("paths") or {}
+        changed = {path: paths[path] for path in paths
+                   if path not in self._schema_data or hashes.get(path) != self._hashes.get(path)}
+        if changed:
+            normalized = openapi_normalizer({"paths": changed}, scope=hasher.root)
+            # A table per refresh: one kept for the session would hold every schema ever made
+            interner = InternTable()
+            for path, path_data in normalized["paths"].items():
+                self._schema_data[path] = process_paths(path, path_data, interner,
+                                                        keep_raw=False)
+        self._schema_data = {path: self._schema_data[path] for path in paths}
+        self._hashes = hashes
+        return self._write(self._generate())
+
+    def _generate(self) -> MainGenerator:
+        schema_data = [item for items in self._schema_data.values() for item in items]
+        generator = MainGenerator(schema_data, self.base_url, self.humanize,
+                                  out_dir=self.out_dir, reprs=self.reprs, files={})
+        generator.all()
+        live = {id(d42_schema) for item in schema_data
+                for d42_schema in (item.request_schema_d42, item.response_schema_d42,
+                                   item.queries_schema_d42)}
+        self.reprs = {key: cached for key, cached in self.reprs.items() if key in live}
+        return generator
+
+    def _write(self, generator: MainGenerator) -> list[str]:
+        assert generator.files is not None
+        written = []
+        for path, content in generator.files.items():
+            if path in generator.stubs:
+                if os.path.exists(path):
+                    continue
+            elif path in self._written:
+                if self._written[path] == content:
+                    continue
+            elif os.path.exists(path):
+                with open(path, "r") as file:
+                    if file.read() == content:
+                        self._written[path] = content
+                        continue
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(path, "w") as file:
+                file.write(content)
+            if path not in generator.stubs:
+                self._written[path] = content
+            written.append(path)
+        return written
+
+    def run(self, interval: float = 0.05,
+            on_refresh: Optional[Callable[[list[str], float], Any]] = None,
+            on_error: Optional[Callable[[Exception], Any]] = None) -> None:
+        """Refresh every `interval` seconds until interrupted.
+
+        `on_refresh` gets the written files and the seconds the refresh took. A spec that
+        can't be generated from (e.g. saved halfway through an edit) goes to `on_error`, or
+        is raised without it; watching goes on with the next modification.
+        """
+        while True:
+            started = time.perf_counter()
+            try:
+                written = self.refresh()
+            except Exception as e:
+                if on_error is None:
+                    raise
+                on_error(e)
+            else:
+                if written is not None and on_refresh is not None:
+                    on_refresh(written, time.perf_counter() - started)
+            time.sleep(interval)
@@ -8,3 +8,4 @@ ListProps: List[str] = ["len", "min_len", "max_len", "type", "elements"]
 DictProps: List[str] = ["keys"]
 AnyProps: List[str] = ["types"]
 ConstProps: List[str] = ["value"]
+EnumProps: List[str] = ["values", "members"]
@@ -0,0 +1,116 @@
+import filecmp
+import json
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+from baby_steps import given, then, when
+
+from schemax import BatchGenerator, Config, Diagnostics, collect_schema_data, generate_specs
+from schemax._batch import read_spec
+from schemax._generator import MainGenerator
+
+SPECS_DIR = Path(__file__).parent.parent / "benchmarks" / "specs"
+
+
+def tree(root):
+    return sorted(str(path.relative_to(root)) for path in Path(root).rglob("*") if path.is_file())
+
+
+def same_trees(left, right):
+    files = tree(left)
+    return files == tree(right) and all(
+        filecmp.cmp(Path(left) / file, Path(right) / file, shallow=False) for file in files
+    )
+
+
+def test_batch_matches_single_runs(tmp_path, monkeypatch):
+    with given:
+        files = [str(tmp_path / "petstore.yaml"), str(tmp_path / "shop.yaml"),
+                 str(tmp_path / "copy" / "shop.yaml")]
+        (tmp_path / "copy").mkdir()
+        for file in files:
+            shutil.copy(SPECS_DIR / Path(file).name, file)
+        for file in files[:2]:
+            single = tmp_path / "single" / Path(file).stem
+            single.mkdir(parents=True)
+            monkeypatch.chdir(single)
+            MainGenerator(collect_schema_data(read_spec(file), base_path=file)).all()
+    with when:
+        dirs = generate_specs(files, str(tmp_path / "out"), workers=1)
+    with then:
+        assert dirs == {files[0]: str(tmp_path / "out" / "petstore"),
+                        files[1]: str(tmp_path / "out" / "shop"),
+                        files[2]: str(tmp_path / "out" / "shop_2")}
+        assert same_trees(tmp_path / "single" / "petstore", dirs[files[0]])
+        assert same_trees(tmp_path / "single" / "shop", dirs[files[1]])
+        assert same_trees(dirs[files[1]], dirs[files[2]])
+
+
+def test_shared_components_are_converted_once(tmp_path):
+    with given:
+        generator = BatchGenerator()
+        file = str(SPECS_DIR / "shop.yaml")
+    with when:
+        generator.generate(file, str(tmp_path / "first"))
+        misses = generator.interner.misses
+        generator.generate(file, str(tmp_path / "second"))
+    with then:
+        assert generator.interner.misses == misses  # every node of the second run is a hit
+        assert same_trees(tmp_path / "first", tmp_path / "second")
+
+
+def test_worker_diagnostics_are_merged(tmp_path):
+    with given:
+        node = {"type": "object", "properties": {"next": {"$ref": "#/components/schemas/Node"}}}
+        spec = {"paths": {"/nodes": {"get": {"responses": {"200": {"content": {
+            "application/json": {"schema": {"$ref": "#/components/schemas/Node"}}
+        }}}}}}, "components": {"schemas": {"Node": node}}}
+        files = [str(tmp_path / "a.json"), str(tmp_path / "b.json")]
+        for file in files:
+            Path(file).write_text(json.dumps(spec))
+    with when:
+        try:
+            Config.DIAGNOSTICS = serial = Diagnostics(quiet=True)
+            generate_specs(files, str(tmp_path / "serial"), workers=1)
+            Config.DIAGNOSTICS = parallel = Diagnostics(quiet=True)
+            generate_specs(files, str(tmp_path / "parallel"), workers=2)
+        finally:
+            Config.DIAGNOSTICS = None
+    with then:
+        assert [(d.code, d.count) for d in serial] == [("recursive-ref", 2)]
+        assert [(d.code, d.message, d.count) for d in parallel] == \
+            [(d.code, d.message, d.count) for d in serial]
+
+
+def test_generate_cli(tmp_path):
+    with given:
+        files = [str(SPECS_DIR / "petstore.yaml"), str(SPECS_DIR / "shop.yaml")]
+    with when:
+        result = subprocess.run(
+            [sys.executable, "-m", "schemax", "generate", *files, "--out-root", "out",
+             "--workers", "2"],
+            cwd=tmp_path, capture_output=True, text=True, check=True
+        )
+        refused = subprocess.run(
+            [sys.executable, "-m", "schemax", "generate", *files],
+            cwd=tmp_path, capture_output=True, text=True, check=False
+        )
+        profiled = subprocess.run(
+            [sys.executable, "-m", "schemax", "generate", *files, "--out-root", "out",
+             "--profile"],
+            cwd=tmp_path, capture_output=True, text=True, check=False
+        )
+        watched = subprocess.run(
+            [sys.executable, "-m", "schemax", "generate", files[0], "--watch",
+             "--profile-output", "profile.json"],
+            cwd=tmp_path, capture_output=True, text=True, check=False
+        )
+    with then:
+        assert "Successfully generated" in result.stdout
+        assert sorted(path.name for path in (tmp_path / "out").iterdir()) == ["petstore", "shop"]
+        assert "interfaces/api.py" in tree(tmp_path / "out" / "shop")
+        assert refused.returncode == 2 and "--out-root" in refused.stderr
+        assert profiled.returncode == 2 and "--profile" in profiled.stderr
+        assert watched.returncode == 2 and "--profile" in watched.stderr
@@ -0,0 +1,45 @@
+from baby_steps import given, then, when
+
+from benchmarks.runner import compare
+from benchmarks.scaling import run_scaling
+from benchmarks.synthetic import make_spec
+from schemax import collect_schema_data
+
+
+def test_synthetic_spec_is_deterministic():
+    with when:
+        first, second = make_spec(paths=3, seed=1), make_spec(paths=3, seed=1)
+    with then:
+        assert first == second
+
+
+def test_synthetic_spec_shape():
+    with given:
+        spec = make_spec(paths=3, enum_size=7, allof_chain=4, ref_depth=1, models_per_layer=2)
+    with when:
+        schema_data = collect_schema_data(spec)
+    with then:
+        assert len(spec["paths"]) == 3
+        assert len(spec["components"]["schemas"]["Status"]["enum"]) == 7
+        assert len(spec["components"]["schemas"]["Model1_0"]["allOf"]) == 5
+        assert len(schema_data) == 3 * 3
+
+
+def test_compare_detects_slowdown():
+    with given:
+        baseline = {"results": {"a": {"median": 1.0}, "b": {"median": 1.0}}}
+        current = {"results": {"a": {"median": 1.1}, "b": {"median": 1.5}, "c": {"median": 1.0}}}
+    with when:
+        lines, regressions = compare(baseline, current, threshold=0.2)
+    with then:
+        assert regressions == ["b"]
+        assert len(lines) == 4
+
+
+def test_scaling_report():
+    with when:
+        report = run_scaling("translate", threads=(1, 2), tasks_per_thread=1)
+    with then:
+        assert list(report.throughput) == [1, 2]
+        assert report.speedup(1) == 1.0
+        assert "2 threads" in report.report()
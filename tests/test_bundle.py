@@ -0,0 +1,95 @@
+import json
+import subprocess
+import sys
+
+from baby_steps import given, then, when
+from d42 import schema
+
+from schemax import from_json_schema, to_json_schema, to_json_schema_bundle, to_json_schema_files
+from schemax._openapi_normalizer import openapi_normalizer
+
+Address = schema.dict({"city": schema.str, "zip": schema.str.len(5)})
+User = schema.dict({
+    "id": schema.int,
+    "home": Address,
+    "work": schema.dict({"city": schema.str, "zip": schema.str.len(5)}),
+})
+Order = schema.dict({
+    "user": User,
+    "items": schema.list(schema.dict({"sku": schema.str, "qty": schema.int.min(1)})),
+})
+Refund = schema.dict({
+    "lines": schema.list(schema.dict({"sku": schema.str, "qty": schema.int.min(1)})),
+})
+SCHEMAS = {"Id": schema.int, "User": User, "Order": Order, "Refund": Refund}
+
+
+def test_bundle_shares_subschemas():
+    with when:
+        bundle = to_json_schema_bundle(SCHEMAS, hide_draft=True)
+    with then:
+        defs = bundle["$defs"]
+        assert list(defs) == ["Id", "User", "Order", "Refund", "User_home", "Order_items"]
+        assert defs["Id"] == {"type": "integer"}
+        assert defs["User"]["properties"]["id"] == {"type": "integer"}
+        assert defs["User"]["properties"]["home"] == {"$ref": "#/$defs/User_home"}
+        assert defs["User"]["properties"]["work"] == {"$ref": "#/$defs/User_home"}
+        assert defs["Order"]["properties"]["user"] == {"$ref": "#/$defs/User"}
+        assert defs["Refund"]["properties"]["lines"] == {"$ref": "#/$defs/Order_items"}
+
+
+def test_bundle_entries_resolve_to_translations():
+    with given:
+        bundle = to_json_schema_bundle(SCHEMAS)
+    with when:
+        restored = {name: openapi_normalizer({**bundle, "$ref": f"#/$defs/{name}"})
+                    for name in SCHEMAS}
+    with then:
+        for name, sch in SCHEMAS.items():
+            expected = to_json_schema(sch, hide_draft=True)
+            assert {k: v for k, v in restored[name].items() if k not in bundle} == expected
+
+
+def test_file_per_schema(tmp_path):
+    with given:
+        files = to_json_schema_files(SCHEMAS)
+        for file_name, document in files.items():
+            (tmp_path / file_name).write_text(json.dumps(document))
+    with when:
+        order = openapi_normalizer({"$ref": "./Order.json"}, str(tmp_path / "index.json"))
+    with then:
+        assert sorted(files) == ["Id.json", "Order.json", "Refund.json", "User.json",
+                                 "_shared.json"]
+        assert files["Order.json"]["properties"]["user"] == {"$ref": "User.json"}
+        assert files["User.json"]["properties"]["home"] == \
+            {"$ref": "_shared.json#/$defs/User_home"}
+        assert from_json_schema(order) == from_json_schema(to_json_schema(Order))
+
+
+def test_export_cli(tmp_path):
+    with given:
+        package = tmp_path / "shop"
+        (package / "schemas").mkdir(parents=True)
+        (package / "__init__.py").write_text("")
+        (package / "schemas" / "__init__.py").write_text("")
+        (package / "schemas" / "users.py").write_text(
+            "from d42 import schema\n"
+            "UserSchema = schema.dict({'name': schema.str})\n"
+            "_PrivateSchema = schema.int\n"
+        )
+        (package / "schemas" / "orders.py").write_text(
+            "from d42 import schema\n"
+            "from shop.schemas.users import UserSchema\n"
+            "OrderSchema = schema.dict({'user': UserSchema, 'total': schema.int})\n"
+        )
+    with when:
+        result = subprocess.run(
+            [sys.executable, "-m", "schemax", "export", "shop.schemas", "-o", "bundle.json"],
+            cwd=tmp_path, capture_output=True, text=True, check=True
+        )
+    with then:
+        assert "2 schemas are exported to 'bundle.json'" in result.stdout
+        bundle = json.loads((tmp_path / "bundle.json").read_text())
+        assert sorted(bundle["$defs"]) == ["OrderSchema", "UserSchema"]
+        assert bundle["$defs"]["OrderSchema"]["properties"]["user"] == \
+            {"$ref": "#/$defs/UserSchema"}
@@ -0,0 +1,120 @@
+import random
+
+from baby_steps import given, then, when
+from d42 import fake, optional, schema, validate
+
+from schemax import compile_validator, from_json_schema
+from schemax._enum_schema import schema_enum
+
+Item = schema.dict({"sku": schema.str.len(1, 8), "qty": schema.int.min(1)})
+Order = schema.dict({
+    "id": schema.int.min(0).max(10 ** 6),
+    "status": schema_enum("new", "paid", "shipped"),
+    "email": schema.str("a@b.c") | schema.str.regex(r"^[a-z]+@[a-z]+\.[a-z]+$"),
+    "code": schema.str.alphabet("0123456789").len(4),
+    "note": schema.str.contains("!") | schema.none,
+    "price": schema.float.min(0.0),
+    "paid": schema.bool,
+    "items": schema.list(Item).len(1, 3),
+    "point": schema.list([schema.float, schema.float]),
+    "tags": schema.list([schema.str, ...]),
+    optional("extra"): schema.dict({"flag": schema.bool(True), ...: ...}),
+    "meta": schema.any,
+})
+
+MUTATIONS = [
+    lambda value: None,
+    lambda value: "1",
+    lambda value: [value],
+    lambda value: {"unexpected": value},
+    lambda value: -1 if isinstance(value, int) else value,
+    lambda value: value + "x" if isinstance(value, str) else value,
+    lambda value: value[:-1] if isinstance(value, list) else value,
+    lambda value: {**value, "extra": {}} if isinstance(value, dict) else value,
+]
+
+
+def mutate(value, rnd):
+    if isinstance(value, dict) and value and rnd.random() < 0.7:
+        key = rnd.choice(list(value))
+        return {**value, key: mutate(value[key], rnd)}
+    if isinstance(value, list) and value and rnd.random() < 0.7:
+        index = rnd.randrange(len(value))
+        return value[:index] + [mutate(value[index], rnd)] + value[index + 1:]
+    if isinstance(value, dict) and value and rnd.random() < 0.5:
+        return {key: item for key, item in value.items() if key != rnd.choice(list(value))}
+    return rnd.choice(MUTATIONS)(value)
+
+
+def test_matches_d42():
+    with given:
+        rnd = random.Random(42)
+        random.seed(42)
+        valid = [fake(Order) for _ in range(100)]
+        payloads = valid + [mutate(value, rnd) for value in valid for _ in range(5)]
+        validator = compile_validator(Order)
+    with when:
+        results = validator.validate_many(payloads)
+    with then:
+        assert results == [not validate(Order, value).has_errors() for value in payloads]
+        assert all(results[:100]) and not all(results[100:])
+
+
+def test_special_floats_match_d42():
+    with given:
+        schemas = [schema.float.min(0.0), schema.float.max(1.0), schema.float.min(0.0).max(1.0)]
+        values = [float("nan"), float("inf"), float("-inf"), 0.5, -1.0]
+    with when:
+        results = [compile_validator(sch)(value) for sch in schemas for value in values]
+    with then:
+        assert results == [not validate(sch, value).has_errors()
+                           for sch in schemas for value in values]
+
+
+def test_json_schema():
+    with given:
+        json_schema = {
+            "type": "object",
+            "properties": {
+                "id": {"type": "integer", "minimum": 1},
+                "kind": {"enum": ["a", "b"]},
+                "tags": {"type": "array", "items": {"type": "string", "maxLength": 3}},
+            },
+            "required": ["id"],
+        }
+    with when:
+        validator = compile_validator(json_schema)
+    with then:
+        assert validator({"id": 1, "kind": "a", "tags": ["x"]})
+        assert validator({"id": 2})
+        assert not validator({"id": 0})
+        assert not validator({"id": 1, "kind": "c"})
+        assert not validator({"id": 1, "tags": ["long"]})
+        assert validator({"id": 1, "other": 1})  # additionalProperties is true by default
+        assert repr(validator.schema) == repr(from_json_schema(json_schema))
+
+
+def test_unsupported_props_fall_back_to_d42():
+    with given:
+        validator = compile_validator(schema.dict({
+            "price": schema.float(1.25).precision(2),
+            "ids": schema.list([..., schema.int(1), ...]),
+            "when": schema.datetime,
+        }))
+    with when:
+        errors = validator.errors({"price": 1.3, "ids": [0, 1, 2], "when": None})
+    with then:
+        assert len(errors) == 2 and "price" in errors[0]
+        assert not validator({"price": 1.3, "ids": [0, 1, 2], "when": None})
+
+
+def test_shared_subschemas_are_compiled_once():
+    with given:
+        shared = schema.dict({"id": schema.int})
+        deep = shared
+        for _ in range(3000):
+            deep = schema.dict({"next": deep, "same": shared})
+    with when:
+        validator = compile_validator(deep)
+    with then:
+        assert not validator({"next": {}, "same": {"id": 1}})
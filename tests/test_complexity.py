@@ -0,0 +1,119 @@
+import pytest
+from baby_steps import given, then, when
+
+from schemax import (
+    Config,
+    ExpansionLimitError,
+    analyze_spec,
+    collect_schema_data,
+    from_json_schema,
+)
+
+SHARED = {
+    "components": {
+        "schemas": {
+            "Leaf": {"type": "object", "properties": {"a": {"type": "string"}}},
+            "Pair": {
+                "type": "object",
+                "properties": {
+                    "left": {"$ref": "#/components/schemas/Leaf"},
+                    "right": {"$ref": "#/components/schemas/Leaf"},
+                }
+            },
+        }
+    },
+    "type": "array",
+    "items": {"$ref": "#/components/schemas/Pair"},
+}
+
+
+def _count(node):
+    if isinstance(node, dict):
+        return 1 + sum(_count(value) for value in node.values())
+    if isinstance(node, list):
+        return 1 + sum(_count(value) for value in node)
+    return 1
+
+
+@pytest.fixture()
+def limits():
+    yield Config
+    Config.MAX_NODES = Config.MAX_DEPTH = Config.WARN_NODES = Config.OUTPUT_FUNCTION = None
+
+
+def test_analyze_spec():
+    with when:
+        report = analyze_spec(SHARED)
+    with then:
+        assert report.refs == 3
+        assert report.max_ref_fanout == 2
+        assert report.heaviest_refs == [
+            ("#/components/schemas/Pair", 13),
+            ("#/components/schemas/Leaf", 10),
+        ]
+        assert report.recursive_refs == []
+
+
+def test_analyze_spec_matches_normalizer():
+    with given:
+        from schemax._openapi_normalizer import openapi_normalizer
+        normalized = openapi_normalizer(SHARED)
+    with when:
+        report = analyze_spec(SHARED)
+    with then:
+        assert report.expanded_nodes == _count(normalized)
+        assert report.max_depth == 8
+
+
+def test_analyze_spec_recursive_ref():
+    with given:
+        spec = {
+            "components": {"schemas": {"Node": {
+                "type": "object",
+                "properties": {"next": {"$ref": "#/components/schemas/Node"}}
+            }}},
+            "$ref": "#/components/schemas/Node",
+        }
+    with when:
+        report = analyze_spec(spec)
+    with then:
+        assert report.recursive_refs == ["#/components/schemas/Node"]
+
+
+def test_max_nodes_fails_before_normalization(limits):
+    with given:
+        limits.MAX_NODES = 10
+    with when, then:
+        with pytest.raises(ExpansionLimitError) as exc_info:
+            from_json_schema(SHARED)
+        assert exc_info.value.report.expanded_nodes > 10
+
+
+def test_max_depth(limits):
+    with given:
+        limits.MAX_DEPTH = 3
+    with when, then:
+        with pytest.raises(ExpansionLimitError):
+            collect_schema_data(SHARED)
+
+
+def test_limits_not_exceeded(limits):
+    with given:
+        limits.MAX_NODES = 1000
+        limits.MAX_DEPTH = 100
+    with when:
+        res = collect_schema_data(SHARED)
+    with then:
+        assert res == []
+
+
+def test_warn_nodes(limits):
+    with given:
+        messages = []
+        limits.OUTPUT_FUNCTION = messages.append
+        limits.WARN_NODES = 10
+    with when:
+        from_json_schema(SHARED)
+    with then:
+        assert len(messages) == 1
+        assert messages[0].startswith("Spec expands to")
@@ -0,0 +1,66 @@
+from unittest.mock import patch
+
+from baby_steps import given, then, when
+
+from schemax import SchemaData, collect_schema_data
+
+SPEC = {
+    "paths": {
+        "/users/{user_id}": {
+            "post": {
+                "parameters": [
+                    {"name": "user_id", "in": "path", "schema": {"type": "integer"}},
+                    {"name": "X-Token", "in": "header", "schema": {"type": "string"}},
+                ],
+                "requestBody": {"content": {"application/json": {"schema": {
+                    "type": "object", "properties": {"name": {"type": "string"}}
+                }}}},
+                "responses": {
+                    "200": {"content": {"application/json": {"schema": {
+                        "type": "object", "properties": {"id": {"type": "integer"}}
+                    }}}},
+                    "404": {"description": "Not found"},
+                },
+            }
+        }
+    }
+}
+
+
+def test_schema_data_is_slotted():
+    with when:
+        schema_data = collect_schema_data(SPEC)
+    with then:
+        assert not hasattr(schema_data[0], "__dict__")
+
+
+def test_lazy_conversion_on_first_access():
+    with given:
+        eager = collect_schema_data(SPEC)
+    with when, patch("schemax._data_collector._from_json_schema") as convert:
+        lazy = collect_schema_data(SPEC, lazy=True)
+        names = [(item.interface_method, item.converted_path, item.status) for item in lazy]
+    with then:
+        assert convert.call_count == 0
+        assert names == [(item.interface_method, item.converted_path, item.status)
+                         for item in eager]
+        assert all(isinstance(item, SchemaData) for item in lazy)
+        assert lazy == eager
+
+
+def test_without_raw_schemas():
+    with given:
+        eager = collect_schema_data(SPEC)
+    with when:
+        lean = collect_schema_data(SPEC, keep_raw=False)
+        lazy_lean = collect_schema_data(SPEC, keep_raw=False, lazy=True)
+    with then:
+        for item in lean + lazy_lean:
+            assert item.queries_schema is None
+            assert item.response_schema is None
+            assert item.request_schema is None
+            assert item.request_headers is None
+        assert [item.response_schema_d42 for item in lazy_lean] == \
+            [item.response_schema_d42 for item in eager]
+        assert [item.request_headers_d42 for item in lean] == \
+            [item.request_headers_d42 for item in eager]
@@ -0,0 +1,81 @@
+import warnings
+
+import pytest
+from baby_steps import given, then, when
+from d42 import schema
+from d42.declaration.types import TypeAliasSchema
+
+from schemax import Config, Diagnostics, from_json_schema, to_json_schema
+
+
+@pytest.fixture(autouse=True)
+def reset_config():
+    yield
+    Config.DIAGNOSTICS = Config.OUTPUT_FUNCTION = None
+
+
+def test_repeated_warnings_are_reported_once():
+    with given:
+        Config.DIAGNOSTICS = diagnostics = Diagnostics()
+        sch = schema.dict({
+            "a": schema.float.precision(2),
+            "b": schema.float.min(0.0).precision(3),
+            "c": schema.list(schema.int).unique(),
+        })
+    with when, warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        to_json_schema(sch)
+        to_json_schema(sch)
+    with then:
+        assert len(caught) == 2
+        assert [(d.code, d.args[0], d.count) for d in diagnostics] == [
+            ("unsupported-prop", "precision", 4), ("unsupported-prop", "unique", 2)
+        ]
+        assert diagnostics.summary().splitlines()[0] == \
+            "Unsupported prop precision for type schema.float.precision(2) (x4)"
+
+
+def test_quiet_mode_neither_warns_nor_formats():
+    with given:
+        Config.DIAGNOSTICS = diagnostics = Diagnostics(quiet=True)
+    with when, warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        to_json_schema(schema.list(schema.str.regex(r"\d+")).unique())
+    with then:
+        assert caught == []
+        assert [d.code for d in diagnostics] == ["unsupported-prop", "escape-sequence"]
+        assert all(d._message is None for d in diagnostics)
+
+
+def test_normalizer_problems_are_collected():
+    with given:
+        messages = []
+        Config.OUTPUT_FUNCTION = messages.append
+        Config.DIAGNOSTICS = diagnostics = Diagnostics()
+        jsch = {"$defs": {"node": {"type": "object", "properties": {
+            "next": {"$ref": "#/$defs/node"}
+        }}}, "$ref": "#/$defs/node"}
+    with when:
+        from_json_schema(jsch)
+        from_json_schema(jsch)
+    with then:
+        assert messages == ["Curicular cases in spec:#/$defs/node"]
+        assert [(d.code, d.count) for d in diagnostics] == [("recursive-ref", 2)]
+
+
+def test_unimplemented_types_are_reported_apart():
+    with given:
+        Config.DIAGNOSTICS = diagnostics = Diagnostics()
+        sch = schema.dict({"a": schema.bytes, "b": TypeAliasSchema(), "c": schema.bytes})
+    with when, warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        to_json_schema(sch)
+    with then:
+        assert [(d.code, d.message, d.count) for d in diagnostics] == [
+            ("not-implemented", "'schema.bytes' is not implemented", 2),
+            ("not-implemented", "'schema.alias' is not implemented", 1),
+        ]
+        assert [str(w.message) for w in caught] == [
+            "'schema.bytes' is not implemented", "'schema.alias' is not implemented"
+        ]
+        assert all(not w.filename.endswith("_diagnostics.py") for w in caught)
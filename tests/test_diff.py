@@ -0,0 +1,143 @@
+import copy
+import json
+import subprocess
+import sys
+
+from baby_steps import given, then, when
+
+from schemax import SpecHasher, diff_specs
+
+
+def make_api():
+    return {
+        "openapi": "3.0.0",
+        "paths": {
+            "/users/{id}": {
+                "parameters": [{"name": "id", "in": "path", "schema": {"type": "integer"}}],
+                "get": {"responses": {"200": {"content": {"application/json": {
+                    "schema": {"$ref": "#/components/schemas/User"}
+                }}}}},
+                "delete": {"responses": {"204": {"description": "deleted"}}},
+            },
+            "/orders": {
+                "post": {"requestBody": {"content": {"application/json": {
+                    "schema": {"$ref": "#/components/schemas/Order"}
+                }}}, "responses": {"201": {"description": "created"}}},
+            },
+        },
+        "components": {"schemas": {
+            "Address": {"type": "object", "properties": {"city": {"type": "string"}}},
+            "User": {"type": "object", "properties": {
+                "name": {"type": "string"},
+                "address": {"$ref": "#/components/schemas/Address"},
+            }},
+            "Order": {"type": "object", "properties": {
+                "total": {"type": "integer"},
+                "user": {"$ref": "#/components/schemas/User"},
+            }},
+            "Node": {"type": "object", "properties": {
+                "next": {"$ref": "#/components/schemas/Node"},
+            }},
+        }},
+    }
+
+
+def test_no_changes():
+    with given:
+        old, new = make_api(), make_api()
+        # Key order has no meaning
+        new["components"]["schemas"]["User"]["properties"] = dict(
+            reversed(new["components"]["schemas"]["User"]["properties"].items())
+        )
+    with when:
+        changes = diff_specs(old, new)
+    with then:
+        assert not changes
+        assert changes.summary() == "no changes"
+
+
+def test_added_removed_and_changed_operations():
+    with given:
+        old, new = make_api(), make_api()
+        del new["paths"]["/users/{id}"]["delete"]
+        new["paths"]["/orders"]["get"] = {"responses": {"200": {"description": "orders"}}}
+        new["paths"]["/orders"]["post"]["responses"]["201"]["description"] = "new order"
+    with when:
+        changes = diff_specs(old, new)
+    with then:
+        assert changes.added_operations == ["GET /orders"]
+        assert changes.removed_operations == ["DELETE /users/{id}"]
+        assert changes.changed_operations == ["POST /orders"]
+        assert changes.changed_components == []
+
+
+def test_component_change_reaches_every_referrer():
+    with given:
+        old, new = make_api(), make_api()
+        new["components"]["schemas"]["Address"]["properties"]["zip"] = {"type": "string"}
+        new["components"]["schemas"]["Tag"] = {"type": "string"}
+        new["paths"]["/users/{id}"]["parameters"][0]["schema"] = {"type": "string"}
+    with when:
+        changes = diff_specs(old, new)
+    with then:
+        assert changes.changed_components == [
+            "schemas/Address", "schemas/User", "schemas/Order"
+        ]
+        assert changes.added_components == ["schemas/Tag"]
+        assert changes.changed_operations == [
+            "GET /users/{id}", "DELETE /users/{id}", "POST /orders"
+        ]
+
+
+def test_hashes_are_shared():
+    with given:
+        spec = make_api()
+        hasher = SpecHasher(spec)
+        user = spec["components"]["schemas"]["User"]
+    with when:
+        hashes = hasher.components()
+    with then:
+        assert hasher.hash(user) == hashes["schemas/User"]
+        assert hashes["schemas/Node"] == SpecHasher(make_api()).components()["schemas/Node"]
+
+
+def test_thousands_of_operations():
+    with given:
+        schemas = {f"Model{index}": {"type": "object", "properties": {"id": {"type": "integer"}}}
+                   for index in range(20)}
+        old = {"paths": {
+            f"/resource{index}/{{id}}": {"get": {"responses": {"200": {"content": {
+                "application/json": {"schema": {"$ref": f"#/components/schemas/Model{index % 20}"}}
+            }}}}}
+            for index in range(1500)
+        }, "components": {"schemas": schemas}}
+        new = copy.deepcopy(old)
+        new["components"]["schemas"]["Model3"]["description"] = "changed"
+    with when:
+        changes = diff_specs(old, new)
+    with then:
+        assert changes.changed_components == ["schemas/Model3"]
+        assert changes.changed_operations == \
+            [f"GET /resource{index}/{{id}}" for index in range(3, 1500, 20)]
+        assert not changes.added_operations and not changes.removed_operations
+
+
+def test_diff_cli(tmp_path):
+    with given:
+        old, new = make_api(), make_api()
+        del new["paths"]["/orders"]
+        (tmp_path / "old.json").write_text(json.dumps(old))
+        (tmp_path / "new.json").write_text(json.dumps(new))
+    with when:
+        changed = subprocess.run(
+            [sys.executable, "-m", "schemax", "diff", "old.json", "new.json"],
+            cwd=tmp_path, capture_output=True, text=True, check=False
+        )
+        same = subprocess.run(
+            [sys.executable, "-m", "schemax", "diff", "old.json", "old.json"],
+            cwd=tmp_path, capture_output=True, text=True, check=True
+        )
+    with then:
+        assert changed.returncode == 1, changed.stdout + changed.stderr
+        assert "removed operations: 1\n  POST /orders" in changed.stdout
+        assert same.stdout.endswith("no changes\n")
@@ -0,0 +1,101 @@
+import pytest
+from baby_steps import given, then, when
+from d42 import fake, schema, substitute, validate_or_fail
+from d42.validation import ValidationException
+
+from schemax import Config, EnumSchema, collect_schema_data, from_json_schema, to_json_schema
+from schemax._generator import MainGenerator
+
+
+@pytest.fixture()
+def threshold():
+    yield Config
+    Config.ENUM_COMPACT_THRESHOLD = None
+
+
+def test_enum_validation():
+    with given:
+        sch = schema.enum("EUR", "USD")
+    with when, then:
+        assert validate_or_fail(sch, "EUR")
+        with pytest.raises(ValidationException):
+            validate_or_fail(sch, "GBP")
+        with pytest.raises(ValidationException):
+            validate_or_fail(schema.enum(1, 2), True)
+
+
+def test_enum_generation_and_repr():
+    with given:
+        sch = schema.enum("EUR", "USD", "EUR")
+    with when:
+        generated = fake(sch)
+    with then:
+        assert generated in ("EUR", "USD")
+        assert repr(sch) == "schema.enum('EUR', 'USD')"
+        assert substitute(sch, "USD") == schema.enum("USD")
+
+
+def test_large_enum_is_compacted(threshold):
+    with given:
+        threshold.ENUM_COMPACT_THRESHOLD = 5
+        jsch = {"enum": ["b", "a", "b", 7, 1, 2, 3, None, 10, 11, "c"]}
+    with when:
+        res = from_json_schema(jsch)
+    with then:
+        assert res == schema.any(
+            schema.enum("b", "a", "c"),
+            schema.int.min(1).max(3),
+            schema.enum(7, 10, 11),  # a run of two stays values
+            schema.none,
+        )
+
+
+def test_small_enum_is_not_compacted(threshold):
+    with given:
+        threshold.ENUM_COMPACT_THRESHOLD = 5
+        jsch = {"enum": ["a", "b"]}
+    with when:
+        res = from_json_schema(jsch)
+    with then:
+        assert res == schema.any(schema.str("a"), schema.str("b"))
+
+
+def test_enums_are_not_compacted_by_default():
+    with given:
+        values = [f"SKU-{index}" for index in range(1000)]
+    with when:
+        res = from_json_schema({"type": "string", "enum": values})
+    with then:
+        assert res == schema.any(*(schema.str(value) for value in values))
+
+
+def test_generated_schemas_import_schemax_for_enums(threshold, tmp_path):
+    with given:
+        threshold.ENUM_COMPACT_THRESHOLD = 5
+        spec = {"paths": {"/items": {"get": {"responses": {"200": {"content": {
+            "application/json": {"schema": {"type": "object", "properties": {
+                "sku": {"type": "string", "enum": [f"SKU-{index}" for index in range(10)]}
+            }}}
+        }}}}}}}
+        plain = {"paths": {"/items": {"get": {"responses": {"200": {"content": {
+            "application/json": {"schema": {"type": "string", "enum": ["schema.enum(1)"]}}
+        }}}}}}}
+    with when:
+        MainGenerator(collect_schema_data(spec), out_dir=str(tmp_path / "enum")).all()
+        MainGenerator(collect_schema_data(plain), out_dir=str(tmp_path / "plain")).all()
+    with then:
+        schemas = (tmp_path / "enum" / "schemas" / "response_schemas.py").read_text()
+        assert "import schemax  # noqa: F401" in schemas and "schema.enum(" in schemas
+        plain_schemas = (tmp_path / "plain" / "schemas" / "response_schemas.py").read_text()
+        assert "import schemax" not in plain_schemas
+
+
+def test_compacted_enum_round_trip(threshold):
+    with given:
+        threshold.ENUM_COMPACT_THRESHOLD = 100
+        values = [f"SKU-{index}" for index in range(1000)]
+    with when:
+        res = from_json_schema({"type": "string", "enum": values})
+    with then:
+        assert isinstance(res, EnumSchema)
+        assert to_json_schema(res, hide_draft=True) == {"enum": values}
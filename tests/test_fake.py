@@ -0,0 +1,94 @@
+import json
+import random
+import subprocess
+import sys
+
+from baby_steps import given, then, when
+from d42 import validate
+
+from schemax import collect_schema_data, iter_fake_payloads
+
+USER = {"type": "object", "properties": {"id": {"type": "integer"}, "name": {"type": "string"}},
+        "required": ["id", "name"], "additionalProperties": False}
+SPEC = {
+    "paths": {
+        "/users": {
+            "post": {
+                "requestBody": {"content": {"application/json": {"schema": USER}}},
+                "responses": {
+                    "201": {"content": {"application/json": {"schema": USER}}},
+                    "400": {"description": "bad request"},
+                },
+            },
+        },
+        "/users/{id}": {
+            "get": {"responses": {"200": {"content": {"application/json": {"schema": USER}}}}},
+        },
+    }
+}
+
+
+def lines(chunks):
+    return [json.loads(line) for line in "".join(chunks).splitlines()]
+
+
+def test_payloads_match_the_schemas():
+    with given:
+        schemas = {(item.http_method.upper(), item.status): item
+                   for item in collect_schema_data(SPEC)}
+    with when:
+        records = lines(iter_fake_payloads(SPEC, count=5, workers=1, chunk_size=2))
+    with then:
+        assert [(record["operation"], record["status"]) for record in records] == \
+            [("POST /users", 201)] * 5 + [("POST /users", 400)] * 5 + \
+            [("GET /users/{id}", 200)] * 5
+        assert "response" not in records[5] and "request" not in records[10]
+        for record in records:
+            item = schemas[(record["operation"].split()[0], record["status"])]
+            if "response" in record:
+                assert not validate(item.response_schema_d42, record["response"]).has_errors()
+            if "request" in record:
+                assert not validate(item.request_schema_d42, record["request"]).has_errors()
+
+
+def test_same_seed_same_payloads():
+    with given:
+        options = dict(operations=["POST /users"], statuses=[201], count=40, chunk_size=7)
+    with when:
+        serial = "".join(iter_fake_payloads(SPEC, seed=1, workers=1, **options))
+        parallel = "".join(iter_fake_payloads(SPEC, seed=1, workers=2, **options))
+        other = "".join(iter_fake_payloads(SPEC, seed=2, workers=1, **options))
+    with then:
+        assert serial == parallel
+        assert serial != other
+        assert len(serial.splitlines()) == 40
+
+
+def test_callers_random_state_is_kept():
+    with given:
+        random.seed(123)
+        expected = random.random()
+        random.seed(123)
+    with when:
+        "".join(iter_fake_payloads(SPEC, count=3, workers=1))
+    with then:
+        assert random.random() == expected
+
+
+def test_fake_cli(tmp_path):
+    with given:
+        (tmp_path / "spec.json").write_text(json.dumps(SPEC))
+    with when:
+        subprocess.run(
+            [sys.executable, "-m", "schemax", "fake", "spec.json",
+             "--operation", "GET /users/{id}", "--count", "3", "--seed", "5", "-o", "out.ndjson"],
+            cwd=tmp_path, capture_output=True, text=True, check=True
+        )
+        missing = subprocess.run(
+            [sys.executable, "-m", "schemax", "fake", "spec.json", "--operation", "GET /nothing"],
+            cwd=tmp_path, capture_output=True, text=True, check=False
+        )
+    with then:
+        records = lines([(tmp_path / "out.ndjson").read_text()])
+        assert [record["operation"] for record in records] == ["GET /users/{id}"] * 3
+        assert missing.returncode == 1
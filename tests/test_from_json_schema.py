@@ -1,5 +1,6 @@
 from baby_steps import given, then, when
 from d42 import optional, schema
+from d42.declaration.types import DictSchema
 
 from schemax import from_json_schema
 
@@ -166,6 +167,24 @@ def test_str():
         assert res == schema.str
 
 
+def test_str_with_const():
+    with given:
+        jsch = {"type": "string", "const": "test"}
+    with when:
+        res = from_json_schema(jsch)
+    with then:
+        assert res == schema.str("test")
+
+
+def test_nullable_str_with_const():
+    with given:
+        jsch = {"type": "string", "const": "test", "nullable": True}
+    with when:
+        res = from_json_schema(jsch)
+    with then:
+        assert res == schema.any(schema.str("test"), schema.none)
+
+
 def test_str_with_min():
     with given:
         jsch = {"type": "string", "minLength": 3}
@@ -494,3 +513,55 @@ def test_allof_with_nullable():
         res = from_json_schema(jsch)
     with then:
         assert res == schema.any(schema.dict({}), schema.none)
+
+
+def test_allof_merges_properties():
+    with given:
+        jsch = {
+            'allOf': [
+                {'type': 'object', 'properties': {'a': {'type': 'string'}}},
+                {
+                    'type': 'object',
+                    'properties': {'b': {'type': 'integer'}, 'a': {'type': 'boolean'}},
+                    'required': ['a'],
+                    'additionalProperties': False
+                },
+                {'type': 'object', 'properties': {'c': {'type': 'null'}}}
+            ]
+        }
+    with when:
+        res = from_json_schema(jsch)
+    with then:
+        assert res == schema.dict({
+            'a': schema.bool,
+            optional('b'): schema.int,
+            optional('c'): schema.none,
+            ...: ...
+        })
+        assert list(res.props.keys) == ['a', 'b', 'c', ...]
+
+
+def test_deeply_nested_schema():
+    with given:
+        jsch = {"$ref": "#/$defs/Leaf"}
+        for _ in range(5000):
+            jsch = {"type": "object", "properties": {"a": jsch}, "required": ["a"]}
+        jsch = {"$defs": {"Leaf": {"type": "string"}}, **jsch}
+    with when:
+        res = from_json_schema(jsch)
+    with then:
+        depth = 0
+        while isinstance(res, DictSchema):
+            res, _ = res.props.keys["a"]
+            depth += 1
+        assert depth == 5000
+        assert res == schema.str
+
+
+def test_equal_values_of_different_types_are_not_shared():
+    with given:
+        schemas = [{"enum": [1]}, {"enum": [True]}, {"enum": [1.0]}, {"enum": [1]}]
+    with when:
+        res = [from_json_schema(jsch) for jsch in schemas]
+    with then:
+        assert res == [schema.int(1), schema.bool(True), schema.float(1.0), schema.int(1)]
@@ -0,0 +1,112 @@
+import sys
+
+import pytest
+from baby_steps import given, then, when
+from d42 import schema
+
+import schemax
+from schemax import Config, NodeHooks, TopSubtrees, from_json_schema, to_json_schema
+
+
+class RecordingHooks(NodeHooks):
+    def __init__(self):
+        self.entered = []
+        self.exited = []
+
+    def enter(self, path, kind):
+        self.entered.append((path, kind))
+
+    def exit(self, path, kind, elapsed):
+        self.exited.append((path, kind))
+
+
+@pytest.fixture()
+def hooks():
+    hooks = RecordingHooks()
+    Config.NODE_HOOKS = hooks
+    yield hooks
+    Config.NODE_HOOKS = None
+
+
+def test_from_json_schema_pointers(hooks):
+    with given:
+        jsch = {
+            "type": "object",
+            "properties": {
+                "a/b": {"type": "array", "items": {"type": "integer"}},
+                "c": {"allOf": [{"type": "object"}]},
+            }
+        }
+    with when:
+        from_json_schema(jsch)
+    with then:
+        assert hooks.entered == [
+            ("#", "object"),
+            ("#/properties/a~1b", "array"),
+            ("#/properties/a~1b/items", "integer"),
+            ("#/properties/c", "allOf"),
+            ("#/properties/c/allOf/0", "object"),
+        ]
+        assert sorted(hooks.exited) == sorted(hooks.entered)
+
+
+def test_to_json_schema_paths(hooks):
+    with given:
+        sch = schema.dict({
+            "a": schema.int,
+            "b": schema.int,
+            "c": schema.list(schema.any(schema.str, schema.none)),
+        })
+    with when:
+        to_json_schema(sch)
+    with then:
+        assert hooks.entered == [
+            ("_", "dict"),
+            ("_['a']", "int"),
+            ("_['b']", "int"),
+            ("_['c']", "list"),
+            ("_['c'][*]", "any"),
+            ("_['c'][*].types[0]", "str"),
+            ("_['c'][*].types[1]", "none"),
+        ]
+
+
+def test_hooks_are_off_by_default(monkeypatch):
+    with given:
+        def hooked(*args, **kwargs):
+            raise AssertionError("hooked code path used without hooks")
+
+        assert Config.NODE_HOOKS is None
+        converter = sys.modules["schemax._from_json_schema"]  # the package exports a function
+        monkeypatch.setattr(converter, "_from_json_schema_with_hooks", hooked)
+        monkeypatch.setattr(schemax, "Translator", hooked)  # only made for hooks
+    with when:
+        res = from_json_schema({"type": "array", "items": {"type": "string"}})
+        translation = to_json_schema(schema.list(schema.str), hide_draft=True)
+    with then:
+        assert res == schema.list(schema.str)
+        assert translation == {"type": "array", "items": {"type": "string"}}
+
+
+def test_top_subtrees():
+    with given:
+        top = TopSubtrees(limit=2)
+    with when:
+        for path, elapsed in [("#/a", 1.0), ("#/b", 3.0), ("#/c", 2.0)]:
+            top.enter(path, "object")
+            top.exit(path, "object", elapsed)
+    with then:
+        assert [timing.path for timing in top.top()] == ["#/b", "#/c"]
+
+
+def test_top_subtrees_self_time():
+    with given:
+        top = TopSubtrees(limit=1, by_self_time=True)
+    with when:
+        top.enter("#", "object")
+        top.enter("#/properties/a", "string")
+        top.exit("#/properties/a", "string", 3.0)
+        top.exit("#", "object", 4.0)
+    with then:
+        timing, = top.top()
+        assert (timing.path, timing.total, timing.self_time) == ("#/properties/a", 3.0, 3.0)
@@ -0,0 +1,69 @@
+from baby_steps import given, then, when
+from d42 import schema
+
+from schemax import InternTable, collect_schema_data, from_json_schema
+
+
+def test_identical_nodes_are_shared():
+    with given:
+        interner = InternTable()
+        jsch = {
+            "type": "object",
+            "properties": {
+                "a": {"type": "object", "properties": {"x": {"type": "number", "minimum": 0}}},
+                "b": {"type": "object", "properties": {"x": {"type": "number", "minimum": 0}}},
+            },
+        }
+    with when:
+        res = from_json_schema(jsch, interner=interner)
+    with then:
+        assert res == from_json_schema(jsch)
+        assert res["a"] is res["b"]
+        assert interner.hits > 0
+        assert 0 < interner.hit_rate < 1
+
+
+def test_equal_values_of_different_types_are_not_merged():
+    with given:
+        interner = InternTable()
+    with when:
+        int_schema = interner.intern(schema.int(1))
+        bool_schema = interner.intern(schema.bool(True))
+        float_schema = interner.intern(schema.float(1.0))
+    with then:
+        assert len({id(int_schema), id(bool_schema), id(float_schema)}) == 3
+        assert interner.hits == 0
+
+
+def test_tables_are_independent():
+    with given:
+        first, second = InternTable(), InternTable()
+    with when:
+        first_schema = first.intern(schema.str.len(1, 10))
+        second_schema = second.intern(schema.str.len(1, 10))
+    with then:
+        assert first_schema is not second_schema
+        assert first.intern(schema.str.len(1, 10)) is first_schema
+        assert first.report() == "interned nodes: 1, hits: 1, misses: 1, hit rate: 50.0%"
+
+
+def test_collect_schema_data_with_interner():
+    with given:
+        item = {"type": "object", "properties": {"id": {"type": "integer"}}}
+        spec = {
+            "paths": {
+                f"/items{index}": {
+                    "get": {"responses": {"200": {"content": {"application/json": {
+                        "schema": item
+                    }}}}}
+                } for index in range(3)
+            }
+        }
+    with when:
+        interned = collect_schema_data(spec, interner=InternTable())
+    with then:
+        assert [data.response_schema_d42 for data in interned] == [
+            data.response_schema_d42 for data in collect_schema_data(spec)
+        ]
+        first, *rest = interned
+        assert all(data.response_schema_d42 is first.response_schema_d42 for data in rest)
@@ -0,0 +1,89 @@
+import json
+import subprocess
+import sys
+
+from baby_steps import given, then, when
+
+from schemax import Profiler, collect_schema_data
+
+SPEC = {
+    "paths": {
+        "/users": {
+            "get": {
+                "responses": {
+                    "200": {
+                        "content": {
+                            "application/json": {
+                                "schema": {"$ref": "#/components/schemas/User"}
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    },
+    "components": {
+        "schemas": {
+            "User": {"type": "object", "properties": {"id": {"type": "integer"}}}
+        }
+    }
+}
+
+
+def test_collect_schema_data_phases():
+    with given:
+        profiler = Profiler()
+    with when:
+        with profiler:
+            collect_schema_data(SPEC, profiler=profiler)
+    with then:
+        assert [stats.name for stats in profiler.phases] == ["normalize", "convert"]
+        assert all(stats.calls == 1 for stats in profiler.phases)
+        assert all(stats.wall_time >= 0 and stats.peak_memory > 0 for stats in profiler.phases)
+
+
+def test_phase_accumulates_calls():
+    with given:
+        profiler = Profiler(trace_memory=False)
+    with when:
+        for _ in range(3):
+            with profiler.phase("render"):
+                pass
+    with then:
+        assert len(profiler.phases) == 1
+        assert profiler.phases[0].calls == 3
+        assert profiler.phases[0].peak_memory == 0
+
+
+def test_dump(tmp_path):
+    with given:
+        profiler = Profiler(trace_memory=False)
+        with profiler.phase("parse"):
+            pass
+        file_path = tmp_path / "profile.json"
+    with when:
+        profiler.dump(str(file_path))
+    with then:
+        data = json.loads(file_path.read_text())
+        assert [phase["name"] for phase in data["phases"]] == ["parse"]
+        assert set(data["total"]) == {"wall_time", "cpu_time"}
+
+
+def test_profile_cli_writes_a_file_only_when_asked(tmp_path):
+    with given:
+        (tmp_path / "spec.json").write_text(json.dumps(SPEC))
+    with when:
+        printed = subprocess.run(
+            [sys.executable, "-m", "schemax", "generate", "spec.json", "--profile"],
+            cwd=tmp_path, capture_output=True, text=True, check=True
+        )
+        dumped = subprocess.run(
+            [sys.executable, "-m", "schemax", "generate", "spec.json",
+             "--profile-output", "profile.json"],
+            cwd=tmp_path, capture_output=True, text=True, check=True
+        )
+    with then:
+        assert "normalize" in printed.stdout
+        assert not (tmp_path / "schemax_profile.json").exists()
+        assert "Profile is written to 'profile.json'" in dumped.stdout
+        assert "phases" in json.loads((tmp_path / "profile.json").read_text())
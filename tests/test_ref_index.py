@@ -0,0 +1,143 @@
+import os
+
+import pytest
+from baby_steps import given, then, when
+from d42 import schema
+from referencing.exceptions import Unresolvable
+
+from schemax import from_json_schema
+from schemax._openapi_normalizer import openapi_normalizer
+from schemax._ref_index import RefIndex, _load
+
+
+def test_index_targets():
+    with given:
+        money = {"type": "integer"}
+        nested = {"type": "string"}
+        anchored = {"$anchor": "Name", "type": "string"}
+        identified = {"$id": "https://example.com/address.json", "type": "object"}
+        document = {
+            "$id": "https://example.com/root.json",
+            "components": {"schemas": {"Money": money, "a/b": {"$defs": {"Nested": nested}}}},
+            "$defs": {"Anchored": anchored, "Address": identified},
+        }
+    with when:
+        refs = RefIndex(document)
+    with then:
+        assert refs.resolve("#/components/schemas/Money") is money
+        assert refs.resolve("#/components/schemas/a~1b/$defs/Nested") is nested
+        assert refs.resolve("#/$defs/Anchored") is anchored
+        assert refs.resolve("#Name") is anchored
+        # Indexed up front, not resolved and cached on first use
+        assert refs._targets["https://example.com/address.json"] is identified
+        assert "https://example.com/root.json" not in refs._targets
+        assert refs.resolve("https://example.com/address.json") is identified
+
+
+def test_fallback_to_pointer_lookup():
+    with given:
+        document = {"paths": {"/pets": {"get": {"parameters": [{"name": "id"}]}}}}
+        refs = RefIndex(document)
+    with when:
+        target = refs.resolve("#/paths/~1pets/get/parameters/0")
+    with then:
+        assert target == {"name": "id"}
+        with pytest.raises(Unresolvable):
+            refs.resolve("#/paths/missing")
+
+
+def test_from_json_schema_with_anchor():
+    with given:
+        jsch = {
+            "type": "array",
+            "items": {"$ref": "#Item"},
+            "$defs": {"Item": {"$anchor": "Item", "type": "integer"}},
+        }
+    with when:
+        res = from_json_schema(jsch)
+    with then:
+        assert res == schema.list(schema.int)
+
+
+def test_absolute_id_ref_is_not_a_file():
+    with given:
+        user = {"$id": "https://example.com/user.json", "type": "object",
+                "properties": {"id": {"type": "integer"}}, "required": ["id"]}
+        jsch = {"type": "array", "items": {"$ref": "https://example.com/user.json"},
+                "$defs": {"User": user}}
+    with when:
+        res = from_json_schema(jsch)
+        refs = RefIndex(jsch)
+    with then:
+        assert res == schema.list(schema.dict({"id": schema.int, ...: ...}))
+        assert refs.lookup("https://example.com/user.json") == \
+            ("https://example.com/user.json", user, refs)
+        with pytest.raises(Unresolvable):
+            refs.lookup("https://example.com/other.json")
+
+
+@pytest.fixture()
+def split_spec(tmp_path):
+    (tmp_path / "common").mkdir()
+    (tmp_path / "common" / "money.yaml").write_text(
+        "Money:\n"
+        "  type: object\n"
+        "  properties:\n"
+        "    amount: {type: integer}\n"
+        "    currency: {$ref: '#/Currency'}\n"
+        "Currency: {$ref: './currency.json'}\n"
+    )
+    (tmp_path / "common" / "currency.json").write_text('{"enum": ["EUR", "USD"]}')
+    spec = {
+        "type": "object",
+        "properties": {
+            "price": {"$ref": "./common/money.yaml#/Money"},
+            "fee": {"$ref": "./common/money.yaml#/Money"},
+        },
+    }
+    return spec, str(tmp_path / "spec.yaml")
+
+
+def test_multi_file_refs(split_spec):
+    with given:
+        spec, base_path = split_spec
+        money = {
+            "type": "object",
+            "properties": {"amount": {"type": "integer"}, "currency": {"enum": ["EUR", "USD"]}},
+        }
+    with when:
+        res = openapi_normalizer(spec, base_path)
+    with then:
+        assert res == {"type": "object", "properties": {"price": money, "fee": money}}
+
+
+def test_external_files_are_parsed_once(split_spec):
+    with given:
+        spec, base_path = split_spec
+        _load.cache_clear()
+    with when:
+        openapi_normalizer(spec, base_path)
+        openapi_normalizer(spec, base_path)
+    with then:
+        assert _load.cache_info().misses == 2  # money.yaml and currency.json
+
+
+def test_changed_external_file_is_reloaded(split_spec, tmp_path):
+    with given:
+        spec, base_path = split_spec
+        openapi_normalizer(spec, base_path)
+        currency = tmp_path / "common" / "currency.json"
+        currency.write_text('{"enum": ["GBP"]}')
+        os.utime(currency, ns=(0, currency.stat().st_mtime_ns + 10**9))
+    with when:
+        res = openapi_normalizer(spec, base_path)
+    with then:
+        assert res["properties"]["fee"]["properties"]["currency"] == {"enum": ["GBP"]}
+
+
+def test_missing_external_file(tmp_path):
+    with given:
+        spec = {"$ref": "./missing.yaml#/Money"}
+    with when, then:
+        with pytest.raises(Unresolvable):
+            openapi_normalizer(spec, str(tmp_path / "spec.yaml"))
@@ -0,0 +1,33 @@
+import random
+
+from baby_steps import given, then, when
+
+from benchmarks.roundtrip import random_schema, run_roundtrip
+
+
+def test_random_schema_is_reproducible():
+    with given:
+        first_rnd, second_rnd = random.Random(42), random.Random(42)
+    with when:
+        first = [random_schema(first_rnd) for _ in range(20)]
+        second = [random_schema(second_rnd) for _ in range(20)]
+    with then:
+        assert [repr(sch) for sch, _ in first] == [repr(sch) for sch, _ in second]
+
+
+def test_roundtrip_fidelity():
+    with given:
+        max_schemas = 500
+    with when:
+        report = run_roundtrip(seed=0, budget=60, max_schemas=max_schemas, measure_memory=False)
+    with then:
+        assert report.schemas == max_schemas
+        assert report.mismatches == []
+
+
+def test_roundtrip_measures_memory():
+    with when:
+        report = run_roundtrip(seed=1, budget=60, max_schemas=20)
+    with then:
+        assert report.to_json_bytes > 0
+        assert report.from_json_bytes > 0
@@ -0,0 +1,76 @@
+from baby_steps import given, then, when
+
+from schemax import Router, collect_schema_data
+
+
+def operation(*statuses):
+    return {"responses": {str(status): {"description": "ok"} for status in statuses}}
+
+
+SPEC = {
+    "paths": {
+        "/users/{userId}": {"get": operation(200, 404), "delete": operation(204)},
+        "/users/me": {"get": operation(200)},
+        "/users/{userId}/orders": {"get": operation(200)},
+        "/users/{id}/orders/{orderId}": {"put": operation(200)},
+        "/files/{name}.{ext}": {"get": operation(200)},
+        "/": {"get": operation(200)},
+    }
+}
+
+
+def test_literal_wins_over_parameter():
+    with given:
+        router = Router(collect_schema_data(SPEC, lazy=True))
+    with when:
+        me = router.match("/users/me")
+        user = router.match("/users/42")
+    with then:
+        assert len(router) == 6
+        assert me.path == "/users/me" and me.args == {}
+        assert user.path == "/users/{userId}" and user.args == {"userId": "42"}
+        assert sorted(user.operations) == ["delete", "get"]
+        assert sorted(user.operations["get"]) == [200, 404]
+        assert user.operations["get"][404].status == 404
+
+
+def test_method_and_backtracking():
+    with given:
+        router = Router(collect_schema_data(SPEC, lazy=True))
+    with when:
+        # '/users/me' has no DELETE, the parameter branch has
+        deleted = router.match("/users/me", "DELETE")
+        orders = router.match("http://api.example.com/users/4%202/orders/7?x=1", "PUT")
+    with then:
+        assert deleted.path == "/users/{userId}" and deleted.args == {"userId": "me"}
+        assert list(deleted.operations) == ["delete"]
+        assert orders.path == "/users/{id}/orders/{orderId}"
+        assert orders.args == {"id": "4 2", "orderId": "7"}
+
+
+def test_segments_with_parameters():
+    with given:
+        router = Router(collect_schema_data(SPEC, lazy=True))
+    with when:
+        file = router.match("/files/report.v2.pdf")
+    with then:
+        assert file.args == {"name": "report", "ext": "v2.pdf"}
+        assert router.match("/").path == "/"
+        assert router.match("/files/report") is None
+        assert router.match("/users/") is None
+        assert router.match("/users/42/orders", "POST") is None
+
+
+def test_many_templates():
+    with given:
+        spec = {"paths": {f"/resource{index}/{{id}}": {"get": operation(200)}
+                          for index in range(300)}}
+        router = Router(collect_schema_data(spec, lazy=True))
+        requests = [f"/resource{index}/{index * 7}" for index in range(300)]
+    with when:
+        matches = [router.match(path, "GET") for path in requests]
+    with then:
+        assert [match.path for match in matches] == \
+            [f"/resource{index}/{{id}}" for index in range(300)]
+        assert [match.args for match in matches] == \
+            [{"id": str(index * 7)} for index in range(300)]
@@ -0,0 +1,125 @@
+import random
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from baby_steps import given, then, when
+from d42 import optional, schema
+
+from schemax import collect_schema_data, from_json_schema, to_json_schema
+from schemax._ref_index import _load
+
+THREADS = 8
+
+SCALARS = [
+    {"type": "integer", "minimum": 0},
+    {"type": "string", "minLength": 1, "maxLength": 64},
+    {"type": "number", "maximum": 1000},
+    {"type": "boolean"},
+    {"type": "string", "enum": ["new", "paid", "sent"]},
+]
+
+
+def make_schema(rnd):
+    leaf = rnd.choice([schema.int.min(rnd.randint(0, 9)), schema.str.len(1, rnd.randint(1, 9)),
+                       schema.float, schema.bool, schema.none, schema.str("x")])
+    return schema.dict({
+        "id": schema.int,
+        "items": schema.list(leaf).len(0, rnd.randint(1, 5)),
+        "choice": schema.any(leaf, schema.str),
+        optional("nested"): schema.dict({
+            "value": leaf, "pair": schema.list([leaf, ...]), ...: ...
+        }),
+    })
+
+
+def make_spec(seed):
+    # Components referenced by several paths and composed with allOf, nested objects inline
+    rnd = random.Random(seed)
+
+    def model(name):
+        properties = {f"{name}_{index}": dict(rnd.choice(SCALARS)) for index in range(4)}
+        properties["inner"] = {"type": "object", "properties": {"x": dict(rnd.choice(SCALARS))}}
+        return {"type": "object", "properties": properties, "required": [f"{name}_0"]}
+
+    schemas = {"Base": model("base")}
+    for index in range(3):
+        schemas[f"Model{index}"] = {"allOf": [{"$ref": "#/components/schemas/Base"},
+                                              model(f"model{index}")]}
+    paths = {
+        f"/items{index}/{{id}}": {"get": {
+            "parameters": [{"name": "id", "in": "path", "required": True,
+                            "schema": {"type": "integer"}}],
+            "responses": {"200": {"content": {"application/json": {
+                "schema": {"$ref": f"#/components/schemas/Model{index % 3}"}
+            }}}},
+        }} for index in range(3)
+    }
+    return {"paths": paths, "components": {"schemas": schemas}}
+
+
+def snapshot(schema_data):
+    # repr is linear in the size of the schemas, comparing d42 schemas is not
+    return [repr(item) for item in schema_data]
+
+
+@pytest.fixture(autouse=True)
+def frequent_switches():
+    # Switch threads as often as possible to make races show up under the GIL as well
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-5)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def test_concurrent_translation():
+    with given:
+        rnd = random.Random(0)
+        schemas = [make_schema(rnd) for _ in range(400)]
+        expected = [to_json_schema(sch) for sch in schemas]
+        expected_back = [from_json_schema(json_schema) for json_schema in expected]
+    with when, ThreadPoolExecutor(THREADS) as pool:
+        translated = list(pool.map(to_json_schema, schemas))
+        restored = list(pool.map(from_json_schema, expected))
+    with then:
+        assert translated == expected
+        assert restored == expected_back
+
+
+def test_concurrent_collection():
+    with given:
+        specs = [make_spec(seed) for seed in range(THREADS)] * 3
+        expected = [snapshot(collect_schema_data(spec)) for spec in specs]
+    with when, ThreadPoolExecutor(THREADS) as pool:
+        collected = list(pool.map(lambda spec: snapshot(collect_schema_data(spec)), specs))
+    with then:
+        assert collected == expected
+
+
+def test_concurrent_collection_with_shared_files(tmp_path):
+    with given:
+        (tmp_path / "models.yaml").write_text(
+            "".join(
+                f"Model{index}:\n"
+                f"  type: object\n"
+                f"  properties:\n"
+                f"    id: {{type: integer}}\n"
+                f"    next: {{$ref: '#/Model{index + 1}'}}\n"
+                for index in range(50)
+            ) + "Model50: {type: string}\n"
+        )
+        spec = {"paths": {
+            f"/items{index}": {"get": {"responses": {"200": {"content": {"application/json": {
+                "schema": {"$ref": f"./models.yaml#/Model{index}"}
+            }}}}}} for index in range(50)
+        }}
+        base_path = str(tmp_path / "spec.yaml")
+        expected = snapshot(collect_schema_data(spec, base_path=base_path))
+        _load.cache_clear()  # every thread starts with a file that isn't indexed yet
+    with when, ThreadPoolExecutor(THREADS) as pool:
+        collected = list(pool.map(
+            lambda _: snapshot(collect_schema_data(spec, base_path=base_path)),
+            range(THREADS * 2)
+        ))
+    with then:
+        assert all(result == expected for result in collected)
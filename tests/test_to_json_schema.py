@@ -1,7 +1,10 @@
+import io
+import json
+
 from baby_steps import given, then, when
 from d42 import optional, schema
 
-from schemax import to_json_schema
+from schemax import Translator, iter_json_schema, to_json_schema, to_json_schema_stream
 
 
 def test_none():
@@ -380,3 +383,96 @@ def test_or_operator_with_values():
                 {"type": "integer", "minimum": 3}
             ]
         }
+
+
+def test_deeply_nested_schema():
+    with given:
+        sch = schema.int
+        for _ in range(5000):
+            sch = schema.list(schema.dict({"a": sch}))
+    with when:
+        res = to_json_schema(sch, hide_draft=True)
+    with then:
+        depth = 0
+        while res["type"] == "array":
+            res = res["items"]["properties"]["a"]
+            depth += 1
+        assert depth == 5000
+        assert res == {"type": "integer"}
+
+
+def test_overridden_visit_in_subclass():
+    with given:
+        class ListsAsStrings(Translator):
+            def visit_list(self, schema, **kwargs):
+                return {"type": "string"}
+
+        sch = schema.dict({"a": schema.list(schema.int), "b": schema.int})
+    with when:
+        res = sch.__accept__(ListsAsStrings())
+    with then:
+        assert res == {
+            "type": "object",
+            "additionalProperties": False,
+            "properties": {"a": {"type": "string"}, "b": {"type": "integer"}},
+            "required": ["a", "b"]
+        }
+
+
+def test_overridden_visit_calling_super():
+    with given:
+        class TitledDicts(Translator):
+            def visit_dict(self, schema, **kwargs):
+                return {**super().visit_dict(schema, **kwargs), "title": "Object"}
+
+        sch = schema.dict({"a": schema.dict({"b": schema.int}), "c": schema.list(schema.dict)})
+    with when:
+        res = sch.__accept__(TitledDicts())
+    with then:
+        assert res == {
+            "type": "object",
+            "additionalProperties": False,
+            "properties": {
+                "a": {
+                    "type": "object",
+                    "additionalProperties": False,
+                    "properties": {"b": {"type": "integer"}},
+                    "required": ["b"],
+                    "title": "Object",
+                },
+                "c": {"type": "array", "items": {"type": "object", "title": "Object"}},
+            },
+            "required": ["a", "c"],
+            "title": "Object",
+        }
+
+
+def test_stream_is_identical_to_dumps():
+    with given:
+        sch = schema.dict({
+            "id": schema.int.min(1),
+            optional("tags"): schema.list(schema.str.len(1, 10)).len(0, 5),
+            "pair": schema.list([schema.int, schema.str, ...]),
+            "kind": schema.any(schema.str("a"), schema.none),
+            "nested": schema.dict({"x": schema.float, ...: ...}),
+        })
+        file = io.StringIO()
+    with when:
+        to_json_schema_stream(sch, file, title="Item")
+    with then:
+        assert file.getvalue() == json.dumps(to_json_schema(sch, title="Item"))
+        assert "".join(iter_json_schema(sch, hide_draft=True)) == \
+            json.dumps(to_json_schema(sch, hide_draft=True))
+
+
+def test_stream_deeply_nested_schema():
+    with given:
+        sch = schema.int
+        for _ in range(5000):
+            sch = schema.list(schema.dict({"a": sch}))
+    with when:
+        res = "".join(iter_json_schema(sch, hide_draft=True))
+    with then:
+        assert res.startswith('{"type": "array", "items": {"type": "object"')
+        assert res.count('{"type": "integer"}') == 1
+        assert res.endswith('{"type": "integer"}' + '}, "required": ["a"]}}' * 5000)
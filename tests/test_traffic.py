@@ -0,0 +1,122 @@
+import io
+import json
+import subprocess
+import sys
+
+from baby_steps import given, then, when
+
+from schemax import validate_traffic
+from schemax._traffic import iter_har_entries
+
+USER = {"type": "object", "properties": {"id": {"type": "integer"}, "name": {"type": "string"}},
+        "required": ["id", "name"]}
+SPEC = {
+    "paths": {
+        "/users/{id}": {
+            "get": {"responses": {"200": {"content": {"application/json": {"schema": USER}}}}},
+            "put": {
+                "requestBody": {"content": {"application/json": {"schema": USER}}},
+                "responses": {"204": {"description": "updated"}},
+            },
+        }
+    }
+}
+GOOD_USER = {"id": 1, "name": "Bob"}
+BAD_USER = {"id": "1", "name": "Bob"}
+
+
+def exchange(method, url, status, request=None, response=None):
+    record = {"method": method, "url": url, "status": status}
+    if request is not None:
+        record["request_body"] = request
+    if response is not None:
+        record["response_body"] = response
+    return json.dumps(record)
+
+
+def har(*exchanges):
+    entries = [{
+        "request": {"method": method, "url": f"http://api.example.com{url}",
+                    "postData": {"mimeType": "application/json", "text": json.dumps(request)}},
+        "response": {"status": status,
+                     "content": {"mimeType": "application/json", "text": json.dumps(response)}},
+    } for method, url, status, request, response in exchanges]
+    return json.dumps({"log": {"version": "1.2", "creator": {"name": "test"},
+                               "pages": [{"title": '"entries": ['}], "entries": entries}})
+
+
+TRAFFIC = "\n".join([
+    exchange("GET", "/users/1", 200, response=GOOD_USER),
+    exchange("GET", "/users/2?expand=1", 200, response=BAD_USER),
+    exchange("GET", "/users/3", 500, response={"error": "oops"}),
+    exchange("PUT", "/users/1", 204, request=BAD_USER),
+    exchange("PUT", "/users/1", 204, request=GOOD_USER),
+    exchange("GET", "/orders/1", 200),
+    "not json",
+]) + "\n"
+
+
+def test_ndjson_in_process():
+    with when:
+        report = validate_traffic(SPEC, io.StringIO(TRAFFIC), workers=1, batch_size=2)
+    with then:
+        assert (report.exchanges, report.unmatched, report.invalid) == (7, 1, 1)
+        get, put = report.endpoints["GET /users/{id}"], report.endpoints["PUT /users/{id}"]
+        assert (get.exchanges, get.response_mismatches, get.undocumented_statuses) == (3, 1, 1)
+        assert (put.exchanges, put.request_mismatches) == (2, 1)
+        assert report.mismatches == 3
+        assert get.examples[0].startswith("response 200: Value '1' at _['id']")
+
+
+def test_workers_give_the_same_report():
+    with given:
+        traffic = TRAFFIC * 50
+    with when:
+        parallel = validate_traffic(SPEC, io.StringIO(traffic), workers=2, batch_size=16)
+        serial = validate_traffic(SPEC, io.StringIO(traffic), workers=1, batch_size=16)
+    with then:
+        assert parallel.exchanges == 350 and parallel.mismatches == 150
+        assert {endpoint: (stats.exchanges, stats.mismatches)
+                for endpoint, stats in parallel.endpoints.items()} == \
+            {endpoint: (stats.exchanges, stats.mismatches)
+             for endpoint, stats in serial.endpoints.items()}
+
+
+def test_har_entries_are_streamed():
+    with given:
+        text = har(*[("GET", f"/users/{index}", 200, None, GOOD_USER) for index in range(200)])
+    with when:
+        entries = list(iter_har_entries(io.StringIO(text), chunk_size=64))
+    with then:
+        assert len(entries) == 200
+        assert entries[-1]["request"]["url"] == "http://api.example.com/users/199"
+
+
+def test_har():
+    with given:
+        text = har(("GET", "/users/1", 200, None, GOOD_USER),
+                   ("PUT", "/users/1", 204, BAD_USER, None),
+                   ("GET", "/users/1", 200, None, "<html>"))
+        text = text.replace(json.dumps(json.dumps("<html>")), '"<html>"')
+    with when:
+        report = validate_traffic(SPEC, io.StringIO(text), har=True, workers=1)
+    with then:
+        assert report.exchanges == 3
+        assert report.endpoints["PUT /users/{id}"].request_mismatches == 1
+        assert report.endpoints["GET /users/{id}"].examples == ["response 200: body isn't JSON"]
+
+
+def test_validate_traffic_cli(tmp_path):
+    with given:
+        (tmp_path / "spec.json").write_text(json.dumps(SPEC))
+        (tmp_path / "traffic.ndjson").write_text(TRAFFIC)
+    with when:
+        result = subprocess.run(
+            [sys.executable, "-m", "schemax", "validate-traffic", "spec.json", "traffic.ndjson",
+             "--workers", "2"],
+            cwd=tmp_path, capture_output=True, text=True, check=False
+        )
+    with then:
+        assert result.returncode == 1, result.stdout + result.stderr
+        assert "exchanges: 7, mismatches: 3, unmatched: 1, invalid: 1" in result.stdout
+        assert "GET /users/{id}: 2/3" in result.stdout
@@ -0,0 +1,177 @@
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from baby_steps import given, then, when
+
+from schemax import Watcher, collect_schema_data
+from schemax._generator import MainGenerator
+
+USER = {"type": "object", "properties": {"id": {"type": "integer"}}, "required": ["id"]}
+SPEC = {
+    "paths": {
+        "/users": {
+            "get": {"responses": {"200": {"content": {"application/json": {
+                "schema": {"$ref": "./common.json#/User"}
+            }}}}},
+        },
+        "/orders": {
+            "get": {"responses": {"200": {"content": {"application/json": {
+                "schema": {"type": "array", "items": {"type": "string"}}
+            }}}}},
+        },
+    }
+}
+
+
+def edit(path, document):
+    # A later modification time than before, however coarse the file system clock is
+    mtime = path.stat().st_mtime_ns if path.exists() else 0
+    path.write_text(json.dumps(document))
+    os.utime(path, ns=(mtime + 10**9, mtime + 10**9))
+
+
+def tree(root):
+    return {str(path.relative_to(root)): path.read_text()
+            for path in Path(root).rglob("*") if path.is_file()}
+
+
+def test_first_refresh_matches_generate(tmp_path, monkeypatch):
+    with given:
+        edit(tmp_path / "spec.json", SPEC)
+        edit(tmp_path / "common.json", {"User": USER})
+        (tmp_path / "single").mkdir()
+        monkeypatch.chdir(tmp_path / "single")
+        MainGenerator(collect_schema_data(SPEC, base_path="../spec.json"), "http://x").all()
+        (tmp_path / "watched").mkdir()
+        monkeypatch.chdir(tmp_path / "watched")
+        watcher = Watcher("../spec.json", base_url="http://x")
+    with when:
+        written = watcher.refresh()
+        unchanged = watcher.refresh()
+    with then:
+        assert sorted(written) == sorted(tree(tmp_path / "single"))
+        assert unchanged is None
+        assert tree(tmp_path / "watched") == tree(tmp_path / "single")
+
+
+def test_only_changed_operations_and_files(tmp_path):
+    with given:
+        edit(tmp_path / "spec.json", SPEC)
+        edit(tmp_path / "common.json", {"User": USER})
+        watcher = Watcher(str(tmp_path / "spec.json"), out_dir=str(tmp_path / "out"))
+        watcher.refresh()
+        orders = watcher._schema_data["/orders"]
+        scenario = tmp_path / "out" / "scenarios" / "get_users.py"
+        scenario.write_text("# my scenario\n")
+        api_mtime = (tmp_path / "out" / "interfaces" / "api.py").stat().st_mtime_ns
+    with when:
+        properties = {"id": {"type": "string"}}
+        edit(tmp_path / "common.json", {"User": {**USER, "properties": properties}})
+        written = watcher.refresh()
+    with then:
+        assert written == [str(tmp_path / "out" / "schemas" / "response_schemas.py")]
+        assert "schema.str" in Path(written[0]).read_text()
+        assert watcher._schema_data["/orders"] is orders
+        assert scenario.read_text() == "# my scenario\n"
+        assert (tmp_path / "out" / "interfaces" / "api.py").stat().st_mtime_ns == api_mtime
+
+
+def test_new_operation_gets_a_scenario(tmp_path):
+    with given:
+        edit(tmp_path / "spec.json", SPEC)
+        edit(tmp_path / "common.json", {"User": USER})
+        watcher = Watcher(str(tmp_path / "spec.json"), out_dir=str(tmp_path / "out"))
+        watcher.refresh()
+    with when:
+        paths = dict(SPEC["paths"])
+        del paths["/orders"]
+        paths["/items"] = {"delete": {"responses": {"200": {"description": "deleted"}}}}
+        edit(tmp_path / "spec.json", {"paths": paths})
+        written = watcher.refresh()
+    with then:
+        out = tmp_path / "out"
+        assert str(out / "scenarios" / "delete_items.py") in written
+        api = (out / "interfaces" / "api.py").read_text()
+        assert "def delete_items" in api and "def get_orders" not in api
+
+
+def test_reordered_properties(tmp_path):
+    with given:
+        properties = {"id": {"type": "integer"}, "name": {"type": "string"}}
+        edit(tmp_path / "spec.json", SPEC)
+        edit(tmp_path / "common.json", {"User": {**USER, "properties": properties}})
+        watcher = Watcher(str(tmp_path / "spec.json"), out_dir=str(tmp_path / "out"))
+        watcher.refresh()
+    with when:
+        reordered = {"name": properties["name"], "id": properties["id"]}
+        edit(tmp_path / "common.json", {"User": {**USER, "properties": reordered}})
+        written = watcher.refresh()
+    with then:
+        response_schemas = tmp_path / "out" / "schemas" / "response_schemas.py"
+        assert written == [str(response_schemas)]
+        content = response_schemas.read_text()
+        assert content.index("'name'") < content.index("'id'")
+
+
+def test_edit_within_one_clock_tick(tmp_path):
+    with given:
+        edit(tmp_path / "spec.json", SPEC)
+        edit(tmp_path / "common.json", {"User": USER})
+        watcher = Watcher(str(tmp_path / "spec.json"), out_dir=str(tmp_path / "out"))
+        watcher.refresh()
+        mtime = (tmp_path / "common.json").stat().st_mtime_ns
+    with when:
+        properties = {"id": {"type": "string"}, "name": {"type": "string"}}
+        user = {**USER, "properties": properties}
+        (tmp_path / "common.json").write_text(json.dumps({"User": user}))
+        os.utime(tmp_path / "common.json", ns=(mtime, mtime))
+        written = watcher.refresh()
+    with then:
+        response_schemas = tmp_path / "out" / "schemas" / "response_schemas.py"
+        assert written == [str(response_schemas)]
+        content = response_schemas.read_text()
+        assert "'id': schema.str" in content and "'name'" in content
+
+
+def test_replaced_schemas_are_released(tmp_path):
+    with given:
+        edit(tmp_path / "spec.json", SPEC)
+        edit(tmp_path / "common.json", {"User": USER})
+        watcher = Watcher(str(tmp_path / "spec.json"), out_dir=str(tmp_path / "out"))
+        watcher.refresh()
+    with when:
+        for index in range(5):
+            properties = {f"field{index}": {"type": "integer"}}
+            edit(tmp_path / "common.json", {"User": {**USER, "properties": properties}})
+            watcher.refresh()
+    with then:
+        items = [item for items in watcher._schema_data.values() for item in items]
+        live = {id(d42_schema) for item in items for d42_schema in
+                (item.request_schema_d42, item.response_schema_d42, item.queries_schema_d42)}
+        assert watcher.reprs.keys() <= live
+        assert {id(item.response_schema_d42) for item in items} <= watcher.reprs.keys()
+
+
+def test_watch_cli(tmp_path):
+    with given:
+        edit(tmp_path / "spec.json", SPEC)
+        edit(tmp_path / "common.json", {"User": USER})
+        process = subprocess.Popen(
+            [sys.executable, "-m", "schemax", "generate", "spec.json", "--watch",
+             "--interval", "0.01"],
+            cwd=tmp_path, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True
+        )
+    with when:
+        api = tmp_path / "interfaces" / "api.py"
+        deadline = time.monotonic() + 30
+        while not api.exists() and time.monotonic() < deadline:
+            time.sleep(0.05)
+        process.terminate()
+        output, _ = process.communicate(timeout=30)
+    with then:
+        assert "def get_users" in api.read_text(), output
+        assert "Regenerated in" in output